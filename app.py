@@ -1,4 +1,17 @@
-from flask import Flask, render_template, request, session, jsonify, Response
+import math
+import os
+import threading
+
+from collections import OrderedDict
+
+from flask import (
+    Flask,
+    render_template,
+    request,
+    jsonify,
+    Response,
+    stream_with_context,
+)
 from typing import Dict
 from game import (
     Game,
@@ -7,24 +20,431 @@ from game import (
     is_valid_username,
     Estimate,
     InvalidStateException,
+    MAX_PLAYERS,
+    Action,
+    Move,
+    MoveError,
+    get_problem_stats,
+    get_problems,
 )
-
-
-app = Flask(__name__)
-app.secret_key = "super secret key"
+from problems import ProblemFilter
+from bots import STRATEGIES, BotRunner
+from broadcast import Broadcaster
+from leaderboard import Leaderboard
+from ledger import Ledger
+from matchmaking import Matchmaker
+from ratelimit import RateLimit, RateLimiter
+from responses import FastJSONProvider, StaticJson, compress, encode_json
+from sessions import GameTokens, SessionStore, load_keys
+from static_assets import build_assets
+from timers import Timer, TimerWheel
+from tournament import Tournament, TournamentFormat
+
+
+app = Flask(__name__, static_folder=None)
+app.json = FastJSONProvider(app)
+# Newest first; older keys still verify game tokens while they're rotated out.
+secret_keys = load_keys(os.environ.get("SECRET_KEYS", None))
+app.secret_key = secret_keys[0]
+app.config["SECRET_KEY_FALLBACKS"] = secret_keys[1:]
+SESSION_COOKIE = "session_token"
+sessions = SessionStore(os.environ.get("SESSION_PATH", "sessions.db"))
+game_tokens = GameTokens(secret_keys)
+assets = build_assets()
+app.jinja_env.globals["asset_url"] = lambda name: f"/static/{assets[name].name}"
 games: Dict[str, Game] = {}
 players: Dict[str, Player] = {}
 seen_outcome_counter: Dict[str, int] = {}
+matchmaker = Matchmaker()
+matched_games: Dict[str, str] = {}
+ledger = Ledger(os.environ.get("LEDGER_PATH", "ledger.db"))
+leaderboard = Leaderboard(ledger.get_balances())
+broadcaster = Broadcaster()
+tournaments: Dict[str, Tournament] = {}
+game_locks = [threading.Lock() for _ in range(64)]
+bot_runner = BotRunner(get_game=games.get, apply_move=lambda *args: _apply_move(*args))
+tournament_games: Dict[str, str] = {}
+WATCH_KEEPALIVE_SECONDS = 15.0
+TURN_SECONDS = {
+    GameState.WAITING_FOR_ESTIMATE: 150,
+    GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD: 15,
+    GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD: 15,
+}
+timer_wheel = TimerWheel()
+turn_timers: Dict[str, Timer] = {}
+# Per player and game; polls run at 1 Hz, so a couple of open tabs fit.
+RATE_LIMITS = {
+    "get_state": RateLimit(rate=2, burst=5),
+    "act": RateLimit(rate=2, burst=5),
+    "set_prediction": RateLimit(rate=2, burst=5),
+    "raise_ante": RateLimit(rate=2, burst=5),
+    "call_ante": RateLimit(rate=2, burst=5),
+    "fold": RateLimit(rate=2, burst=5),
+    "to_play_or_not_to_play": RateLimit(rate=2, burst=5),
+    "join_game": RateLimit(rate=1, burst=5),
+    "add_bot": RateLimit(rate=1, burst=8),
+}
+rate_limiter = RateLimiter(RATE_LIMITS)
+# Per player (or address, if anonymous) across all their games, so spreading
+# requests over many games, or made-up game ids, buys no extra tokens.
+USER_RATE_LIMITS = {
+    "get_state": RateLimit(rate=8, burst=20),
+    "act": RateLimit(rate=8, burst=20),
+    "set_prediction": RateLimit(rate=8, burst=20),
+    "raise_ante": RateLimit(rate=8, burst=20),
+    "call_ante": RateLimit(rate=8, burst=20),
+    "fold": RateLimit(rate=8, burst=20),
+    "to_play_or_not_to_play": RateLimit(rate=8, burst=20),
+    "join_game": RateLimit(rate=2, burst=10),
+    "add_bot": RateLimit(rate=2, burst=16),
+    "create_game": RateLimit(rate=0.2, burst=5),
+}
+user_rate_limiter = RateLimiter(USER_RATE_LIMITS)
+MAX_RECENT_MOVES_PER_GAME = 32
+game_recent_moves: Dict[str, OrderedDict[str, tuple[Move, Game]]] = {}
+# Bumped on every save, so clients can order and deduplicate the states they get.
+game_versions: Dict[str, int] = {}
+is_warm = threading.Event()
+# Constant replies, encoded once.
+USER_NOT_LOGGED_IN = StaticJson({"success": False, "message": "User not logged in!"})
+GAME_NOT_FOUND = StaticJson({"success": False, "message": "Game ID doesn't exist!"})
+USER_NOT_FOUND = StaticJson({"success": False, "message": "User doesn't exist!"})
+UNKNOWN_ACTION = StaticJson({"success": False, "message": "Unknown action!"})
+ESTIMATE_SUBMITTED = StaticJson(
+    {"success": True, "message": "Successfully submitted estimate"}
+)
+ANTE_RAISED = StaticJson({"success": True, "message": "Successfully raised ante"})
+ANTE_CALLED = StaticJson({"success": True, "message": "Successfully called ante"})
+FOLDED = StaticJson({"success": True, "message": "Successfully folded"})
+TOURNAMENT_NOT_FOUND = StaticJson(
+    {"success": False, "message": "Tournament doesn't exist!"}
+)
+INVALID_ENTRANT = StaticJson({"success": False, "message": "Invalid entrant username!"})
+MATCHMAKING_STOPPED = StaticJson({"success": True, "message": "Stopped matchmaking"})
+NOT_MATCHMAKING = StaticJson({"success": False, "message": "User isn't matchmaking!"})
+GAME_IS_FULL = StaticJson({"success": False, "message": "Game is full!"})
+NOT_A_PLAYER = StaticJson({"success": False, "message": "Only players can add bots!"})
+UNKNOWN_STRATEGY = StaticJson({"success": False, "message": "Unknown bot strategy!"})
+LIMIT_NOT_POSITIVE = StaticJson(
+    {"success": False, "message": "Limit must be positive!"}
+)
+READY = StaticJson({"success": True, "ready": True})
+NOT_READY = StaticJson({"success": True, "ready": False})
+TOO_MANY_REQUESTS = StaticJson({"success": False, "message": "Too many requests!"})
+MOVE_ERRORS = {
+    error: StaticJson({"success": False, "message": error.value, "error": error.name})
+    for error in MoveError
+}
+
+
+def _load_player(username: str) -> Player:
+    if username not in players and bot_runner.is_bot(username):
+        # Bots only last as long as their game, so they get no account.
+        players[username] = Player.create(username)
+
+    if username not in players:
+        player = Player.create(username)
+        balance = ledger.open_account(username, player.balance)
+        players[username] = player.set_balance(balance)
+        leaderboard.update(username, balance)
+
+    return players[username]
+
+
+def _get_username() -> str | None:
+    token = request.cookies.get(SESSION_COOKIE, None)
+
+    if token is None:
+        return None
+
+    return sessions.get(token)
+
+
+def _get_game_username(game_id: str) -> str | None:
+    """Reads the player from the game token polls send, falling back to their session."""
+    token = request.args.get("token", None) or request.headers.get("X-Game-Token", None)
+
+    if token is None:
+        return _get_username()
+
+    return game_tokens.verify(game_id, token)
+
+
+def _get_game_lock(game_id: str) -> threading.Lock:
+    return game_locks[hash(game_id) % len(game_locks)]
+
+
+def _apply_move(
+    game_id: str,
+    move: Move,
+    expected_game: Game | None = None,
+    request_id: str | None = None,
+) -> Game | MoveError:
+    """Plays a human's or bot's move on the latest state of the game and settles the round it ends.
+
+    A move sent again with the same `request_id` isn't replayed; the game it
+    produced the first time is returned instead. An illegal move is returned
+    as a `MoveError` rather than raised, so rejecting it stays cheap.
+    """
+    with _get_game_lock(game_id):
+        recent_moves = game_recent_moves.setdefault(game_id, OrderedDict())
+
+        if request_id is not None and request_id in recent_moves:
+            old_move, old_game = recent_moves[request_id]
+
+            if old_move != move:
+                return MoveError.REQUEST_ID_REUSED
+
+            return old_game
+
+        game = games[game_id]
+
+        if expected_game is not None and game is not expected_game:
+            return MoveError.GAME_HAS_CHANGED
+
+        error = game.validate(move)
+
+        if error is not None:
+            return error
+
+        new_game = game.apply(move)
+        _save_game(new_game)
+
+        if request_id is not None:
+            recent_moves[request_id] = (move, new_game)
+
+            if len(recent_moves) > MAX_RECENT_MOVES_PER_GAME:
+                recent_moves.popitem(last=False)
+
+    if new_game.is_round_settled() and not game.is_round_settled():
+        _settle_round(new_game)
+
+    return new_game
+
+
+def _reject_move(error: MoveError) -> Response:
+    """Answers an illegal move with a conflict, naming the error for clients."""
+    return MOVE_ERRORS[error](409)
+
+
+def _save_game(game: Game) -> None:
+    old_game = games.get(game.id, None)
+    games[game.id] = game
+    game_versions[game.id] = game_versions.get(game.id, 0) + 1
+
+    if old_game is not None and old_game.is_game_over():
+        return
+
+    if broadcaster.is_watched(game.id):
+        broadcaster.publish(game.id, _serialize_spectator_view(game))
+
+    bot_runner.notify(game)
+    _schedule_turn_timer(game)
+
+    if game.is_game_over():
+        broadcaster.close(game.id)
+
+    if game.is_game_over() and game.id in tournament_games:
+        tournament = tournaments[tournament_games.pop(game.id)]
+
+        for new_game in tournament.on_game_over(game):
+            _save_tournament_game(tournament, new_game)
+
+
+def _schedule_turn_timer(game: Game) -> None:
+    old_timer = turn_timers.pop(game.id, None)
+
+    if old_timer is not None:
+        old_timer.cancel()
+
+    seconds = TURN_SECONDS.get(game.get_state(), None)
+
+    if seconds is None:
+        return
+
+    turn_timers[game.id] = timer_wheel.schedule(seconds, lambda: _expire_turn(game))
+
+
+def _expire_turn(game: Game) -> None:
+    """Folds for a player who ran out of time, unless the game moved on meanwhile."""
+    current_player = game.get_current_player()
+
+    assert current_player is not None
+
+    # A move error means the game moved on meanwhile, so there's nothing to fold.
+    _apply_move(game.id, Move(current_player, Action.FOLD), expected_game=game)
+
+
+def _get_seconds_left(game_id: str) -> int:
+    timer = turn_timers.get(game_id, None)
+
+    return 0 if timer is None else math.ceil(timer.get_seconds_left())
+
+
+def _save_tournament_game(tournament: Tournament, game: Game) -> None:
+    tournament_games[game.id] = tournament.id
+    _save_game(game)
+
+
+def _create_game() -> Game:
+    game = Game.create()
+
+    while game.id in games:
+        game = Game.create()
+
+    return game
+
+
+def _serialize_spectator_view(game: Game) -> bytes:
+    """Serializes what anyone watching the table may see; called once per state change."""
+    is_round_settled = game.is_round_settled()
+    view = {
+        "game_id": game.id,
+        "state": str(game.get_state()),
+        "round": game.round_number,
+        "seats": list(game.get_seats()),
+        "max_players": game.get_max_players(),
+        "estimator": game.get_estimator(),
+        "current_player": game.get_current_player(),
+        "current_side": game.get_current_side(),
+        "problem": game.get_problem().question,
+        "estimate": game.estimate.log_answer if game.has_estimate() else None,  # type: ignore
+        "error": game.estimate.log_error if game.has_estimate() else None,  # type: ignore
+        "antes": game.get_antes(),
+        "answer": game.get_problem().log_answer if is_round_settled else None,
+        "payouts": (
+            {username: game.get_payout(username) for username in game.get_seats()}
+            if is_round_settled
+            else None
+        ),
+    }
+
+    return encode_json(view)
+
+
+def _get_side_results(game: Game, username: str) -> list[dict[str, str | int]]:
+    """Returns how each side `username` bet on this round ended, one per opponent."""
+    results = []
+
+    for opponent, payout in game.get_side_payouts(username).items():
+        side = game.get_sides()[opponent if game.is_estimator(username) else username]
+        is_estimatee = side.estimatee == username
+
+        if side.outcome == GameState.BOTH_PLAYERS_CALLED:
+            action = "you both called"
+        elif is_estimatee == (side.outcome == GameState.ESTIMATEE_FOLDED):
+            action = "you folded"
+        else:
+            action = "they folded"
+
+        results.append({"opponent": opponent, "action": action, "payout": payout})
+
+    return results
+
+
+def _settle_round(game: Game) -> None:
+    if not game.is_round_settled():
+        return
+
+    if any(
+        side.outcome == GameState.BOTH_PLAYERS_CALLED
+        for side in game.get_sides().values()
+    ):
+        get_problem_stats().record(
+            game.problem.index,
+            game.estimate.log_error,  # type: ignore
+            game.is_prediction_correct(),
+        )
+
+    deltas = {username: game.get_payout(username) for username in game.usernames}
+    bot_deltas = {
+        username: deltas.pop(username)
+        for username in game.usernames
+        if bot_runner.is_bot(username)
+    }
+
+    for username, delta in bot_deltas.items():
+        players[username] = players[username].set_balance(
+            players[username].balance + delta
+        )
+
+    if len(deltas) == 0:
+        return
+
+    new_balances = ledger.record_round(game.id, game.round_number, deltas)
+
+    for username, balance in new_balances.items():
+        players[username] = players[username].set_balance(balance)
+        leaderboard.update(username, balance)
+
+
+@app.before_request
+def limit_rate() -> Response | None:
+    """Turns away requests beyond their route's limits, per player and per player in a game."""
+    route = request.endpoint
+
+    if route not in user_rate_limiter.limits and route not in rate_limiter.limits:
+        return None
+
+    game_id = (request.view_args or {}).get("game_id", None) or (
+        request.get_json(silent=True) or {}
+    ).get("game_id", None)
+
+    # Only games that exist get buckets, so made-up ids can't fill the table.
+    if not isinstance(game_id, str) or game_id not in games:
+        game_id = None
+
+    username = _get_username() if game_id is None else _get_game_username(game_id)
+    user = username or request.remote_addr
+    checks = [(user_rate_limiter, user)]
+
+    if game_id is not None:
+        checks.append((rate_limiter, (user, game_id)))
+
+    for limiter, key in checks:
+        if not limiter.allow(route, key):
+            response = TOO_MANY_REQUESTS(429)
+            response.headers["Retry-After"] = str(
+                math.ceil(limiter.get_retry_after(route, key))
+            )
+
+            return response
+
+    return None
+
+
+@app.after_request
+def compress_page(response: Response) -> Response:
+    return compress(response, request.headers.get("Accept-Encoding", ""))
 
 
 @app.route("/")
 def home() -> str:
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
         return render_template("login.html")
 
-    return render_template("start.html", username=username)
+    return render_template("start.html", username=username, max_players=MAX_PLAYERS)
+
+
+@app.route("/static/<name>", methods=["GET"])
+def get_asset(name: str) -> Response:
+    """Serves a bundle by its fingerprinted name, which never changes content, precompressed."""
+    asset = assets.get(name, None)
+
+    if asset is None or asset.name != name:
+        return Response("Asset not found", status=404)
+
+    content, encoding = asset.get_encoded(request.headers.get("Accept-Encoding", ""))
+    response = Response(content, content_type=asset.content_type)
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    response.headers["Vary"] = "Accept-Encoding"
+
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+
+    return response
 
 
 @app.route("/instructions")
@@ -37,22 +457,20 @@ def view_game(game_id: str) -> str:
     if game_id not in games:
         return render_template("error.html", message=f"Game ID doesn't exist!")
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
         return render_template("error.html", message=f"User not logged in!")
 
     game = games[game_id]
-
-    if username not in players:
-        players[username] = Player.create(username)
-
-    player = players[username]
+    player = _load_player(username)
+    game_token = game_tokens.sign(game_id, username)
     state = game.get_state()
 
     if state == GameState.GAME_IS_EMPTY:
         return render_template(
             "waiting-room.html",
+            game_token=game_token,
             game_id=game_id,
             state=game.get_state(),
         )
@@ -60,8 +478,11 @@ def view_game(game_id: str) -> str:
     if state == GameState.WAITING_FOR_ANOTHER_PLAYER:
         return render_template(
             "waiting-room.html",
+            game_token=game_token,
             game_id=game_id,
             state=game.get_state(),
+            num_players=game.get_num_players(),
+            max_players=game.get_max_players(),
         )
 
     opponent = game.get_opponent(username)
@@ -73,15 +494,18 @@ def view_game(game_id: str) -> str:
             game_id=game_id,
             balance=player.balance,
             problem=problem.question,
+            seconds_left=_get_seconds_left(game_id),
         )
 
     if state == GameState.WAITING_FOR_ESTIMATE and not game.is_estimator(username):
         return render_template(
             "estimatee.html",
+            game_token=game_token,
             game_id=game_id,
             balance=player.balance,
             problem=problem.question,
             state=game.get_state(),
+            seconds_left=_get_seconds_left(game_id),
         )
 
     if state in [
@@ -100,6 +524,7 @@ def view_game(game_id: str) -> str:
 
         return render_template(
             "raise-call-or-fold.html",
+            game_token=game_token,
             balance=player.balance,
             problem=problem.question,
             estimate=game.estimate.log_answer,  # type: ignore
@@ -111,6 +536,8 @@ def view_game(game_id: str) -> str:
             instruction=instruction,
             estimate_header=estimate_header,
             show_buttons=game.is_current_player(username),
+            current_player=game.get_current_player(),
+            seconds_left=_get_seconds_left(game_id),
         )
 
     if state in [
@@ -131,8 +558,8 @@ def view_game(game_id: str) -> str:
             error=log_error,
             is_estimator=game.is_estimator(username),
             expected_oom=game.problem.log_answer,
-            payout=abs(game.get_payout(username)),
-            you_won=game.is_winner(username),
+            payout=game.get_payout(username),
+            results=_get_side_results(game, username),
             source=game.problem.source,
             state=game.get_state(),
         )
@@ -140,6 +567,7 @@ def view_game(game_id: str) -> str:
     if state == GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN:
         return render_template(
             "play-again.html",
+            game_token=game_token,
             game_id=game_id,
             state=game.get_state(),
         )
@@ -166,22 +594,23 @@ def login() -> Response:
             }
         )
 
-    session["username"] = username
-
-    if username not in players:
-        players[username] = Player.create(username)
-
-    return jsonify(
+    _load_player(username)
+    response = jsonify(
         {
             "success": True,
             "message": f"Successfully logged in as {username}",
         }
     )
+    response.set_cookie(
+        SESSION_COOKIE, sessions.create(username), httponly=True, samesite="Lax"
+    )
+
+    return response
 
 
 @app.route("/api/logout", methods=["GET"])
 def logout() -> Response:
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
         return jsonify(
@@ -191,28 +620,45 @@ def logout() -> Response:
             }
         )
 
-    del session["username"]
-
-    return jsonify(
+    sessions.delete(request.cookies[SESSION_COOKIE])
+    response = jsonify(
         {
             "success": True,
             "message": f"Successfully logged out",
         }
     )
+    response.delete_cookie(SESSION_COOKIE)
+
+    return response
 
 
 @app.route("/api/create", methods=["GET"])
 def create_game() -> Response:
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in!"})
+        return USER_NOT_LOGGED_IN()
 
     if username not in players:
-        return jsonify({"success": False, "message": "User doesn't exist!"})
+        return USER_NOT_FOUND()
 
-    game = Game.create().join(username)
-    games[game.id] = game
+    try:
+        problem_filter = ProblemFilter(
+            category=request.args.get("category", None),
+            min_oom=request.args.get("min_oom", None, type=int),
+            max_oom=request.args.get("max_oom", None, type=int),
+            min_difficulty=request.args.get("min_difficulty", None, type=int),
+            max_difficulty=request.args.get("max_difficulty", None, type=int),
+        )
+        game = Game.create(
+            problem_filter=problem_filter,
+            target_hit_rate=request.args.get("target_hit_rate", None, type=float),
+            max_players=request.args.get("max_players", 2, type=int),
+        ).join(username)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)})
+
+    _save_game(game)
 
     return jsonify(
         {
@@ -223,34 +669,215 @@ def create_game() -> Response:
     )
 
 
+@app.route("/api/categories", methods=["GET"])
+def get_categories() -> Response:
+    categories = get_problems().get_categories()
+
+    return jsonify({"success": True, "categories": categories})
+
+
 @app.route("/api/join", methods=["POST"])
 def join_game() -> Response:
     game_id = request.json["game_id"]  # type: ignore
 
     if game_id not in games:
-        return jsonify({"success": False, "message": "Game ID doesn't exist!"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in!"})
+        return USER_NOT_LOGGED_IN()
 
     if username not in players:
-        return jsonify({"success": False, "message": "User doesn't exist!"})
+        return USER_NOT_FOUND()
 
     player = players[username]
-    game = games[game_id]
 
     try:
-        new_game = game.join(player.username)
+        result = _apply_move(
+            game_id,
+            Move(player.username, Action.JOIN),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
     return jsonify({"success": True, "message": f"Successfully joined game {game_id}"})
 
 
+@app.route("/api/game/<game_id>/bot", methods=["POST"])
+def add_bot(game_id: str) -> Response:
+    if game_id not in games:
+        return GAME_NOT_FOUND()
+
+    username = _get_username()
+
+    if username is None:
+        return USER_NOT_LOGGED_IN()
+
+    strategy_name = (request.json or {}).get("strategy", "cautious")
+
+    if strategy_name not in STRATEGIES:
+        return UNKNOWN_STRATEGY()
+
+    game = games[game_id]
+
+    if not game.contains(username):
+        return NOT_A_PLAYER()
+
+    if game.is_full():
+        return GAME_IS_FULL()
+
+    bot = bot_runner.create_bot(game_id, STRATEGIES[strategy_name])
+    _load_player(bot.username)
+
+    try:
+        result = _apply_move(game_id, Move(bot.username, Action.JOIN))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)})
+
+    if isinstance(result, MoveError):
+        return _reject_move(result)
+
+    return jsonify(
+        {
+            "success": True,
+            "message": f"Successfully added bot {bot.username}",
+            "username": bot.username,
+        }
+    )
+
+
+@app.route("/api/matchmake", methods=["POST"])
+def matchmake() -> Response:
+    username = _get_username()
+
+    if username is None:
+        return USER_NOT_LOGGED_IN()
+
+    if username not in players:
+        return USER_NOT_FOUND()
+
+    if username in matched_games:
+        game_id = matched_games.pop(username)
+
+        return jsonify(
+            {
+                "success": True,
+                "message": f"Matched into game {game_id}",
+                "game_id": game_id,
+            }
+        )
+
+    opponent = matchmaker.enqueue(username, players[username].balance)
+
+    if opponent is None:
+        return jsonify(
+            {
+                "success": True,
+                "message": "Waiting for an opponent",
+                "game_id": None,
+            }
+        )
+
+    game = Game.create().join(opponent).join(username)
+    _save_game(game)
+    matched_games[opponent] = game.id
+
+    return jsonify(
+        {
+            "success": True,
+            "message": f"Matched into game {game.id}",
+            "game_id": game.id,
+        }
+    )
+
+
+@app.route("/api/matchmake", methods=["DELETE"])
+def cancel_matchmaking() -> Response:
+    username = _get_username()
+
+    if username is None:
+        return USER_NOT_LOGGED_IN()
+
+    if not matchmaker.cancel(username):
+        return NOT_MATCHMAKING()
+
+    return MATCHMAKING_STOPPED()
+
+
+@app.route("/api/tournament", methods=["POST"])
+def create_tournament() -> Response:
+    username = _get_username()
+
+    if username is None:
+        return USER_NOT_LOGGED_IN()
+
+    usernames = request.json.get("usernames", [])  # type: ignore
+
+    if not all(is_valid_username(entrant) for entrant in usernames):
+        return INVALID_ENTRANT()
+
+    try:
+        tournament = Tournament(
+            usernames,
+            format=TournamentFormat(request.json.get("format", "bracket")),  # type: ignore
+            num_rounds=request.json.get("rounds", None),  # type: ignore
+            create_game=_create_game,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)})
+
+    for entrant in usernames:
+        _load_player(entrant)
+
+    tournaments[tournament.id] = tournament
+
+    for game in tournament.start():
+        _save_tournament_game(tournament, game)
+
+    return jsonify(
+        {
+            "success": True,
+            "message": f"Successfully created tournament",
+            "tournament_id": tournament.id,
+            "games": tournament.get_active_games(),
+        }
+    )
+
+
+@app.route("/api/tournament/<tournament_id>", methods=["GET"])
+def get_tournament(tournament_id: str) -> Response:
+    if tournament_id not in tournaments:
+        return TOURNAMENT_NOT_FOUND()
+
+    tournament = tournaments[tournament_id]
+
+    return jsonify(
+        {
+            "success": True,
+            "format": tournament.format.value,
+            "round": tournament.round,
+            "num_rounds": tournament.num_rounds,
+            "is_finished": tournament.is_finished(),
+            "champion": tournament.get_champion(),
+            "games": tournament.get_active_games(),
+            "standings": [
+                {
+                    "username": standing.username,
+                    "points": standing.points,
+                    "net": standing.net,
+                    "is_eliminated": standing.is_eliminated,
+                }
+                for standing in tournament.get_standings()
+            ],
+        }
+    )
+
+
 @app.route("/api/set-prediction", methods=["POST"])
 def set_prediction() -> Response:
     game_id = request.json["game_id"]  # type: ignore
@@ -258,29 +885,30 @@ def set_prediction() -> Response:
     log_error = int(request.json["error"])  # type: ignore
 
     if game_id not in games:
-        return jsonify({"error": "Game not found"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in"})
-
-    game = games[game_id]
-    estimate = Estimate(
-        log_answer=log_answer,
-        log_error=log_error,
-    )
+        return USER_NOT_LOGGED_IN()
 
     try:
-        new_game = game.set_estimate(estimate)
+        estimate = Estimate(
+            log_answer=log_answer,
+            log_error=log_error,
+        )
+        result = _apply_move(
+            game_id,
+            Move(username, Action.ESTIMATE, estimate),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
-    print(f"{new_game.get_esimate()=}")
-
-    return jsonify({"success": True, "message": "Successfully submitted estimate"})
+    return ESTIMATE_SUBMITTED()
 
 
 @app.route("/api/raise", methods=["POST"])
@@ -288,23 +916,26 @@ def raise_ante() -> Response:
     game_id = request.json["game_id"]  # type: ignore
 
     if game_id not in games:
-        return jsonify({"error": "Game not found"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in"})
-
-    game = games[game_id]
+        return USER_NOT_LOGGED_IN()
 
     try:
-        new_game = game.raise_ante(username)
+        result = _apply_move(
+            game_id,
+            Move(username, Action.RAISE),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
-    return jsonify({"success": True, "message": "Successfully raised ante"})
+    return ANTE_RAISED()
 
 
 @app.route("/api/call", methods=["POST"])
@@ -312,31 +943,26 @@ def call_ante() -> Response:
     game_id = request.json["game_id"]  # type: ignore
 
     if game_id not in games:
-        return jsonify({"error": "Game not found"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in"})
-
-    game = games[game_id]
+        return USER_NOT_LOGGED_IN()
 
     try:
-        new_game = game.call_ante(username)
+        result = _apply_move(
+            game_id,
+            Move(username, Action.CALL),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
-
-    opponent = game.get_opponent(username)
-
-    new_username_balance = players[username].balance + new_game.get_payout(username)
-    new_opponent_balance = players[opponent].balance + new_game.get_payout(opponent)
-
-    players[username] = players[username].set_balance(new_username_balance)
-    players[opponent] = players[opponent].set_balance(new_opponent_balance)
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
-    return jsonify({"success": True, "message": "Successfully called ante"})
+    return ANTE_CALLED()
 
 
 @app.route("/api/fold", methods=["POST"])
@@ -344,31 +970,26 @@ def fold() -> Response:
     game_id = request.json["game_id"]  # type: ignore
 
     if game_id not in games:
-        return jsonify({"error": "Game ID doesn't exist!"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in"})
-
-    game = games[game_id]
+        return USER_NOT_LOGGED_IN()
 
     try:
-        new_game = game.fold(username)
+        result = _apply_move(
+            game_id,
+            Move(username, Action.FOLD),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except ValueError as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
-
-    opponent = game.get_opponent(username)
-
-    new_username_balance = players[username].balance + new_game.get_payout(username)
-    new_opponent_balance = players[opponent].balance + new_game.get_payout(opponent)
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
-    players[username] = players[username].set_balance(new_username_balance)
-    players[opponent] = players[opponent].set_balance(new_opponent_balance)
-
-    return jsonify({"success": True, "message": "Successfully folded"})
+    return FOLDED()
 
 
 @app.route("/api/play-again", methods=["POST"])
@@ -377,9 +998,9 @@ def to_play_or_not_to_play() -> Response:
     play_again = request.json["play_again"]  # type: ignore
 
     if game_id not in games:
-        return jsonify({"success": False, "message": "Game not found!"})
+        return GAME_NOT_FOUND()
 
-    username = session.get("username", None)
+    username = _get_username()
 
     if username is None:
         return jsonify(
@@ -389,17 +1010,19 @@ def to_play_or_not_to_play() -> Response:
             }
         )
 
-    game = games[game_id]
+    action = Action.PLAY_AGAIN if play_again else Action.END
 
     try:
-        new_game = game.play_again(username)
-
-        if not play_again:
-            new_game = game.end()
+        result = _apply_move(
+            game_id,
+            Move(username, action),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
     except (InvalidStateException, ValueError) as e:
         return jsonify({"success": False, "message": str(e)})
 
-    games[game_id] = new_game
+    if isinstance(result, MoveError):
+        return _reject_move(result)
 
     return jsonify(
         {
@@ -412,18 +1035,335 @@ def to_play_or_not_to_play() -> Response:
 @app.route("/api/game/<game_id>/state", methods=["GET"])
 def get_state(game_id: str) -> Response:
     if game_id not in games:
-        return jsonify({"success": False, "message": "Game ID doesn't exist!"})
+        return GAME_NOT_FOUND()
 
     game = games[game_id]
-    username = session.get("username", None)
+    username = _get_game_username(game_id)
 
     if username is None:
-        return jsonify({"success": False, "message": "User not logged in"})
+        return USER_NOT_LOGGED_IN()
 
     state = str(game.get_state())
 
-    return jsonify({"success": True, "state": state})
+    return jsonify(
+        {
+            "success": True,
+            "state": state,
+            "current_player": game.get_current_player(),
+            "num_players": game.get_num_players(),
+        }
+    )
+
+
+@app.route("/api/game/<game_id>/act", methods=["POST"])
+def act(game_id: str) -> Response:
+    if game_id not in games:
+        return GAME_NOT_FOUND()
+
+    username = _get_username()
+
+    if username is None:
+        return USER_NOT_LOGGED_IN()
+
+    action_name = str(request.json.get("action", "")).upper()  # type: ignore
+
+    if action_name not in Action.__members__:
+        return UNKNOWN_ACTION()
+
+    action = Action[action_name]
+
+    if action == Action.ESTIMATE and not {"estimate", "error"} <= request.json.keys():  # type: ignore
+        return jsonify(
+            {"success": False, "message": "Estimate and error are required!"}
+        )
+
+    if action == Action.JOIN:
+        _load_player(username)
+
+    try:
+        estimate = None
+
+        if action == Action.ESTIMATE:
+            estimate = Estimate(
+                log_answer=int(request.json["estimate"]),  # type: ignore
+                log_error=int(request.json["error"]),  # type: ignore
+            )
+
+        result = _apply_move(
+            game_id,
+            Move(username, action, estimate),
+            request_id=request.json.get("request_id", None),  # type: ignore
+        )
+    except (InvalidStateException, ValueError) as e:
+        return jsonify({"success": False, "message": str(e)})
+
+    if isinstance(result, MoveError):
+        return _reject_move(result)
+
+    with _get_game_lock(game_id):
+        game = games[game_id]
+        version = game_versions[game_id]
+
+    return jsonify(
+        {
+            "success": True,
+            "version": version,
+            "view": _get_player_view(game, username),
+        }
+    )
+
+
+def _get_player_view(game: Game, username: str) -> dict:
+    """Returns what `username`'s game page shows, so a client can redraw it without reloading."""
+    state = game.get_state()
+    view = {
+        "state": str(state),
+        "round": game.round_number,
+        "seats": list(game.get_seats()),
+        "balance": _load_player(username).balance,
+        "is_estimator": game.is_estimator(username),
+        "is_current_player": game.is_current_player(username),
+        "current_player": game.get_current_player(),
+        "seconds_left": _get_seconds_left(game.id),
+    }
+
+    if game.get_num_players() < 2 or not game.contains(username):
+        return view
+
+    opponent = game.get_opponent(username)
+    view["problem"] = game.get_problem().question
+    view["ante"] = game.get_ante(username)
+    view["opponents_ante"] = game.get_ante(opponent)
+
+    if game.has_estimate():
+        view["estimate"] = game.estimate.log_answer  # type: ignore
+        view["error"] = game.estimate.log_error  # type: ignore
+
+    if game.is_round_settled():
+        view["answer"] = game.get_problem().log_answer
+        view["source"] = game.get_problem().source
+        view["payout"] = game.get_payout(username)
+        view["results"] = _get_side_results(game, username)
+
+    return view
+
+
+@app.route("/game/<game_id>/watch", methods=["GET"])
+def watch_game(game_id: str) -> str:
+    if game_id not in games:
+        return render_template("error.html", message=f"Game ID doesn't exist!")
+
+    return render_template("spectate.html", game_id=game_id)
+
+
+@app.route("/api/game/<game_id>/watch", methods=["GET"])
+def stream_game(game_id: str) -> Response:
+    if game_id not in games:
+        return GAME_NOT_FOUND()
+
+    last_event_id = request.headers.get("Last-Event-ID", "0")
+    after_version = int(last_event_id) if last_event_id.isdigit() else 0
+
+    def generate_events():
+        with broadcaster.watching(game_id):
+            # The first watcher opens the channel, so it starts from the game
+            # as it is; under the game's lock, so no move slips in between.
+            with _get_game_lock(game_id):
+                if broadcaster.get(game_id) is None:
+                    game = games[game_id]
+                    broadcaster.publish(game_id, _serialize_spectator_view(game))
+
+                    if game.is_game_over():
+                        broadcaster.close(game_id)
+
+            version = after_version
+
+            while True:
+                message = broadcaster.wait(game_id, version, WATCH_KEEPALIVE_SECONDS)
+
+                if message is not None:
+                    version = message.version
+                    yield message.event
+                elif broadcaster.is_closed(game_id):
+                    return
+                else:
+                    yield b": keepalive\n\n"
+
+    return Response(
+        stream_with_context(generate_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/game/<game_id>/history", methods=["GET"])
+def get_game_history(game_id: str) -> Response:
+    if game_id not in games:
+        return GAME_NOT_FOUND()
+
+    history = games[game_id].get_history()
+
+    return jsonify(
+        {
+            "success": True,
+            "rounds": [
+                {
+                    "round": record.round_number,
+                    "problem_index": record.problem_index,
+                    "estimator": record.estimator,
+                    "estimate": (
+                        record.estimate.log_answer if record.estimate else None
+                    ),
+                    "error": record.estimate.log_error if record.estimate else None,
+                    "outcome": str(record.outcome),
+                    "antes": record.antes,
+                    "payouts": record.payouts,
+                    "winners": record.get_winners(),
+                }
+                for record in history
+            ],
+        }
+    )
+
+
+@app.route("/api/player/<username>/history", methods=["GET"])
+def get_player_history(username: str) -> Response:
+    if ledger.get_balance(username) is None:
+        return USER_NOT_FOUND()
+
+    before_id = request.args.get("before_id", None, type=int)
+    limit = min(request.args.get("limit", 50, type=int), 200)
+
+    if limit <= 0:
+        return LIMIT_NOT_POSITIVE()
+
+    entries = ledger.get_history(username, before_id=before_id, limit=limit)
+
+    return jsonify(
+        {
+            "success": True,
+            "entries": [
+                {
+                    "id": entry.id,
+                    "game_id": entry.game_id,
+                    "round": entry.round,
+                    "delta": entry.delta,
+                    "balance": entry.balance,
+                    "created_at": entry.created_at,
+                }
+                for entry in entries
+            ],
+            "next_before_id": entries[-1].id if len(entries) == limit else None,
+        }
+    )
+
+
+@app.route("/api/leaderboard", methods=["GET"])
+def get_leaderboard() -> Response:
+    offset = request.args.get("offset", 0, type=int)
+    limit = min(request.args.get("limit", 20, type=int), 100)
+
+    if offset < 0 or limit < 0:
+        return jsonify(
+            {"success": False, "message": "Offset and limit must be non-negative!"}
+        )
+
+    page = leaderboard.get_page(offset, limit)
+
+    return jsonify(
+        {
+            "success": True,
+            "total": len(leaderboard),
+            "players": [
+                {"rank": offset + i + 1, "username": username, "balance": balance}
+                for i, (username, balance) in enumerate(page)
+            ],
+        }
+    )
+
+
+@app.route("/api/rank/<username>", methods=["GET"])
+def get_rank(username: str) -> Response:
+    rank = leaderboard.get_rank(username)
+
+    if rank is None:
+        return USER_NOT_FOUND()
+
+    return jsonify(
+        {
+            "success": True,
+            "username": username,
+            "rank": rank,
+            "balance": leaderboard.get_balance(username),
+        }
+    )
+
+
+@app.route("/api/rate-limits", methods=["GET"])
+def get_rate_limits() -> Response:
+    return jsonify(
+        {
+            "success": True,
+            "rejections": rate_limiter.get_rejections(),
+            "user_rejections": user_rate_limiter.get_rejections(),
+            "num_buckets": len(rate_limiter) + len(user_rate_limiter),
+        }
+    )
+
+
+@app.route("/api/ready", methods=["GET"])
+def get_ready() -> Response:
+    """Tells a load balancer whether `warm_up` has finished."""
+    if not is_warm.is_set():
+        return NOT_READY(503)
+
+    return READY()
+
+
+def warm_up() -> None:
+    """Pays the first requests' costs before any traffic arrives.
+
+    Opens the problem bank, compiles every template, plays each kind of move
+    on a throwaway game and sends Flask its first request.
+    """
+    get_problems().select(ProblemFilter())
+    get_problem_stats()
+
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+    # A throwaway game that's never saved, so no player or ledger entry is made.
+    game = Game.create().join("warmupone").join("warmuptwo")
+    estimator = game.estimator
+    estimatee = game.get_opponent(estimator)  # type: ignore
+    estimate = Estimate(log_answer=game.get_problem().log_answer, log_error=1)
+    moves = [
+        Move(estimatee, Action.RAISE),
+        Move(estimator, Action.ESTIMATE, estimate),  # type: ignore
+        Move(estimatee, Action.RAISE),
+        Move(estimator, Action.CALL),  # type: ignore
+        Move(estimator, Action.PLAY_AGAIN),  # type: ignore
+        Move(estimatee, Action.PLAY_AGAIN),
+        Move(game.get_next_estimator(), Action.FOLD),
+        Move(estimatee, Action.END),
+    ]
+
+    for move in moves:
+        if game.validate(move) is None:
+            game = game.apply(move)
+            _serialize_spectator_view(game)
+
+    app.test_client().get("/api/ready")
+    is_warm.set()
+
+
+def start_background_tasks() -> None:
+    get_problem_stats().start()
+    bot_runner.start()
+    timer_wheel.start()
 
 
 if __name__ == "__main__":
+    warm_up()
+    start_background_tasks()
     app.run(host="0.0.0.0", port=8000, debug=False)
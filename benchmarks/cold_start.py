@@ -0,0 +1,71 @@
+"""Times the first requests in fresh processes, with and without warming up first.
+
+python -m benchmarks.cold_start --processes 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+FIRST_REQUESTS = ["/", "/api/create", "/game/{game_id}", "/api/game/{game_id}/state"]
+
+
+def _run_child(is_warm: bool) -> None:
+    """Imports the app in this fresh process and prints how long its first requests took."""
+    import app
+
+    if is_warm:
+        app.warm_up()
+
+    client = app.app.test_client()
+    client.post("/api/login", json={"username": "coldstart"})
+    game_id = ""
+    start = time.perf_counter()
+
+    for url in FIRST_REQUESTS:
+        response = client.get(url.format(game_id=game_id))
+
+        if url == "/api/create":
+            game_id = response.json["game_id"]  # type: ignore
+
+    print(json.dumps(time.perf_counter() - start))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=20)
+    parser.add_argument("--child", choices=["cold", "warm"], default=None)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        _run_child(args.child == "warm")
+        return
+
+    env = dict(os.environ, LEDGER_PATH=":memory:", SESSION_PATH=":memory:")
+
+    for mode in ["cold", "warm"]:
+        latencies = []
+
+        for _ in range(args.processes):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.cold_start", "--child", mode],
+                env=env,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            latencies.append(json.loads(output.splitlines()[-1]))
+
+        percentiles = statistics.quantiles(latencies, n=100)
+
+        print(
+            f"{mode}: first {len(FIRST_REQUESTS)} requests p50 {percentiles[49] * 1e3:.1f}ms, p99 {percentiles[98] * 1e3:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Rejects out-of-turn moves in the engine and through the HTTP routes.
+
+python -m benchmarks.invalid_moves --moves 100000
+"""
+
+import argparse
+import os
+import time
+import traceback
+
+from game import Action, Estimate, Game, Move
+
+
+def _create_betting_game() -> Game:
+    game = Game.create().join("alice").join("bob")
+    estimate = Estimate(log_answer=game.get_problem().log_answer, log_error=1)
+
+    return game.apply(Move(game.estimator, Action.ESTIMATE, estimate))  # type: ignore
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--moves", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args(argv)
+
+    game = _create_betting_game()
+    move = Move(game.estimator, Action.RAISE)  # type: ignore
+
+    start = time.perf_counter()
+
+    for _ in range(args.moves):
+        try:
+            game.apply(move)
+        except AssertionError:
+            traceback.format_exc()
+
+    assertion_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for _ in range(args.moves):
+        game.validate(move)
+
+    validate_seconds = time.perf_counter() - start
+
+    print(
+        f"Rejected {args.moves:,} moves by assertion in {assertion_seconds:.2f}s ({args.moves / assertion_seconds:,.0f}/s)"
+    )
+    print(
+        f"Rejected {args.moves:,} moves by validate in {validate_seconds:.2f}s ({args.moves / validate_seconds:,.0f}/s)"
+    )
+
+    # The app opens its databases when it's imported, so keep them in memory.
+    os.environ.setdefault("LEDGER_PATH", ":memory:")
+    os.environ.setdefault("SESSION_PATH", ":memory:")
+
+    import app
+
+    app.games[game.id] = game
+    app.rate_limiter.limits.clear()
+    app.user_rate_limiter.limits.clear()
+    client = app.app.test_client()
+
+    client.set_cookie(app.SESSION_COOKIE, app.sessions.create(game.estimator))  # type: ignore
+
+    start = time.perf_counter()
+
+    for _ in range(args.requests):
+        response = client.post("/api/raise", json={"game_id": game.id})
+        assert response.status_code == 409
+
+    http_seconds = time.perf_counter() - start
+
+    print(
+        f"Answered {args.requests:,} out-of-turn raises with 409 in {http_seconds:.2f}s ({args.requests / http_seconds:,.0f}/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Loads a running server with players polling their games, and reports throughput and latency.
+
+Each player logs in, creates a game and polls its state every `--interval`
+seconds over one keep-alive connection, like an open game page does.
+
+python app.py  # or: gunicorn --config gunicorn.conf.py app:app
+python -m benchmarks.load --host localhost:8000 --players 200 --polls 30
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+
+
+class LoadPlayer:
+    def __init__(self, host: str, username: str):
+        self.username = username
+        self.connection = http.client.HTTPConnection(host, timeout=30)
+        self.cookie: str | None = None
+        self.latencies: list[float] = []
+        self.num_errors = 0
+
+    def request(self, method: str, url: str, body: dict | None = None) -> dict:
+        headers = {"Content-Type": "application/json"}
+
+        if self.cookie is not None:
+            headers["Cookie"] = self.cookie
+
+        start = time.perf_counter()
+        self.connection.request(
+            method, url, None if body is None else json.dumps(body), headers
+        )
+        response = self.connection.getresponse()
+        data = response.read()
+        self.latencies.append(time.perf_counter() - start)
+
+        if response.status != 200:
+            self.num_errors += 1
+
+        cookie = response.getheader("Set-Cookie", None)
+
+        if cookie is not None:
+            self.cookie = cookie.split(";")[0]
+
+        return json.loads(data)
+
+    def play(self, num_polls: int, interval: float) -> None:
+        self.request("POST", "/api/login", {"username": self.username})
+        game_id = self.request("GET", "/api/create")["game_id"]
+
+        for _ in range(num_polls):
+            start = time.perf_counter()
+            self.request("GET", f"/api/game/{game_id}/state")
+            time.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+        self.connection.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost:8000")
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=30)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    players = [
+        LoadPlayer(args.host, "load" + "".join(chr(ord("a") + int(d)) for d in str(i)))
+        for i in range(args.players)
+    ]
+    threads = [
+        threading.Thread(target=player.play, args=(args.polls, args.interval))
+        for player in players
+    ]
+
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    seconds = time.perf_counter() - start
+    latencies = [latency for player in players for latency in player.latencies]
+    percentiles = statistics.quantiles(latencies, n=100)
+    num_errors = sum(player.num_errors for player in players)
+
+    print(
+        f"{len(latencies):,} requests in {seconds:.2f}s ({len(latencies) / seconds:,.0f}/s), {num_errors:,} not OK"
+    )
+    print(
+        f"Latency p50 {percentiles[49] * 1e3:.1f}ms, p99 {percentiles[98] * 1e3:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
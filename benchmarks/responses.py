@@ -0,0 +1,98 @@
+"""Measures bytes sent and CPU time spent per request on the API and page routes.
+
+python -m benchmarks.responses --requests 2000
+"""
+
+import argparse
+import json
+import os
+import time
+
+from flask.json.provider import DefaultJSONProvider
+from responses import FastJSONProvider
+
+
+def _measure(client, method: str, url: str, num_requests: int, **kwargs) -> None:
+    num_bytes = 0
+    start = time.process_time()
+
+    for _ in range(num_requests):
+        response = client.open(url, method=method, **kwargs)
+        num_bytes = len(response.get_data())
+
+    cpu_seconds = time.process_time() - start
+    encoding = kwargs.get("headers", {}).get("Accept-Encoding", "identity")
+
+    print(
+        f"{method} {url} ({encoding}): {num_bytes:,} bytes, {cpu_seconds / num_requests * 1e6:,.0f}us CPU per request"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--encodings", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    # The app opens its databases when it's imported, so keep them in memory.
+    os.environ.setdefault("LEDGER_PATH", ":memory:")
+    os.environ.setdefault("SESSION_PATH", ":memory:")
+
+    import app
+
+    app.rate_limiter.limits.clear()
+    app.user_rate_limiter.limits.clear()
+    view = {
+        "success": True,
+        "version": 12,
+        "view": {
+            "state": "GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD",
+            "current_player": "alice",
+            "is_current_player": True,
+            "ante": 2,
+            "opponents_ante": 3,
+            "seconds_left": 14,
+            "antes": {"alice": 2, "bob": 3},
+        },
+    }
+
+    for provider in [DefaultJSONProvider(app.app), FastJSONProvider(app.app)]:
+        start = time.process_time()
+
+        for _ in range(args.encodings):
+            provider.dumps(view)
+
+        cpu_seconds = time.process_time() - start
+
+        print(
+            f"{type(provider).__name__}: {cpu_seconds / args.encodings * 1e6:.2f}us per view"
+        )
+
+    print(f"Standard library view: {len(json.dumps(view)):,} bytes")
+    print(f"Encoded view: {len(app.app.json.dumps(view)):,} bytes")
+
+    client = app.app.test_client()
+    _measure(client, "GET", "/api/game/ABCDE/state", args.requests)
+    _measure(client, "GET", "/", args.requests)
+
+    client.post("/api/login", json={"username": "alice"})
+    game_id = client.get("/api/create").json["game_id"]  # type: ignore
+
+    _measure(client, "GET", f"/api/game/{game_id}/state", args.requests)
+    _measure(client, "POST", "/api/raise", args.requests, json={"game_id": game_id})
+
+    for encoding in ["identity", "gzip"]:
+        _measure(
+            client,
+            "GET",
+            f"/game/{game_id}",
+            args.requests,
+            headers={"Accept-Encoding": encoding},
+        )
+        _measure(
+            client, "GET", "/", args.requests, headers={"Accept-Encoding": encoding}
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Schedules, cancels and fires a large number of turn timers.
+
+python -m benchmarks.timers --timers 1000000
+"""
+
+import argparse
+import random
+import time
+
+from timers import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=1_000_000)
+    parser.add_argument("--max-delay", type=float, default=150.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    clock = FakeClock()
+    wheel = TimerWheel(clock=clock)
+    delays = [rng.uniform(0, args.max_delay) for _ in range(args.timers)]
+    fired = [0]
+
+    def callback() -> None:
+        fired[0] += 1
+
+    start = time.perf_counter()
+    timers = [wheel.schedule(delay, callback) for delay in delays]
+    schedule_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for timer in timers[::2]:
+        timer.cancel()
+
+    cancel_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    clock.now = args.max_delay + 1
+    wheel.advance()
+    advance_seconds = time.perf_counter() - start
+
+    print(
+        f"Scheduled {args.timers:,} timers in {schedule_seconds:.2f}s ({args.timers / schedule_seconds:,.0f}/s)"
+    )
+    print(f"Cancelled {len(timers[::2]):,} timers in {cancel_seconds:.2f}s")
+    print(f"Fired {fired[0]:,} timers in {advance_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Simulates a tournament with many entrants whose games play out concurrently.
+
+python -m benchmarks.tournament --entrants 10000 --format swiss
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from game import Estimate, Game
+from tournament import Tournament, TournamentFormat
+
+
+def play_out(game: Game, rng: random.Random) -> Game:
+    """Plays one random round of a full game and ends it."""
+    estimator = game.get_estimator()
+
+    assert estimator is not None
+
+    if rng.random() < 0.1:
+        return game.fold(estimator).end()
+
+    log_answer = game.get_problem().log_answer + rng.randint(-2, 2)
+    game = game.set_estimate(
+        Estimate(log_answer=log_answer, log_error=rng.randint(0, 3))
+    )
+    estimatee = game.get_opponent(estimator)
+
+    if rng.random() < 0.3:
+        return game.fold(estimatee).end()
+
+    return game.call_ante(estimatee).end()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entrants", type=int, default=10_000)
+    parser.add_argument(
+        "--format", choices=[f.value for f in TournamentFormat], default="bracket"
+    )
+    parser.add_argument("--rounds", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    usernames = [f"player{i}" for i in range(args.entrants)]
+    tournament = Tournament(
+        usernames,
+        format=TournamentFormat(args.format),
+        num_rounds=args.rounds,
+        seed=args.seed,
+    )
+    lock = threading.Lock()
+    done = threading.Event()
+    stats = {"games": 0, "in_flight": 0, "max_in_flight": 0, "advance_seconds": 0.0}
+
+    def run(executor: ThreadPoolExecutor, game: Game) -> None:
+        finished = play_out(game, random.Random(game.id))
+        start = time.perf_counter()
+        new_games = tournament.on_game_over(finished)
+        elapsed = time.perf_counter() - start
+
+        with lock:
+            stats["games"] += 1
+            stats["advance_seconds"] += elapsed
+            stats["in_flight"] += len(new_games) - 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+
+            if stats["in_flight"] == 0:
+                done.set()
+
+        for new_game in new_games:
+            executor.submit(run, executor, new_game)
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        first_games = tournament.start()
+        stats["in_flight"] = stats["max_in_flight"] = len(first_games)
+
+        for game in first_games:
+            executor.submit(run, executor, game)
+
+        done.wait()
+
+    elapsed = time.perf_counter() - start
+    champion = tournament.get_champion()
+
+    print(f"{args.entrants:,} entrants, {args.format}, {tournament.num_rounds} rounds")
+    print(
+        f"Played {stats['games']:,} games in {elapsed:.2f}s ({stats['games'] / elapsed:,.0f} games/s)"
+    )
+    print(f"Up to {stats['max_in_flight']:,} games in flight")
+    print(
+        f"Time in on_game_over, lock waits included: {stats['advance_seconds']:.3f}s "
+        f"({stats['advance_seconds'] / stats['games'] * 1e6:,.1f}us per game)"
+    )
+    print(f"Champion: {champion}")
+
+
+if __name__ == "__main__":
+    main()
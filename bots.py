@@ -0,0 +1,241 @@
+import logging
+import math
+import queue
+import random
+import string
+import threading
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from game import Action, Estimate, Game, GameState, Move, MoveError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """How a bot guesses and bets.
+
+    A bot's guess of an answer's order of magnitude is off by a normal error
+    with standard deviation `skill`. From its guess it works out how likely
+    the estimate on the table is to be correct, raises while that favours it
+    by more than `raise_threshold` and its ante is below `max_ante`, calls
+    while it still favours it by `fold_threshold`, and folds otherwise.
+    """
+
+    name: str
+    skill: float = 1.0
+    log_error: int = 1
+    max_ante: int = 3
+    raise_threshold: float = 0.65
+    fold_threshold: float = 0.35
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in [
+        Strategy(name="cautious", skill=1.0, log_error=2, max_ante=2),
+        Strategy(
+            name="aggressive",
+            skill=1.5,
+            log_error=0,
+            max_ante=6,
+            raise_threshold=0.5,
+            fold_threshold=0.2,
+        ),
+        Strategy(name="expert", skill=0.5, log_error=1, max_ante=4),
+    ]
+}
+
+
+@dataclass(frozen=True)
+class Bot:
+    username: str
+    game_id: str
+    strategy: Strategy
+
+
+def choose_move(
+    game: Game, username: str, strategy: Strategy, rng: random.Random
+) -> Move | None:
+    """Returns the bot's move, or None if it's not the bot's turn."""
+    state = game.get_state()
+
+    if state in [
+        GameState.ESTIMATEE_FOLDED,
+        GameState.ESTIMATOR_FOLDED,
+        GameState.BOTH_PLAYERS_CALLED,
+        GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN,
+    ]:
+        if username in game.players_playing_again:
+            return None
+
+        return Move(username, Action.PLAY_AGAIN)
+
+    if not game.is_current_player(username):
+        return None
+
+    guess = game.get_problem().log_answer + rng.gauss(0, strategy.skill)
+
+    if state == GameState.WAITING_FOR_ESTIMATE:
+        estimate = Estimate(log_answer=round(guess), log_error=strategy.log_error)
+
+        return Move(username, Action.ESTIMATE, estimate)
+
+    if state not in [
+        GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
+        GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD,
+    ]:
+        return None
+
+    p_correct = _get_probability_correct(game.estimate, guess, strategy.skill)  # type: ignore
+    p_win = p_correct if game.is_estimator(username) else 1 - p_correct
+    ante = game.get_ante(username)
+    opponents_ante = game.get_ante(game.get_opponent(username))
+
+    if p_win > strategy.raise_threshold and opponents_ante < strategy.max_ante:
+        return Move(username, Action.RAISE)
+
+    if p_win > strategy.fold_threshold and ante < opponents_ante:
+        return Move(username, Action.CALL)
+
+    return Move(username, Action.FOLD)
+
+
+def _get_probability_correct(estimate: Estimate, guess: float, skill: float) -> float:
+    """Returns the chance the answer is within the estimate's error, believing it's near `guess`."""
+    low = estimate.log_answer - estimate.log_error - 0.5 - guess
+    high = estimate.log_answer + estimate.log_error + 0.5 - guess
+
+    return _normal_cdf(high / skill) - _normal_cdf(low / skill)
+
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+class BotRunner:
+    """Plays bots' turns on a pool of worker threads, off the request threads.
+
+    Whenever a game with a bot in it is saved, `notify` queues the game's id
+    (at most once at a time). Workers read the latest state of queued games,
+    choose each bot's move and hand it to `apply_move`, which plays it through
+    the same path as human moves; that save notifies the runner again, so a
+    bot keeps acting until it's waiting on someone else.
+    """
+
+    def __init__(
+        self,
+        get_game: Callable[[str], Game | None],
+        apply_move: Callable[[str, Move], Game | MoveError],
+        num_workers: int = 2,
+        seed: int | None = None,
+    ):
+        self._get_game = get_game
+        self._apply_move = apply_move
+        self._num_workers = num_workers
+        self._rng = random.Random(seed)
+        self._bots: dict[str, Bot] = {}
+        self._queue: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._queued: set[str] = set()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def create_bot(self, game_id: str, strategy: Strategy) -> Bot:
+        with self._lock:
+            username = "bot" + "".join(self._rng.choices(string.ascii_lowercase, k=8))
+
+            while username in self._bots:
+                username = "bot" + "".join(
+                    self._rng.choices(string.ascii_lowercase, k=8)
+                )
+
+            bot = Bot(username=username, game_id=game_id, strategy=strategy)
+            self._bots[username] = bot
+
+        return bot
+
+    def is_bot(self, username: str) -> bool:
+        return username in self._bots
+
+    def notify(self, game: Game) -> None:
+        if not any(username in self._bots for username in game.get_seats()):
+            return
+
+        if game.is_game_over():
+            with self._lock:
+                for username in game.get_seats():
+                    self._bots.pop(username, None)
+
+            return
+
+        with self._lock:
+            if game.id in self._queued:
+                return
+
+            self._queued.add(game.id)
+
+        self._queue.put(game.id)
+
+    def start(self) -> None:
+        if self._threads:
+            return
+
+        for _ in range(self._num_workers):
+            thread = threading.Thread(target=self._work_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def run_pending(self) -> int:
+        """Plays queued bot turns on the calling thread until none are left."""
+        num_moves = 0
+
+        while True:
+            try:
+                game_id = self._queue.get_nowait()
+            except queue.Empty:
+                return num_moves
+
+            num_moves += self._play(game_id)
+
+    def _work_forever(self) -> None:
+        while True:
+            self._play(self._queue.get())
+
+    def _play(self, game_id: str) -> int:
+        with self._lock:
+            self._queued.discard(game_id)
+
+        game = self._get_game(game_id)
+
+        if game is None:
+            return 0
+
+        for username in game.get_seats():
+            bot = self._bots.get(username, None)
+
+            if bot is None:
+                continue
+
+            # Seeded per round so a bot's guess doesn't change between its turns.
+            rng = random.Random(f"{username}:{game_id}:{game.round_number}")
+            move = choose_move(game, username, bot.strategy, rng)
+
+            if move is None:
+                continue
+
+            try:
+                result = self._apply_move(game_id, move)
+            except Exception:
+                logger.exception(f"Bot {username} couldn't play {move.action}")
+                return 1
+
+            if isinstance(result, MoveError):
+                # The game moved on since it was read; its next save queues it again.
+                logger.info(
+                    f"Bot {username} couldn't play {move.action}: {result.name}"
+                )
+
+            return 1
+
+        return 0
@@ -0,0 +1,128 @@
+import itertools
+import threading
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Message:
+    version: int
+    data: bytes
+    event: bytes
+
+
+class _Channel:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.message: Message | None = None
+        self.is_closed = False
+        self.num_watchers = 0
+
+
+class Broadcaster:
+    """Fans out each game's latest state to every watcher of that game.
+
+    Publishers hand over bytes that were serialized once, which are framed as
+    a server-sent event once, and every watcher woken by the game's condition
+    reads that same `Message`, so the cost of a state change doesn't grow with
+    the number of watchers. Watchers that fall behind skip straight to the
+    latest version.
+
+    A game only has a channel while someone is watching it, so memory follows
+    the games being watched rather than every game ever played. Versions come
+    from one counter shared by every game, so they keep increasing when a
+    game's channel is removed and opened again, and a watcher reconnecting
+    with its last version never waits on a number that was already used.
+    """
+
+    def __init__(self):
+        self._channels: dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        self._versions = itertools.count(1)
+
+    @contextmanager
+    def watching(self, game_id: str) -> Iterator[None]:
+        """Keeps the game's channel open while the block runs; the last watcher to leave removes it."""
+        with self._lock:
+            channel = self._channels.setdefault(game_id, _Channel())
+            channel.num_watchers += 1
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                channel.num_watchers -= 1
+
+                if channel.num_watchers == 0 and self._channels.get(game_id) is channel:
+                    del self._channels[game_id]
+
+    def is_watched(self, game_id: str) -> bool:
+        return game_id in self._channels
+
+    def publish(self, game_id: str, data: bytes) -> Message | None:
+        """Sends `data` to the game's watchers; does nothing and returns None if there are none."""
+        channel = self._channels.get(game_id, None)
+
+        if channel is None:
+            return None
+
+        with channel.condition:
+            version = next(self._versions)
+            message = Message(
+                version=version,
+                data=data,
+                event=b"id: %d\ndata: %s\n\n" % (version, data),
+            )
+            channel.message = message
+            channel.condition.notify_all()
+
+        return message
+
+    def get(self, game_id: str) -> Message | None:
+        channel = self._channels.get(game_id, None)
+
+        return None if channel is None else channel.message
+
+    def wait(
+        self, game_id: str, after_version: int, timeout: float | None = None
+    ) -> Message | None:
+        """Blocks until a message newer than `after_version` is published, returning None on timeout or close."""
+        channel = self._channels.get(game_id, None)
+
+        if channel is None:
+            return None
+
+        def has_news() -> bool:
+            return channel.is_closed or (
+                channel.message is not None and channel.message.version > after_version
+            )
+
+        with channel.condition:
+            if not channel.condition.wait_for(has_news, timeout):
+                return None
+
+            if channel.message is None or channel.message.version <= after_version:
+                return None
+
+            return channel.message
+
+    def close(self, game_id: str) -> None:
+        """Wakes every watcher of the game for the last time; they still get its last message."""
+        channel = self._channels.get(game_id, None)
+
+        if channel is None:
+            return
+
+        with channel.condition:
+            channel.is_closed = True
+            channel.condition.notify_all()
+
+    def is_closed(self, game_id: str) -> bool:
+        channel = self._channels.get(game_id, None)
+
+        return channel is None or channel.is_closed
+
+    def __len__(self) -> int:
+        return len(self._channels)
@@ -0,0 +1,40 @@
+import os
+import pytest
+import zlib
+
+from game import seed, use_problems
+from problems import Problem, ProblemBank, write_problem_bank
+
+# The app opens its databases when it's imported, so keep tests off the files.
+os.environ.setdefault("LEDGER_PATH", ":memory:")
+os.environ.setdefault("SESSION_PATH", ":memory:")
+
+TEST_PROBLEMS = [
+    Problem("How many neurons?", 11, "", category="biology", difficulty=2),
+    Problem("How many cells?", 13, "", category="biology", difficulty=2),
+    Problem("How many blinks?", 4, "", category="biology", difficulty=1),
+    Problem("How many atoms?", 18, "", category="physics", difficulty=3),
+    Problem("How many stars?", 22, "", category="physics", difficulty=3),
+    Problem("How many words?", 6, "", category="", difficulty=0),
+]
+
+
+@pytest.fixture(scope="session")
+def test_problem_bank(tmp_path_factory) -> ProblemBank:
+    # One per session, which under pytest-xdist means one per worker.
+    path = str(tmp_path_factory.mktemp("problems") / "problems.bank")
+    write_problem_bank(TEST_PROBLEMS, path)
+
+    return ProblemBank(path)
+
+
+@pytest.fixture(autouse=True)
+def isolated_games(request, test_problem_bank):
+    # Seeded by the test's id rather than its position in the run, so a test
+    # draws the same game ids and problems whichever worker runs it, in any order.
+    seed(zlib.crc32(request.node.nodeid.encode()))
+    use_problems(test_problem_bank)
+
+    yield
+
+    use_problems(None)
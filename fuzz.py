@@ -0,0 +1,213 @@
+"""Plays random moves on random games and checks the engine's invariants.
+
+python fuzz.py --workers 8 --steps 1000000
+"""
+
+import argparse
+import os
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from game import (
+    MAX_PLAYERS,
+    MOVE_STATES,
+    VALID_TRANSITIONS,
+    Action,
+    Estimate,
+    Game,
+    InvalidStateException,
+    Move,
+)
+
+ACTIONS = list(Action)
+STATE_ACTIONS = {
+    state: [action for action, states in MOVE_STATES.items() if state in states]
+    for state in VALID_TRANSITIONS
+}
+MAX_MOVES_PER_GAME = 200
+MAX_TRAIL_LENGTH = 20
+
+
+class InvariantViolation(AssertionError):
+    """Raised with the seed and the moves leading up to a broken invariant."""
+
+
+@dataclass(frozen=True)
+class Exploration:
+    num_steps: int
+    num_applied: int
+    num_rejected: int
+    num_games: int
+    num_rounds: int
+
+
+def explore(seed: int, num_steps: int) -> Exploration:
+    """Plays `num_steps` random moves, starting a new game whenever one ends."""
+    rng = random.Random(seed)
+    num_applied = num_rejected = num_games = num_rounds = 0
+    game, usernames = _create_game(rng)
+    trail: list[Move] = []
+    num_moves_in_game = 0
+
+    for step in range(num_steps):
+        if game.is_game_over() or num_moves_in_game == MAX_MOVES_PER_GAME:
+            num_games += 1
+            game, usernames = _create_game(rng)
+            trail.clear()
+            num_moves_in_game = 0
+
+        move = _choose_move(game, usernames, rng)
+        trail.append(move)
+        del trail[:-MAX_TRAIL_LENGTH]
+        num_moves_in_game += 1
+        error = game.validate(move)
+
+        try:
+            new_game = game.apply(move)
+        except (AssertionError, InvalidStateException) as e:
+            if error is None:
+                _fail(
+                    seed, step, trail, f"validate accepted a move apply rejects: {e!r}"
+                )
+
+            num_rejected += 1
+            continue
+
+        if error is not None:
+            _fail(seed, step, trail, f"validate rejected a move apply accepts: {error}")
+
+        _check(game, new_game, seed, step, trail)
+
+        if new_game.is_round_settled() and not game.is_round_settled():
+            num_rounds += 1
+
+        game = new_game
+        num_applied += 1
+
+    return Exploration(
+        num_steps=num_steps,
+        num_applied=num_applied,
+        num_rejected=num_rejected,
+        num_games=num_games,
+        num_rounds=num_rounds,
+    )
+
+
+def _create_game(rng: random.Random) -> tuple[Game, list[str]]:
+    max_players = rng.randint(2, MAX_PLAYERS)
+    # One more name than there are seats, so some moves come from an outsider.
+    usernames = ["player" + "abcdefghi"[i] for i in range(max_players + 1)]
+
+    return Game.create(max_players=max_players), usernames
+
+
+def _choose_move(game: Game, usernames: list[str], rng: random.Random) -> Move:
+    # Mostly moves allowed in this state, by whoever's turn it is, so games
+    # get deep; the rest are anything by anyone, to exercise rejection.
+    if rng.random() < 0.2:
+        action = rng.choice(ACTIONS)
+        username = rng.choice(usernames)
+    else:
+        action = rng.choice(STATE_ACTIONS[game.get_state()])
+        username = game.get_current_player() or rng.choice(usernames)
+
+        if action == Action.JOIN:
+            username = rng.choice(usernames)
+
+    if action != Action.ESTIMATE or rng.random() < 0.05:
+        return Move(username, action)
+
+    estimate = Estimate(
+        log_answer=game.get_problem().log_answer + rng.randint(-3, 3),
+        log_error=rng.randint(0, 3),
+    )
+
+    return Move(game.estimator or username, action, estimate)
+
+
+def _check(game: Game, new_game: Game, seed: int, step: int, trail: list[Move]) -> None:
+    state, new_state = game.get_state(), new_game.get_state()
+
+    if new_game is not game and new_state not in VALID_TRANSITIONS[state]:
+        _fail(seed, step, trail, f"{state} can't transition to {new_state}")
+
+    if new_game.round_number == game.round_number:
+        for username in game.usernames:
+            # The estimator bets afresh against each estimatee in turn.
+            if (
+                username == game.estimator
+                and new_game.get_current_side() != game.get_current_side()
+            ):
+                continue
+
+            if new_game.antes.get(username, 0) < game.antes.get(username, 0):
+                _fail(seed, step, trail, f"{username}'s ante decreased")
+
+    current_player = new_game.get_current_player()
+
+    if current_player is not None and current_player not in new_game.usernames:
+        _fail(seed, step, trail, f"current player {current_player} isn't in the game")
+
+    if new_game.is_round_settled():
+        payouts = [new_game.get_payout(username) for username in new_game.get_seats()]
+
+        if sum(payouts) != 0:
+            _fail(seed, step, trail, f"payouts {payouts} don't sum to zero")
+
+    history = new_game.get_history()
+
+    if len(history) > len(game.get_history()):
+        record = history[len(history) - 1]
+
+        if sum(record.payouts.values()) != 0:
+            _fail(
+                seed,
+                step,
+                trail,
+                f"recorded payouts {record.payouts} don't sum to zero",
+            )
+
+
+def _fail(seed: int, step: int, trail: list[Move], message: str) -> None:
+    moves = "\n".join(f"  {move}" for move in trail)
+
+    raise InvariantViolation(
+        f"Seed {seed}, step {step}: {message}\nLast moves:\n{moves}"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--steps", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Each worker explores its own seed, so a failure names the seed to rerun.
+    seeds = [args.seed + i for i in range(args.workers)]
+    steps_per_worker = args.steps // args.workers
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        explorations = list(
+            executor.map(explore, seeds, [steps_per_worker] * args.workers)
+        )
+
+    seconds = time.perf_counter() - start
+    num_steps = sum(exploration.num_steps for exploration in explorations)
+
+    print(
+        f"Explored {num_steps:,} steps in {seconds:.2f}s ({num_steps / seconds * 60:,.0f}/min)"
+    )
+    print(
+        f"{sum(e.num_applied for e in explorations):,} applied, "
+        f"{sum(e.num_rejected for e in explorations):,} rejected, "
+        f"{sum(e.num_rounds for e in explorations):,} rounds settled, "
+        f"{sum(e.num_games for e in explorations):,} games finished"
+    )
+
+
+if __name__ == "__main__":
+    main()
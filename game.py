@@ -1,8 +1,10 @@
 import random
-import pandas as pd  # type: ignore
 
+from array import array
 from enum import Enum, auto
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
+from problem_stats import ProblemStats, get_problem_stats as get_bundled_problem_stats
+from problems import Problem, ProblemBank, ProblemDeck, ProblemFilter, load_problem_bank
 
 LOG_ERROR_TO_PAYOUT = {
     0: 8,
@@ -11,6 +13,17 @@ LOG_ERROR_TO_PAYOUT = {
     3: 1,
 }
 
+MAX_PLAYERS = 8
+MAX_ROUNDS_IN_HISTORY = 100
+MAX_ADAPTIVE_DRAW_ATTEMPTS = 3
+
+# Game ids and problem draws come from this generator, so seeding it replays
+# them exactly. Problems come from the bundled bank unless `use_problems`
+# swaps in another, as the tests do with a small one.
+rng = random.Random()
+_problems: ProblemBank | None = None
+_problem_stats: ProblemStats | None = None
+
 
 class InvalidStateException(Exception):
     """Raised when a state transition is invalid."""
@@ -39,7 +52,10 @@ class GameState(Enum):
 
 VALID_TRANSITIONS: dict[GameState, tuple[GameState, ...]] = {
     GameState.GAME_IS_EMPTY: (GameState.WAITING_FOR_ANOTHER_PLAYER,),
-    GameState.WAITING_FOR_ANOTHER_PLAYER: (GameState.WAITING_FOR_ESTIMATE,),
+    GameState.WAITING_FOR_ANOTHER_PLAYER: (
+        GameState.WAITING_FOR_ANOTHER_PLAYER,
+        GameState.WAITING_FOR_ESTIMATE,
+    ),
     GameState.WAITING_FOR_ESTIMATE: (
         GameState.ESTIMATOR_FOLDED,
         GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
@@ -54,6 +70,7 @@ VALID_TRANSITIONS: dict[GameState, tuple[GameState, ...]] = {
     ),
     GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD: (
         GameState.ESTIMATEE_FOLDED,
+        GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
         GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD,
         GameState.BOTH_PLAYERS_CALLED,
     ),
@@ -67,6 +84,7 @@ VALID_TRANSITIONS: dict[GameState, tuple[GameState, ...]] = {
         GameState.GAME_OVER,
     ),
     GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN: (
+        GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN,
         GameState.WAITING_FOR_ESTIMATE,
         GameState.GAME_OVER,
     ),
@@ -74,13 +92,6 @@ VALID_TRANSITIONS: dict[GameState, tuple[GameState, ...]] = {
 }
 
 
-@dataclass(frozen=True)
-class Problem:
-    question: str
-    log_answer: int
-    source: str
-
-
 @dataclass(frozen=True)
 class Estimate:
     log_answer: int
@@ -94,6 +105,200 @@ class Estimate:
             raise ValueError("Log error must be less than 4!")
 
 
+class Action(Enum):
+    JOIN = auto()
+    ESTIMATE = auto()
+    RAISE = auto()
+    CALL = auto()
+    FOLD = auto()
+    PLAY_AGAIN = auto()
+    END = auto()
+
+
+@dataclass(frozen=True)
+class Move:
+    username: str
+    action: Action
+    estimate: Estimate | None = None
+
+
+class MoveError(Enum):
+    """Why a move is illegal; the value is the message shown to the player."""
+
+    WRONG_STATE = "You can't do that right now!"
+    NOT_IN_GAME = "You're not in this game!"
+    ALREADY_JOINED = "Already joined game!"
+    GAME_IS_FULL = "Game is full!"
+    NOT_ESTIMATOR = "Only the estimator can estimate!"
+    MISSING_ESTIMATE = "Estimate is required!"
+    NOT_YOUR_TURN = "It's not your turn!"
+    GAME_HAS_CHANGED = "Game has changed since the move was chosen!"
+    REQUEST_ID_REUSED = "Request ID was already used for another move!"
+
+
+MOVE_STATES: dict[Action, tuple[GameState, ...]] = {
+    Action.JOIN: (
+        GameState.GAME_IS_EMPTY,
+        GameState.WAITING_FOR_ANOTHER_PLAYER,
+    ),
+    Action.ESTIMATE: (GameState.WAITING_FOR_ESTIMATE,),
+    Action.RAISE: (
+        GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
+        GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD,
+    ),
+    Action.CALL: (
+        GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
+        GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD,
+    ),
+    Action.FOLD: (
+        GameState.WAITING_FOR_ESTIMATE,
+        GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD,
+        GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD,
+    ),
+    Action.PLAY_AGAIN: (
+        GameState.ESTIMATOR_FOLDED,
+        GameState.ESTIMATEE_FOLDED,
+        GameState.BOTH_PLAYERS_CALLED,
+        GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN,
+        GameState.GAME_OVER,
+    ),
+    Action.END: (
+        GameState.ESTIMATOR_FOLDED,
+        GameState.ESTIMATEE_FOLDED,
+        GameState.BOTH_PLAYERS_CALLED,
+        GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN,
+        GameState.GAME_OVER,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Side:
+    """A settled bet between the estimator and one estimatee."""
+
+    estimatee: str
+    estimator_ante: int
+    estimatee_ante: int
+    outcome: GameState
+
+
+@dataclass(frozen=True)
+class RoundRecord:
+    round_number: int
+    problem_index: int
+    estimator: str
+    estimate: Estimate | None
+    outcome: GameState
+    antes: dict[str, int]
+    payouts: dict[str, int]
+
+    def get_winners(self) -> list[str]:
+        return [username for username, payout in self.payouts.items() if payout > 0]
+
+
+@dataclass(frozen=True)
+class RoundHistory:
+    """The most recent `cap` rounds of a game, stored column-wise in arrays.
+
+    Per-player columns (`antes` and `payouts`) hold one value per seat for each
+    round, in the order given by `seats`.
+    """
+
+    cap: int = MAX_ROUNDS_IN_HISTORY
+    seats: tuple[str, ...] = ()
+    round_numbers: array = field(default_factory=lambda: array("l"))
+    problem_indices: array = field(default_factory=lambda: array("l"))
+    estimator_seats: array = field(default_factory=lambda: array("B"))
+    log_answers: array = field(default_factory=lambda: array("l"))
+    log_errors: array = field(default_factory=lambda: array("b"))
+    outcomes: array = field(default_factory=lambda: array("B"))
+    antes: array = field(default_factory=lambda: array("l"))
+    payouts: array = field(default_factory=lambda: array("l"))
+
+    def __post_init__(self):
+        if self.cap <= 0:
+            raise ValueError("History cap must be positive!")
+
+    def __len__(self) -> int:
+        return len(self.round_numbers)
+
+    def __getitem__(self, i: int) -> RoundRecord:
+        if not -len(self) <= i < len(self):
+            raise IndexError("Round history index out of range!")
+
+        i = i % len(self)
+        num_seats = len(self.seats)
+        antes = self.antes[i * num_seats : (i + 1) * num_seats]
+        payouts = self.payouts[i * num_seats : (i + 1) * num_seats]
+        estimate = None
+
+        if self.log_errors[i] >= 0:
+            estimate = Estimate(
+                log_answer=self.log_answers[i],
+                log_error=self.log_errors[i],
+            )
+
+        return RoundRecord(
+            round_number=self.round_numbers[i],
+            problem_index=self.problem_indices[i],
+            estimator=self.seats[self.estimator_seats[i]],
+            estimate=estimate,
+            outcome=GameState(self.outcomes[i]),
+            antes=dict(zip(self.seats, antes)),
+            payouts=dict(zip(self.seats, payouts)),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def append(self, record: RoundRecord) -> "RoundHistory":
+        # pre-conditions
+        seats = self.seats or tuple(sorted(record.antes))
+
+        assert set(record.antes) == set(seats)
+        assert set(record.payouts) == set(seats)
+
+        # body
+        num_dropped = max(len(self) + 1 - self.cap, 0)
+        estimate = record.estimate
+
+        def extend(column: array, values: list[int], width: int = 1) -> array:
+            return column[num_dropped * width :] + array(column.typecode, values)
+
+        new_history = replace(
+            self,
+            seats=seats,
+            round_numbers=extend(self.round_numbers, [record.round_number]),
+            problem_indices=extend(self.problem_indices, [record.problem_index]),
+            estimator_seats=extend(
+                self.estimator_seats, [seats.index(record.estimator)]
+            ),
+            log_answers=extend(
+                self.log_answers, [estimate.log_answer if estimate else 0]
+            ),
+            log_errors=extend(
+                self.log_errors, [estimate.log_error if estimate else -1]
+            ),
+            outcomes=extend(self.outcomes, [record.outcome.value]),
+            antes=extend(
+                self.antes,
+                [record.antes[username] for username in seats],
+                len(seats),
+            ),
+            payouts=extend(
+                self.payouts,
+                [record.payouts[username] for username in seats],
+                len(seats),
+            ),
+        )
+
+        # post-conditions
+        assert len(new_history) <= self.cap
+        assert new_history[-1] == record
+
+        return new_history
+
+
 @dataclass(frozen=True)
 class Player:
     username: str
@@ -121,18 +326,48 @@ class Game:
     estimate: Estimate | None
     current_player: str | None
     antes: dict[str, int]
+    round_number: int = 1
+    history: RoundHistory = field(default_factory=RoundHistory)
+    deck: ProblemDeck | None = None
+    problem_filter: ProblemFilter = field(default_factory=ProblemFilter)
+    target_hit_rate: float | None = None
+    seats: tuple[str, ...] = ()
+    max_players: int = 2
+    current_side: str | None = None
+    sides: dict[str, Side] = field(default_factory=dict)
+    players_playing_again: frozenset[str] = frozenset()
+    net_payouts: dict[str, int] = field(default_factory=dict)
 
     @staticmethod
-    def create() -> "Game":
+    def create(
+        history_cap: int = MAX_ROUNDS_IN_HISTORY,
+        problem_filter: ProblemFilter | None = None,
+        target_hit_rate: float | None = None,
+        max_players: int = 2,
+    ) -> "Game":
+        if target_hit_rate is not None and not 0 <= target_hit_rate <= 1:
+            raise ValueError("Target hit rate must be between 0 and 1!")
+
+        if not 2 <= max_players <= MAX_PLAYERS:
+            raise ValueError(f"A game must have from 2 to {MAX_PLAYERS} players!")
+
+        problem_filter = problem_filter or ProblemFilter()
+        problem, deck = _draw_problem(None, problem_filter, target_hit_rate)
+
         return Game(
             id=_generate_game_id(),
             current_state=GameState.GAME_IS_EMPTY,
             usernames=set(),
-            problem=_generate_problem(),
+            problem=problem,
             estimator=None,
             estimate=None,
             current_player=None,
             antes={},
+            history=RoundHistory(cap=history_cap),
+            deck=deck,
+            problem_filter=problem_filter,
+            target_hit_rate=target_hit_rate,
+            max_players=max_players,
         )
 
     def join(self, username: str) -> "Game":
@@ -141,12 +376,17 @@ class Game:
             GameState.GAME_IS_EMPTY,
             GameState.WAITING_FOR_ANOTHER_PLAYER,
         ]
+        assert username not in self.usernames
+        assert not self.is_full()
 
         # body
         new_usernames = set([*self.usernames, username])
+        new_seats = (*self.seats, username)
         old_antes = self.get_antes()
         new_antes = {**old_antes, username: 0}
-        new_game = replace(self, usernames=new_usernames, antes=new_antes)
+        new_game = replace(
+            self, usernames=new_usernames, seats=new_seats, antes=new_antes
+        )
 
         if new_game.get_num_players() == 1:
             return (
@@ -156,6 +396,9 @@ class Game:
                 .transition_to(GameState.WAITING_FOR_ANOTHER_PLAYER)
             )
 
+        if not new_game.is_full():
+            return new_game.transition_to(GameState.WAITING_FOR_ANOTHER_PLAYER)
+
         return new_game.transition_to(GameState.WAITING_FOR_ESTIMATE)
 
     def contains(self, username: str) -> bool:
@@ -164,6 +407,31 @@ class Game:
     def get_num_players(self) -> int:
         return len(self.usernames)
 
+    def get_max_players(self) -> int:
+        return self.max_players
+
+    def is_full(self) -> bool:
+        return self.get_num_players() >= self.max_players
+
+    def get_seats(self) -> tuple[str, ...]:
+        return self.seats
+
+    def get_estimatees(self) -> list[str]:
+        """Returns every player but the estimator, in seat order."""
+        # pre-conditions
+        assert self.estimator is not None
+
+        # body
+        seat = self.seats.index(self.estimator)
+
+        return [*self.seats[seat + 1 :], *self.seats[:seat]]
+
+    def get_current_side(self) -> str | None:
+        return self.current_side
+
+    def get_sides(self) -> dict[str, Side]:
+        return self.sides
+
     def set_estimator(self, username: str | None) -> "Game":
         # pre-conditions
         assert username is None or username in self.usernames
@@ -201,7 +469,7 @@ class Game:
 
         # body
         new_game = (
-            replace(self, estimate=estimate)
+            replace(self, estimate=estimate, current_side=self.get_estimatees()[0])
             .switch_turns()
             .transition_to(GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD)
         )
@@ -230,16 +498,19 @@ class Game:
         return self.get_current_player() == username
 
     def get_opponent(self, username: str) -> str:
+        """Returns the estimator, or for the estimator the current side's estimatee."""
         # pre-conditions
         assert username in self.usernames
+        assert self.get_num_players() >= 2
+        assert self.estimator is not None
 
         # body
-        username_list = list(self.usernames)
-
-        if username == username_list[1]:
-            opponent = username_list[0]
+        if not self.is_estimator(username):
+            opponent = self.estimator
+        elif self.current_side is not None:
+            opponent = self.current_side
         else:
-            opponent = username_list[1]
+            opponent = self.get_estimatees()[0]
 
         # post-conditions
         assert opponent in self.usernames
@@ -335,13 +606,12 @@ class Game:
         new_game = (
             self.set_ante(username, oppoenents_ante)
             .switch_turns()
-            .transition_to(GameState.BOTH_PLAYERS_CALLED)
+            ._settle_side(GameState.BOTH_PLAYERS_CALLED)
         )
 
         # post-conditions
-        assert new_game.get_ante(username) == new_game.get_ante(opponent)
-        assert new_game.get_state() == GameState.BOTH_PLAYERS_CALLED
-        assert new_game.is_current_player(opponent)
+        if new_game.get_state() == GameState.BOTH_PLAYERS_CALLED:
+            assert new_game.is_current_player(opponent)
 
         return new_game
 
@@ -361,50 +631,104 @@ class Game:
 
         # body
         if self.get_state() == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD:
-            new_game = self.transition_to(GameState.ESTIMATEE_FOLDED)
+            new_game = self._settle_side(GameState.ESTIMATEE_FOLDED)
         elif self.get_state() == GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD:
-            new_game = self.transition_to(GameState.ESTIMATOR_FOLDED)
+            new_game = self._settle_side(GameState.ESTIMATOR_FOLDED)
         else:
-            new_game = self.transition_to(GameState.ESTIMATOR_FOLDED)
+            new_game = self._fold_every_side()
 
         # post-conditions
         is_esimtaor = self.is_estimator(username)
 
-        if is_esimtaor:
+        if is_esimtaor and new_game.is_round_settled():
             assert new_game.get_state() == GameState.ESTIMATOR_FOLDED
 
-        if not is_esimtaor:
+        if not is_esimtaor and new_game.is_round_settled():
             assert new_game.get_state() == GameState.ESTIMATEE_FOLDED
 
         return new_game
 
-    def is_winner(self, username: str) -> bool:
+    def is_round_settled(self) -> bool:
+        return self.get_state() in [
+            GameState.ESTIMATEE_FOLDED,
+            GameState.ESTIMATOR_FOLDED,
+            GameState.BOTH_PLAYERS_CALLED,
+        ]
+
+    def _settle_side(self, outcome: GameState) -> "Game":
         # pre-conditions
-        assert self.get_state() in [
+        assert outcome in [
             GameState.ESTIMATEE_FOLDED,
             GameState.ESTIMATOR_FOLDED,
             GameState.BOTH_PLAYERS_CALLED,
         ]
 
-        assert username in self.usernames
+        estimator = self.get_estimator()
+        estimatee = self.get_current_side()
 
-        if self.get_state() == GameState.BOTH_PLAYERS_CALLED:
-            assert self.estimate is not None
+        assert estimator is not None
+        assert estimatee is not None
+        assert estimatee not in self.sides
 
         # body
-        if self.get_state() == GameState.ESTIMATEE_FOLDED:
-            return self.is_estimator(username)
+        side = Side(
+            estimatee=estimatee,
+            estimator_ante=self.get_ante(estimator),
+            estimatee_ante=self.get_ante(estimatee),
+            outcome=outcome,
+        )
+        new_game = replace(self, sides={**self.sides, estimatee: side})
+        estimatees = self.get_estimatees()
+        next_side = estimatees.index(estimatee) + 1
 
-        if self.get_state() == GameState.ESTIMATOR_FOLDED:
-            return not self.is_estimator(username)
+        if next_side == len(estimatees):
+            return new_game.transition_to(outcome)._record_round()
 
-        if self.is_estimator(username) and self.is_prediction_correct():
-            return True
+        # Every side opens with the estimator's initial ante.
+        return (
+            replace(new_game, current_side=estimatees[next_side])
+            .set_ante(estimator, 1)
+            .set_current_player(estimatees[next_side])
+            .transition_to(GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD)
+        )
 
-        if not self.is_estimator(username) and not self.is_prediction_correct():
-            return True
+    def _fold_every_side(self) -> "Game":
+        # pre-conditions
+        assert self.get_state() == GameState.WAITING_FOR_ESTIMATE
 
-        return False
+        estimator = self.get_estimator()
+
+        assert estimator is not None
+
+        # body
+        sides = {
+            estimatee: Side(
+                estimatee=estimatee,
+                estimator_ante=self.get_ante(estimator),
+                estimatee_ante=self.get_ante(estimatee),
+                outcome=GameState.ESTIMATOR_FOLDED,
+            )
+            for estimatee in self.get_estimatees()
+        }
+
+        return (
+            replace(self, sides=sides)
+            .transition_to(GameState.ESTIMATOR_FOLDED)
+            ._record_round()
+        )
+
+    def is_winner(self, username: str) -> bool:
+        # pre-conditions
+        assert self.get_state() in [
+            GameState.ESTIMATEE_FOLDED,
+            GameState.ESTIMATOR_FOLDED,
+            GameState.BOTH_PLAYERS_CALLED,
+        ]
+
+        assert username in self.usernames
+
+        # body
+        return self.get_payout(username) > 0
 
     def is_prediction_correct(self) -> bool:
         # pre-conditions
@@ -439,31 +763,97 @@ class Game:
         assert username in self.usernames
 
         # body
-        opponent = self.get_opponent(username)
-        sign = 1 if self.is_winner(username) else -1
+        return sum(self.get_side_payouts(username).values())
 
-        if self.get_state() in [
-            GameState.ESTIMATEE_FOLDED,
-            GameState.ESTIMATOR_FOLDED,
-        ]:
-            return sign * max(self.get_ante(opponent), self.get_ante(username))
+    def get_side_payouts(self, username: str) -> dict[str, int]:
+        """Returns what `username` wins (negative if they pay) from each opponent."""
+        # pre-conditions
+        assert self.is_round_settled()
+        assert username in self.usernames
+
+        # body
+        if not self.is_estimator(username):
+            side = self.sides[username]
+
+            return {self.estimator: self._get_estimatee_payout(side)}  # type: ignore
+
+        # The estimator pays or collects every side, so the table is zero-sum.
+        return {
+            estimatee: -self._get_estimatee_payout(self.sides[estimatee])
+            for estimatee in self.get_estimatees()
+        }
+
+    def _get_estimatee_payout(self, side: Side) -> int:
+        if side.outcome == GameState.ESTIMATEE_FOLDED:
+            return -max(side.estimator_ante, side.estimatee_ante)
+
+        if side.outcome == GameState.ESTIMATOR_FOLDED:
+            return max(side.estimator_ante, side.estimatee_ante)
 
         estimate = self.get_esimate()
-        ante = self.get_ante(username)
-        payout = sign * ante * LOG_ERROR_TO_PAYOUT[estimate.log_error]  # type: ignore
 
-        # post-conditions
-        if self.is_winner(username):
-            assert payout > 0
+        assert estimate is not None
+        assert side.estimatee_ante == side.estimator_ante
+
+        sign = -1 if self.is_prediction_correct() else 1
+        payout = sign * side.estimatee_ante * LOG_ERROR_TO_PAYOUT[estimate.log_error]
 
-        if not self.is_winner(username):
-            assert payout < 0
+        # post-conditions
+        assert payout != 0
 
         return payout
 
     def get_problem(self) -> Problem:
         return self.problem
 
+    def get_history(self) -> RoundHistory:
+        return self.history
+
+    def get_net_payout(self, username: str) -> int:
+        """Returns the sum of `username`'s payouts over every round of the game."""
+        return self.net_payouts.get(username, 0)
+
+    def _record_round(self) -> "Game":
+        # pre-conditions
+        assert self.get_state() in [
+            GameState.ESTIMATEE_FOLDED,
+            GameState.ESTIMATOR_FOLDED,
+            GameState.BOTH_PLAYERS_CALLED,
+        ]
+
+        estimator = self.get_estimator()
+
+        assert estimator is not None
+
+        # body
+        record = RoundRecord(
+            round_number=self.round_number,
+            problem_index=self.problem.index,
+            estimator=estimator,
+            estimate=self.estimate,
+            outcome=self.get_state(),
+            antes={
+                estimator: sum(side.estimator_ante for side in self.sides.values()),
+                **{
+                    estimatee: side.estimatee_ante
+                    for estimatee, side in self.sides.items()
+                },
+            },
+            payouts={
+                username: self.get_payout(username) for username in self.usernames
+            },
+        )
+
+        # Kept apart from the history, which forgets its oldest rounds.
+        net_payouts = {
+            username: self.net_payouts.get(username, 0) + payout
+            for username, payout in record.payouts.items()
+        }
+
+        return replace(
+            self, history=self.history.append(record), net_payouts=net_payouts
+        )
+
     def switch_turns(self) -> "Game":
         if self.current_player is None:
             raise ValueError("Can't switch turns if there is no current player!")
@@ -473,15 +863,24 @@ class Game:
         return replace(self, current_player=new_current_player)
 
     def _start_new_round(self) -> "Game":
-        old_estimator = self.get_estimator()
         new_estimator = self.get_next_estimator()
-        new_antes = {old_estimator: 0, new_estimator: 1}
+        new_antes = {username: 0 for username in self.seats}
+        new_antes[new_estimator] = 1
+        new_problem, new_deck = _draw_problem(
+            self.deck, self.problem_filter, self.target_hit_rate, self.problem
+        )
         new_game = replace(
             self,
-            problem=_generate_problem(),
+            problem=new_problem,
+            deck=new_deck,
             estimator=new_estimator,
+            estimate=None,
             current_player=new_estimator,
             antes=new_antes,
+            round_number=self.round_number + 1,
+            current_side=None,
+            sides={},
+            players_playing_again=frozenset(),
         )
 
         return new_game
@@ -493,12 +892,9 @@ class Game:
         if self.estimator not in self.usernames:
             raise ValueError("Can't get next estimator if estimator is not in game!")
 
-        assert len(self.usernames) == 2
-
-        if self.estimator == list(self.usernames)[0]:
-            return list(self.usernames)[1]
+        seat = self.seats.index(self.estimator)
 
-        return list(self.usernames)[0]
+        return self.seats[(seat + 1) % len(self.seats)]
 
     def get_state(self) -> GameState:
         return self.current_state
@@ -549,10 +945,83 @@ class Game:
         if self.get_state() == GameState.GAME_OVER:
             return self
 
-        if self.get_state() == GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN:
+        players_playing_again = self.players_playing_again | {username}
+
+        if len(players_playing_again) == self.get_num_players():
             return self._start_new_round().transition_to(GameState.WAITING_FOR_ESTIMATE)
 
-        return self.transition_to(GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN)
+        return replace(self, players_playing_again=players_playing_again).transition_to(
+            GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN
+        )
+
+    def validate(self, move: Move) -> MoveError | None:
+        """Returns why `move` is illegal, or None if `apply` will accept it.
+
+        This mirrors the pre-conditions of the move's method without raising,
+        so rejecting a bad move is a few comparisons rather than an exception.
+        """
+        if self.get_state() not in MOVE_STATES[move.action]:
+            return MoveError.WRONG_STATE
+
+        if move.action == Action.JOIN:
+            if move.username in self.usernames:
+                return MoveError.ALREADY_JOINED
+
+            if self.is_full():
+                return MoveError.GAME_IS_FULL
+
+            return None
+
+        if move.username not in self.usernames:
+            return MoveError.NOT_IN_GAME
+
+        if move.action == Action.ESTIMATE:
+            if not self.is_estimator(move.username):
+                return MoveError.NOT_ESTIMATOR
+
+            if move.estimate is None:
+                return MoveError.MISSING_ESTIMATE
+
+            return None
+
+        if move.action in [Action.RAISE, Action.CALL, Action.FOLD]:
+            if not self.is_current_player(move.username):
+                return MoveError.NOT_YOUR_TURN
+
+        if move.action in [Action.RAISE, Action.CALL]:
+            opponent = self.get_opponent(move.username)
+
+            if self.get_ante(move.username) >= self.get_ante(opponent):  # type: ignore
+                return MoveError.NOT_YOUR_TURN
+
+        return None
+
+    def apply(self, move: Move) -> "Game":
+        """Plays `move`, so humans and bots go through the same transitions."""
+        if move.action == Action.JOIN:
+            return self.join(move.username)
+
+        if move.action == Action.ESTIMATE:
+            assert move.estimate is not None
+            assert self.is_estimator(move.username)
+
+            return self.set_estimate(move.estimate)
+
+        if move.action == Action.RAISE:
+            return self.raise_ante(move.username)
+
+        if move.action == Action.CALL:
+            return self.call_ante(move.username)
+
+        if move.action == Action.FOLD:
+            return self.fold(move.username)
+
+        if move.action == Action.PLAY_AGAIN:
+            return self.play_again(move.username)
+
+        assert move.username in self.usernames
+
+        return self.end()
 
 
 def is_valid_game_id(game_id: str) -> bool:
@@ -581,20 +1050,76 @@ def is_valid_username(username: str) -> bool:
     return True
 
 
+def seed(value: int | str | bytes) -> None:
+    """Makes the game ids and problems drawn from now on a function of `value`."""
+    rng.seed(value)
+
+
+def use_problems(problems: ProblemBank | None) -> None:
+    """Draws problems for new rounds from `problems`, or the bundled bank if None."""
+    global _problems, _problem_stats
+
+    _problems = problems
+    _problem_stats = None if problems is None else ProblemStats(len(problems), problems)
+
+
+def get_problems() -> ProblemBank:
+    """Returns the bank new rounds draw from."""
+    return _problems if _problems is not None else load_problem_bank()
+
+
+def get_problem_stats() -> ProblemStats:
+    """Returns the hit rates of the bank new rounds draw from."""
+    return _problem_stats if _problem_stats is not None else get_bundled_problem_stats()
+
+
 def _generate_game_id():
-    letters = random.sample("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 5)
+    letters = rng.sample("ABCDEFGHIJKLMNOPQRSTUVWXYZ", 5)
     return "".join(letters)
 
 
-def _generate_problem() -> Problem:
-    df = pd.read_csv("problems.csv").sample(n=1)
+def _draw_problem(
+    deck: ProblemDeck | None,
+    problem_filter: ProblemFilter,
+    target_hit_rate: float | None = None,
+    previous_problem: Problem | None = None,
+) -> tuple[Problem, ProblemDeck]:
+    problems = get_problems()
+    selection = problems.select(problem_filter)
+
+    if len(selection) == 0:
+        raise ValueError("No problems match the filter!")
+
+    if deck is None or deck.size != len(selection):
+        deck = ProblemDeck.shuffled(len(selection), rng)
+
+    if target_hit_rate is not None:
+        return (
+            _draw_adaptive_problem(problem_filter, target_hit_rate, previous_problem),
+            deck,
+        )
+
+    position, new_deck = deck.draw(rng)
+
+    return problems[selection[position]], new_deck
+
+
+def _draw_adaptive_problem(
+    problem_filter: ProblemFilter,
+    target_hit_rate: float,
+    previous_problem: Problem | None,
+) -> Problem:
+    # Adaptive draws sample with replacement, so retry a few times to avoid
+    # asking the same question twice in a row.
+    problem_stats = get_problem_stats()
+    index = None
+
+    for _ in range(MAX_ADAPTIVE_DRAW_ATTEMPTS):
+        index = problem_stats.sample(problem_filter, target_hit_rate, rng)
+
+        if previous_problem is None or index != previous_problem.index:
+            break
 
-    question = df["question"].values[0]
-    answer = int(df["answer"].values[0].split("^")[-1])
-    source = df["source"].values[0]
+    assert index is not None
 
-    return Problem(
-        question=question,
-        log_answer=answer,
-        source=source,
-    )
+    return get_problems()[index]
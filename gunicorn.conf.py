@@ -0,0 +1,55 @@
+"""Production server settings: gunicorn --config gunicorn.conf.py app:app
+
+Games, turn timers, bots and broadcasts live in the worker's memory, so there
+is exactly one worker and concurrency comes from its greenlets. More workers
+would each see a different set of games. Settings can be overridden with the
+environment variables below.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# "gevent" serves each request on a greenlet, up to `worker_connections` at a
+# time, so spectators holding a watch stream open cost a few kilobytes each
+# rather than a thread, and player moves never queue behind them. "gthread"
+# runs requests on a pool of `threads`, where every open stream holds a thread;
+# "sync" serves one request at a time and is only useful for debugging.
+worker_class = os.environ.get("WORKER_CLASS", "gevent")
+workers = 1
+worker_connections = int(os.environ.get("WORKER_CONNECTIONS", 1000))
+
+# Only the gthread worker has a thread pool; gunicorn ignores this otherwise.
+if worker_class == "gthread":
+    threads = int(os.environ.get("THREADS", 4 * multiprocessing.cpu_count()))
+
+# The app is imported in the worker, not the master, so its SQLite connections
+# are never shared across a fork and a HUP reload picks up new code as well as
+# new settings.
+preload_app = False
+
+# Pages poll every second, so keep connections open across polls.
+keepalive = int(os.environ.get("KEEPALIVE_SECONDS", 5))
+timeout = int(os.environ.get("TIMEOUT_SECONDS", 60))
+
+# On SIGTERM or SIGHUP, in-flight requests get this long to finish. A reload
+# starts a fresh worker that re-imports the app, so games in memory are lost;
+# balances and sessions are in SQLite and survive.
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT_SECONDS", 30))
+
+# Restarting the worker would lose every game, so it's never recycled.
+max_requests = 0
+
+accesslog = os.environ.get("ACCESS_LOG", None)
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info")
+
+
+def post_worker_init(worker) -> None:
+    # Runs in the worker once it has imported the app and before it accepts
+    # connections, so the first requests find everything warm.
+    from app import start_background_tasks, warm_up
+
+    warm_up()
+    start_background_tasks()
@@ -0,0 +1,78 @@
+import argparse
+import csv
+import sys
+
+from problems import PROBLEM_BANK_PATH, ImportReport, ProblemBankWriter, import_problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate problems CSVs and write them to a problem bank."
+    )
+    parser.add_argument(
+        "csv_paths", nargs="+", help="CSVs with question, answer and source columns"
+    )
+    parser.add_argument(
+        "-o", "--output", default=PROBLEM_BANK_PATH, help="problem bank to write"
+    )
+    parser.add_argument(
+        "--rejects", help="CSV to write rejected rows' line numbers and reasons to"
+    )
+    parser.add_argument(
+        "--progress-every",
+        type=int,
+        default=100_000,
+        help="rows between progress reports",
+    )
+    args = parser.parse_args(argv)
+
+    rejects_file = open(args.rejects, "w", newline="") if args.rejects else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+
+    if rejects_writer is not None:
+        rejects_writer.writerow(["path", "row", "reason"])
+
+    def on_reject(path: str, row: int, reason: str) -> None:
+        if rejects_writer is not None:
+            rejects_writer.writerow([path, row, reason])
+
+    try:
+        with ProblemBankWriter(args.output) as writer:
+            report = import_problems(
+                args.csv_paths,
+                writer,
+                on_progress=_print_progress,
+                on_reject=on_reject,
+                progress_every=args.progress_every,
+            )
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+
+    _print_summary(report, args.output)
+
+    return 0 if report.num_imported > 0 else 1
+
+
+def _print_progress(report: ImportReport) -> None:
+    print(
+        f"{report.num_rows:,} rows, {report.num_imported:,} imported "
+        f"({report.get_rows_per_second():,.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+def _print_summary(report: ImportReport, output: str) -> None:
+    print(
+        f"Read {report.num_rows:,} rows in {report.elapsed_seconds:.2f}s ({report.get_rows_per_second():,.0f} rows/s)"
+    )
+    print(f"Imported {report.num_imported:,} problems to {output}")
+    print(f"Skipped {report.num_duplicates:,} duplicate questions")
+    print(f"Rejected {report.get_num_rejected():,} rows")
+
+    for reason, count in report.rejections.most_common():
+        print(f"  {reason}: {count:,}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import threading
+
+from sortedcontainers import SortedList  # type: ignore
+
+
+class Leaderboard:
+    """Players ranked by balance, kept sorted as balances change.
+
+    Entries are stored as `(-balance, username)` so the richest player comes
+    first and ties are broken alphabetically. Updates, rank lookups and page
+    lookups are all O(log n).
+    """
+
+    def __init__(self, balances: dict[str, int] | None = None):
+        balances = balances or {}
+
+        self._balances: dict[str, int] = dict(balances)
+        self._ranked = SortedList(
+            (-balance, username) for username, balance in balances.items()
+        )
+        self._lock = threading.Lock()
+
+    def update(self, username: str, balance: int) -> None:
+        with self._lock:
+            old_balance = self._balances.get(username, None)
+
+            if old_balance == balance:
+                return
+
+            if old_balance is not None:
+                self._ranked.remove((-old_balance, username))
+
+            self._ranked.add((-balance, username))
+            self._balances[username] = balance
+
+    def get_rank(self, username: str) -> int | None:
+        """Returns the 1-based rank of `username`, or `None` if they aren't ranked."""
+        with self._lock:
+            balance = self._balances.get(username, None)
+
+            if balance is None:
+                return None
+
+            return self._ranked.index((-balance, username)) + 1
+
+    def get_balance(self, username: str) -> int | None:
+        return self._balances.get(username, None)
+
+    def get_page(self, offset: int, limit: int) -> list[tuple[str, int]]:
+        # pre-conditions
+        assert offset >= 0
+        assert limit >= 0
+
+        # body
+        with self._lock:
+            page = self._ranked.islice(offset, offset + limit)
+
+            return [(username, -negated_balance) for negated_balance, username in page]
+
+    def __len__(self) -> int:
+        return len(self._ranked)
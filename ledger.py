@@ -0,0 +1,144 @@
+import sqlite3
+import threading
+import time
+
+from dataclasses import dataclass
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    username TEXT PRIMARY KEY,
+    balance INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    delta INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS entries_by_username ON entries (username, id);
+CREATE INDEX IF NOT EXISTS entries_by_time ON entries (created_at);
+"""
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    id: int
+    username: str
+    game_id: str
+    round: int
+    delta: int
+    balance: int
+    created_at: float
+
+
+class Ledger:
+    """Append-only record of balance changes, backed by SQLite.
+
+    Each account's current balance is materialized in `accounts` and updated in
+    the same transaction as the entries that change it, so reading a balance is
+    a primary-key lookup rather than a sum over history.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+    def open_account(self, username: str, balance: int) -> int:
+        """Creates the account if it doesn't exist and returns its balance."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO accounts (username, balance) VALUES (?, ?)",
+                (username, balance),
+            )
+            row = self._connection.execute(
+                "SELECT balance FROM accounts WHERE username = ?", (username,)
+            ).fetchone()
+
+        return row[0]
+
+    def get_balance(self, username: str) -> int | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT balance FROM accounts WHERE username = ?", (username,)
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def get_balances(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT username, balance FROM accounts"
+            ).fetchall()
+
+        return dict(rows)
+
+    def record_round(
+        self, game_id: str, round: int, deltas: dict[str, int]
+    ) -> dict[str, int]:
+        """Applies every player's delta for a round atomically and returns the new balances."""
+        # pre-conditions
+        assert len(deltas) > 0
+
+        # body
+        created_at = time.time()
+        new_balances = {}
+
+        with self._lock, self._connection:
+            for username, delta in deltas.items():
+                row = self._connection.execute(
+                    "UPDATE accounts SET balance = balance + ? WHERE username = ? "
+                    "RETURNING balance",
+                    (delta, username),
+                ).fetchone()
+
+                if row is None:
+                    raise ValueError(f"Account for {username} doesn't exist!")
+
+                new_balances[username] = row[0]
+                self._connection.execute(
+                    "INSERT INTO entries "
+                    "(username, game_id, round, delta, balance, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (username, game_id, round, delta, row[0], created_at),
+                )
+
+        return new_balances
+
+    def get_history(
+        self, username: str, before_id: int | None = None, limit: int = 50
+    ) -> list[LedgerEntry]:
+        """Returns entries newest first; pass the last entry's id as `before_id` for the next page."""
+        # pre-conditions
+        assert limit > 0
+
+        # body
+        query = (
+            "SELECT id, username, game_id, round, delta, balance, created_at "
+            "FROM entries WHERE username = ?"
+        )
+        params: tuple = (username,)
+
+        if before_id is not None:
+            query += " AND id < ?"
+            params = (*params, before_id)
+
+        query += " ORDER BY id DESC LIMIT ?"
+        params = (*params, limit)
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+
+        return [LedgerEntry(*row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,92 @@
+import bisect
+import threading
+
+from collections import deque
+
+
+class Matchmaker:
+    """Pairs waiting players, preferring opponents with a similar balance.
+
+    Waiting players are kept in FIFO buckets keyed by `balance // bucket_width`,
+    and the non-empty bucket keys are kept sorted so the closest bucket is
+    found with a binary search rather than a scan of everyone waiting.
+    """
+
+    def __init__(self, bucket_width: int = 10, max_bucket_distance: int | None = None):
+        if bucket_width <= 0:
+            raise ValueError("Bucket width must be positive!")
+
+        self.bucket_width = bucket_width
+        self.max_bucket_distance = max_bucket_distance
+        self._buckets: dict[int, deque[str]] = {}
+        self._bucket_keys: list[int] = []
+        self._waiting: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, username: str, balance: int) -> str | None:
+        """Returns the opponent `username` was paired with, or `None` if they now wait."""
+        with self._lock:
+            if username in self._waiting:
+                return None
+
+            bucket = balance // self.bucket_width
+            opponent = self._pop_closest(bucket)
+
+            if opponent is not None:
+                return opponent
+
+            if bucket not in self._buckets:
+                self._buckets[bucket] = deque()
+                bisect.insort(self._bucket_keys, bucket)
+
+            self._buckets[bucket].append(username)
+            self._waiting[username] = bucket
+
+            return None
+
+    def cancel(self, username: str) -> bool:
+        with self._lock:
+            # Entries are removed lazily from their bucket when they're next popped.
+            return self._waiting.pop(username, None) is not None
+
+    def is_waiting(self, username: str) -> bool:
+        return username in self._waiting
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def _pop_closest(self, bucket: int) -> str | None:
+        while self._bucket_keys:
+            position = bisect.bisect_left(self._bucket_keys, bucket)
+            candidates = self._bucket_keys[max(position - 1, 0) : position + 1]
+            closest = min(candidates, key=lambda key: abs(key - bucket))
+
+            if (
+                self.max_bucket_distance is not None
+                and abs(closest - bucket) > self.max_bucket_distance
+            ):
+                return None
+
+            opponent = self._pop_from_bucket(closest)
+
+            if opponent is not None:
+                return opponent
+
+        return None
+
+    def _pop_from_bucket(self, bucket: int) -> str | None:
+        queue = self._buckets[bucket]
+        opponent = None
+
+        while queue and opponent is None:
+            username = queue.popleft()
+
+            if self._waiting.get(username) == bucket:
+                del self._waiting[username]
+                opponent = username
+
+        if not queue:
+            del self._buckets[bucket]
+            self._bucket_keys.pop(bisect.bisect_left(self._bucket_keys, bucket))
+
+        return opponent
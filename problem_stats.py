@@ -0,0 +1,234 @@
+import math
+import random
+import threading
+import time
+
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from functools import lru_cache
+from problems import ProblemBank, ProblemFilter, load_problem_bank
+
+NUM_LOG_ERRORS = 4
+DIFFICULTY_BANDWIDTH = 0.15
+MAX_ALIAS_TABLES = 64
+REFRESH_INTERVAL_SECONDS = 30.0
+
+
+class AliasTable:
+    """Samples indices in proportion to fixed weights in O(1) (Vose's alias method)."""
+
+    def __init__(self, weights: Sequence[float]):
+        if len(weights) == 0:
+            raise ValueError("Can't build an alias table without weights!")
+
+        total = sum(weights)
+        num_weights = len(weights)
+
+        if total <= 0:
+            weights, total = [1.0] * num_weights, float(num_weights)
+
+        scaled = [weight * num_weights / total for weight in weights]
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+
+        self._probabilities = array("d", bytes(8 * num_weights))
+        self._aliases = array("L", bytes(array("L").itemsize * num_weights))
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self._probabilities[less] = scaled[less]
+            self._aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        for i in small + large:
+            self._probabilities[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self._probabilities)
+
+    def sample(self, rng: random.Random | None = None) -> int:
+        source = rng if rng is not None else random
+        i = source.randrange(len(self._probabilities))
+
+        return i if source.random() < self._probabilities[i] else self._aliases[i]
+
+
+class ProblemStats:
+    """How often estimates of each problem hit the answer, by log error.
+
+    Request threads only append outcomes to a queue (`deque.append` needs no
+    lock), and a single flusher drains the queue into the counters and
+    rebuilds the alias tables that adaptive draws sample from. A draw never
+    builds a table itself: until the flusher has built one for its filter and
+    target, it asks for one and draws uniformly from the filter instead.
+    """
+
+    def __init__(self, num_problems: int, problems: ProblemBank | None = None):
+        self.num_problems = num_problems
+        self.problems = problems
+        self._estimates = array(
+            "L", bytes(array("L").itemsize * num_problems * NUM_LOG_ERRORS)
+        )
+        self._hits = array(
+            "L", bytes(array("L").itemsize * num_problems * NUM_LOG_ERRORS)
+        )
+        self._pending: deque[tuple[int, int, bool]] = deque()
+        self._alias_tables: OrderedDict[tuple[ProblemFilter, float], AliasTable] = (
+            OrderedDict()
+        )
+        self._alias_tables_lock = threading.Lock()
+        self._requested: set[tuple[ProblemFilter, float]] = set()
+        self._is_requested = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, problem_index: int, log_error: int, is_hit: bool) -> None:
+        # pre-conditions
+        assert 0 <= problem_index < self.num_problems
+        assert 0 <= log_error < NUM_LOG_ERRORS
+
+        # body
+        self._pending.append((problem_index, log_error, is_hit))
+
+    def flush(self) -> int:
+        num_flushed = 0
+
+        while True:
+            try:
+                problem_index, log_error, is_hit = self._pending.popleft()
+            except IndexError:
+                return num_flushed
+
+            self._estimates[problem_index * NUM_LOG_ERRORS + log_error] += 1
+            self._hits[problem_index * NUM_LOG_ERRORS + log_error] += is_hit
+            num_flushed += 1
+
+    def get_num_estimates(self, problem_index: int) -> int:
+        start = problem_index * NUM_LOG_ERRORS
+
+        return sum(self._estimates[start : start + NUM_LOG_ERRORS])
+
+    def get_hit_rate(self, problem_index: int) -> float:
+        """Returns the smoothed fraction of estimates that hit, starting at 1/2 with no data."""
+        start = problem_index * NUM_LOG_ERRORS
+        estimates = sum(self._estimates[start : start + NUM_LOG_ERRORS])
+        hits = sum(self._hits[start : start + NUM_LOG_ERRORS])
+
+        return (hits + 1) / (estimates + 2)
+
+    def sample(
+        self,
+        problem_filter: ProblemFilter,
+        target_hit_rate: float,
+        rng: random.Random | None = None,
+    ) -> int | None:
+        """Draws a problem matching `problem_filter`, favouring hit rates near the target."""
+        # pre-conditions
+        assert 0 <= target_hit_rate <= 1
+
+        # body
+        key = (problem_filter, round(target_hit_rate, 1))
+        alias_table = self._alias_tables.get(key, None)
+        selection = self._get_problems().select(problem_filter)
+
+        if len(selection) == 0:
+            return None
+
+        if alias_table is None:
+            with self._alias_tables_lock:
+                self._requested.add(key)
+
+            self._is_requested.set()
+            source = rng if rng is not None else random
+
+            return selection[source.randrange(len(selection))]
+
+        return selection[alias_table.sample(rng)]
+
+    def refresh(self) -> None:
+        """Counts pending outcomes, then rebuilds every alias table and builds the requested ones."""
+        self.flush()
+
+        with self._alias_tables_lock:
+            keys = [*self._alias_tables, *self._requested]
+            self._requested.clear()
+
+        self._build_alias_tables(keys)
+
+    def build_requested(self) -> None:
+        """Builds only the alias tables draws have asked for since the last build."""
+        with self._alias_tables_lock:
+            keys = list(self._requested)
+            self._requested.clear()
+
+        self._build_alias_tables(keys)
+
+    def start(self, interval: float = REFRESH_INTERVAL_SECONDS) -> None:
+        if self._thread is not None:
+            return
+
+        def refresh_forever() -> None:
+            # Wakes early when a draw asks for a table, so it's ready within
+            # moments rather than a whole interval.
+            next_refresh = time.monotonic() + interval
+
+            while True:
+                self._is_requested.wait(max(0.0, next_refresh - time.monotonic()))
+                self._is_requested.clear()
+
+                if time.monotonic() < next_refresh:
+                    self.build_requested()
+                    continue
+
+                self.refresh()
+                next_refresh = time.monotonic() + interval
+
+        self._thread = threading.Thread(target=refresh_forever, daemon=True)
+        self._thread.start()
+
+    def _get_problems(self) -> ProblemBank:
+        return self.problems if self.problems is not None else load_problem_bank()
+
+    def _build_alias_tables(self, keys: list[tuple[ProblemFilter, float]]) -> None:
+        for key in keys:
+            alias_table = self._build_alias_table(*key)
+
+            if alias_table is not None:
+                self._set_alias_table(key, alias_table)
+
+    def _set_alias_table(
+        self, key: tuple[ProblemFilter, float], alias_table: AliasTable
+    ) -> None:
+        with self._alias_tables_lock:
+            self._alias_tables[key] = alias_table
+            self._alias_tables.move_to_end(key)
+
+            while len(self._alias_tables) > MAX_ALIAS_TABLES:
+                self._alias_tables.popitem(last=False)
+
+    def _build_alias_table(
+        self, problem_filter: ProblemFilter, target_hit_rate: float
+    ) -> AliasTable | None:
+        selection = self._get_problems().select(problem_filter)
+
+        if len(selection) == 0:
+            return None
+
+        return AliasTable(
+            [
+                _get_weight(self.get_hit_rate(index), target_hit_rate)
+                for index in selection
+            ]
+        )
+
+
+def _get_weight(hit_rate: float, target_hit_rate: float) -> float:
+    distance = (hit_rate - target_hit_rate) / DIFFICULTY_BANDWIDTH
+
+    return math.exp(-0.5 * distance**2)
+
+
+@lru_cache(maxsize=None)
+def get_problem_stats() -> ProblemStats:
+    return ProblemStats(len(load_problem_bank()))
@@ -0,0 +1,684 @@
+import bisect
+import csv
+import hashlib
+import math
+import mmap
+import os
+import random
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import time
+
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+MASK_64 = (1 << 64) - 1
+NUM_FEISTEL_ROUNDS = 4
+
+# Relative to this file rather than the working directory, so the server and
+# tests find the bundled problems wherever they're started from.
+PROBLEMS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROBLEMS_CSV_PATH = os.path.join(PROBLEMS_DIR, "problems.csv")
+PROBLEM_BANK_PATH = os.environ.get(
+    "PROBLEM_BANK_PATH", os.path.join(PROBLEMS_DIR, "problems.bank")
+)
+
+# A problem bank file is laid out as a fixed-size header, a heap of UTF-8
+# strings, one fixed-size record per problem, a table of category names, and
+# two sorted indexes of problem numbers that filtered draws binary search.
+BANK_MAGIC = b"FPKB"
+BANK_VERSION = 2
+
+# Magic, version, record size, number of problems, heap offset, records
+# offset, number of categories, categories offset, category index offset and
+# difficulty index offset.
+BANK_HEADER = struct.Struct("<4sHHQQQQQQQ")
+
+# Question offset and length, source offset and length, log answer, category
+# and difficulty. The last three are also read on their own as a sort key.
+BANK_RECORD = struct.Struct("<QIQIiHB")
+BANK_RECORD_KEY = struct.Struct("<iHB")
+BANK_RECORD_KEY_OFFSET = BANK_RECORD.size - BANK_RECORD_KEY.size
+BANK_STRING = struct.Struct("<QI")
+
+MAX_CATEGORIES = 1 << 16
+MAX_DIFFICULTY = 5
+MAX_PROBLEMS = 1 << 32
+
+# Sort keys pack a problem's category, difficulty, log answer and number into
+# a single 64-bit integer so the indexes can be built by sorting integers.
+CATEGORY_KEY_SHIFT = 48
+DIFFICULTY_KEY_SHIFT = 40
+LOG_ANSWER_KEY_SHIFT = 32
+LOG_ANSWER_KEY_BIAS = 128
+CATEGORY_KEY_MASK = ((1 << 16) - 1) << CATEGORY_KEY_SHIFT
+PROBLEM_KEY_MASK = (1 << 32) - 1
+MAX_ABS_LOG_ANSWER = 100
+POWER_OF_TEN_PATTERN = re.compile(r"^10\s*(?:\^|\*\*)\s*([+-]?\d+)$")
+
+
+@dataclass(frozen=True)
+class Problem:
+    question: str
+    log_answer: int
+    source: str
+    index: int = -1
+    category: str = ""
+    difficulty: int = 0
+
+
+@dataclass(frozen=True)
+class ProblemFilter:
+    category: str | None = None
+    min_oom: int | None = None
+    max_oom: int | None = None
+    min_difficulty: int | None = None
+    max_difficulty: int | None = None
+
+    def __post_init__(self):
+        if (
+            self.min_oom is not None
+            and self.max_oom is not None
+            and self.min_oom > self.max_oom
+        ):
+            raise ValueError("Minimum order of magnitude must not exceed the maximum!")
+
+        for difficulty in [self.min_difficulty, self.max_difficulty]:
+            if difficulty is not None and not 0 <= difficulty <= MAX_DIFFICULTY:
+                raise ValueError(f"Difficulty must be from 0 to {MAX_DIFFICULTY}!")
+
+        if (
+            self.min_difficulty is not None
+            and self.max_difficulty is not None
+            and self.min_difficulty > self.max_difficulty
+        ):
+            raise ValueError("Minimum difficulty must not exceed the maximum!")
+
+
+class InvalidProblemError(ValueError):
+    """Raised when a row of a problems CSV can't be turned into a problem."""
+
+    def __init__(self, reason: str, value: str | None = None):
+        self.reason = reason
+        self.value = value
+
+        super().__init__(reason if value is None else f"{reason}: {value!r}")
+
+
+@dataclass
+class ImportReport:
+    num_rows: int = 0
+    num_imported: int = 0
+    num_duplicates: int = 0
+    rejections: Counter = field(default_factory=Counter)
+    elapsed_seconds: float = 0.0
+
+    def get_num_rejected(self) -> int:
+        return sum(self.rejections.values())
+
+    def get_rows_per_second(self) -> float:
+        return self.num_rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def parse_log_answer(answer: str) -> int:
+    """Normalizes answers like `10^6`, `10**-3`, `1e6` or `1,000,000` to a power of ten."""
+    answer = answer.strip()
+    match = POWER_OF_TEN_PATTERN.match(answer)
+
+    if match is not None:
+        log_answer = int(match.group(1))
+    else:
+        try:
+            value = float(answer.replace(",", ""))
+        except ValueError:
+            raise InvalidProblemError("Can't parse answer", answer)
+
+        if not math.isfinite(value) or value <= 0:
+            raise InvalidProblemError("Answer must be a positive number", answer)
+
+        log_answer = round(math.log10(value))
+
+    if abs(log_answer) > MAX_ABS_LOG_ANSWER:
+        raise InvalidProblemError("Answer is out of range", answer)
+
+    return log_answer
+
+
+def parse_difficulty(difficulty: str) -> int:
+    difficulty = difficulty.strip()
+
+    if len(difficulty) == 0:
+        return 0
+
+    if not difficulty.isdigit() or int(difficulty) > MAX_DIFFICULTY:
+        raise InvalidProblemError(
+            f"Difficulty must be an integer from 0 to {MAX_DIFFICULTY}", difficulty
+        )
+
+    return int(difficulty)
+
+
+def parse_problem(row: dict[str, str | None]) -> Problem:
+    question = (row.get("question") or "").strip()
+    answer = row.get("answer") or ""
+    source = (row.get("source") or "").strip()
+    category = (row.get("category") or "").strip().casefold()
+    difficulty = row.get("difficulty") or ""
+
+    if len(question) == 0:
+        raise InvalidProblemError("Question is missing")
+
+    return Problem(
+        question=question,
+        log_answer=parse_log_answer(answer),
+        source=source,
+        category=category,
+        difficulty=parse_difficulty(difficulty),
+    )
+
+
+def import_problems(
+    csv_paths: Iterable[str],
+    writer: "ProblemBankWriter",
+    on_progress: Callable[[ImportReport], None] | None = None,
+    on_reject: Callable[[str, int, str], None] | None = None,
+    progress_every: int = 100_000,
+) -> ImportReport:
+    """Streams rows from problems CSVs into `writer`, skipping invalid and duplicate questions.
+
+    Only an 8-byte hash per imported question is kept in memory for
+    deduplication, so memory use doesn't depend on the size of the rows.
+    """
+    report = ImportReport()
+    seen_hashes: set[bytes] = set()
+    start = time.perf_counter()
+
+    for path in csv_paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+
+            for row in reader:
+                report.num_rows += 1
+                _import_row(
+                    path, reader.line_num, row, writer, report, seen_hashes, on_reject
+                )
+
+                # After every row, imported or not, so no report is skipped.
+                if on_progress is not None and report.num_rows % progress_every == 0:
+                    report.elapsed_seconds = time.perf_counter() - start
+                    on_progress(report)
+
+    report.elapsed_seconds = time.perf_counter() - start
+
+    return report
+
+
+def _import_row(
+    path: str,
+    line_num: int,
+    row: dict[str, str | None],
+    writer: "ProblemBankWriter",
+    report: ImportReport,
+    seen_hashes: set[bytes],
+    on_reject: Callable[[str, int, str], None] | None,
+) -> None:
+    try:
+        problem = parse_problem(row)
+    except InvalidProblemError as e:
+        report.rejections[e.reason] += 1
+
+        if on_reject is not None:
+            on_reject(path, line_num, str(e))
+
+        return
+
+    question_hash = _hash_question(problem.question)
+
+    if question_hash in seen_hashes:
+        report.num_duplicates += 1
+        return
+
+    seen_hashes.add(question_hash)
+    writer.add(problem)
+    report.num_imported += 1
+
+
+def _hash_question(question: str) -> bytes:
+    normalized = " ".join(question.casefold().split())
+
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+
+
+class ProblemBankWriter:
+    """Writes problems to a problem bank file one at a time.
+
+    Records are spooled to a temporary file while strings are appended to the
+    heap. Building the sorted indexes needs one packed 64-bit sort key per
+    problem in memory. The bank is written to a temporary path and renamed
+    into place on `close`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        # A unique name beside the bank, so writers building the same bank at
+        # once (say, parallel test workers) don't write over each other.
+        fd, self._tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(path)),
+            prefix=f"{os.path.basename(path)}.",
+            suffix=".tmp",
+        )
+        self._file = os.fdopen(fd, "wb")
+        self._records = tempfile.TemporaryFile()
+        self._heap_size = 0
+        self._categories: dict[str, tuple[int, int, int]] = {}
+        self._sort_keys = array("Q")
+
+        self._file.write(bytes(BANK_HEADER.size))
+
+    def add(self, problem: Problem) -> int:
+        # pre-conditions
+        if abs(problem.log_answer) > MAX_ABS_LOG_ANSWER:
+            raise ValueError(f"Log answer must be at most {MAX_ABS_LOG_ANSWER}!")
+
+        if not 0 <= problem.difficulty <= MAX_DIFFICULTY:
+            raise ValueError(f"Difficulty must be from 0 to {MAX_DIFFICULTY}!")
+
+        if self.count >= MAX_PROBLEMS:
+            raise ValueError(f"A problem bank holds at most {MAX_PROBLEMS} problems!")
+
+        # body
+        question_offset, question_length = self._write_string(problem.question)
+        source_offset, source_length = self._write_string(problem.source)
+        category_id = self._get_category_id(problem.category)
+
+        self._records.write(
+            BANK_RECORD.pack(
+                question_offset,
+                question_length,
+                source_offset,
+                source_length,
+                problem.log_answer,
+                category_id,
+                problem.difficulty,
+            )
+        )
+        self._sort_keys.append(
+            _pack_sort_key(
+                category_id, problem.difficulty, problem.log_answer, self.count
+            )
+        )
+        self.count += 1
+
+        return self.count - 1
+
+    def close(self) -> None:
+        heap_offset = BANK_HEADER.size
+        records_offset = heap_offset + self._heap_size
+
+        self._records.seek(0)
+        shutil.copyfileobj(self._records, self._file)
+
+        categories_offset = self._file.tell()
+
+        for offset, length, _ in sorted(
+            self._categories.values(), key=lambda category: category[2]
+        ):
+            self._file.write(BANK_STRING.pack(offset, length))
+
+        # Sort keys order problems by category, then difficulty, then log
+        # answer; dropping the category bits orders them by difficulty first.
+        category_index_offset = self._file.tell()
+        self._write_index(sorted(self._sort_keys))
+
+        difficulty_index_offset = self._file.tell()
+        self._write_index(sorted(key & ~CATEGORY_KEY_MASK for key in self._sort_keys))
+
+        self._file.seek(0)
+        self._file.write(
+            BANK_HEADER.pack(
+                BANK_MAGIC,
+                BANK_VERSION,
+                BANK_RECORD.size,
+                self.count,
+                heap_offset,
+                records_offset,
+                len(self._categories),
+                categories_offset,
+                category_index_offset,
+                difficulty_index_offset,
+            )
+        )
+        self._file.close()
+        self._records.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._records.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self) -> "ProblemBankWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write_string(self, value: str) -> tuple[int, int]:
+        encoded = value.encode("utf-8")
+        offset = self._heap_size
+
+        self._file.write(encoded)
+        self._heap_size += len(encoded)
+
+        return offset, len(encoded)
+
+    def _get_category_id(self, category: str) -> int:
+        if category not in self._categories:
+            if len(self._categories) >= MAX_CATEGORIES:
+                raise ValueError(
+                    f"A problem bank holds at most {MAX_CATEGORIES} categories!"
+                )
+
+            offset, length = self._write_string(category)
+            self._categories[category] = (offset, length, len(self._categories))
+
+        return self._categories[category][2]
+
+    def _write_index(self, sort_keys: list[int]) -> None:
+        index = array("I", (key & PROBLEM_KEY_MASK for key in sort_keys))
+
+        if sys.byteorder == "big":
+            index.byteswap()
+
+        index.tofile(self._file)
+
+
+@dataclass(frozen=True, eq=False)
+class ProblemSelection(Sequence[int]):
+    """The problems matching a filter, as ranges of positions in one of a bank's indexes."""
+
+    sorted_index: Sequence[int]
+    ranges: tuple[tuple[int, int], ...]
+
+    def __len__(self) -> int:
+        return sum(stop - start for start, stop in self.ranges)
+
+    def __getitem__(self, position):  # type: ignore
+        if position < 0:
+            raise IndexError("Problem selection index out of range!")
+
+        for start, stop in self.ranges:
+            if position < stop - start:
+                return self.sorted_index[start + position]
+
+            position -= stop - start
+
+        raise IndexError("Problem selection index out of range!")
+
+
+class ProblemBank(Sequence[Problem]):
+    """A read-only, memory-mapped problem bank.
+
+    Problems are decoded on access, so opening a bank is O(1) and every
+    process that maps the same file shares its pages through the page cache.
+    Filtered draws binary search the bank's sorted indexes, once per
+    difficulty level in the filter.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < BANK_HEADER.size:
+            raise ValueError(f"{path} is not a problem bank!")
+
+        (
+            magic,
+            version,
+            record_size,
+            self._count,
+            self._heap_offset,
+            self._records_offset,
+            num_categories,
+            categories_offset,
+            category_index_offset,
+            difficulty_index_offset,
+        ) = BANK_HEADER.unpack_from(self._mmap, 0)
+
+        if magic != BANK_MAGIC:
+            raise ValueError(f"{path} is not a problem bank!")
+
+        if version != BANK_VERSION or record_size != BANK_RECORD.size:
+            raise ValueError(f"{path} has unsupported version {version}!")
+
+        if difficulty_index_offset + 4 * self._count > len(self._mmap):
+            raise ValueError(f"{path} is truncated!")
+
+        self._categories = [
+            self._read_string(
+                *BANK_STRING.unpack_from(
+                    self._mmap, categories_offset + i * BANK_STRING.size
+                )
+            )
+            for i in range(num_categories)
+        ]
+        self._category_ids = {
+            category: category_id
+            for category_id, category in enumerate(self._categories)
+        }
+        self._category_index = self._load_index(category_index_offset)
+        self._difficulty_index = self._load_index(difficulty_index_offset)
+        self.select = lru_cache(maxsize=1024)(self._select)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):  # type: ignore
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if not -self._count <= index < self._count:
+            raise IndexError("Problem bank index out of range!")
+
+        index = index % self._count
+        (
+            question_offset,
+            question_length,
+            source_offset,
+            source_length,
+            log_answer,
+            category_id,
+            difficulty,
+        ) = BANK_RECORD.unpack_from(
+            self._mmap, self._records_offset + index * BANK_RECORD.size
+        )
+
+        return Problem(
+            question=self._read_string(question_offset, question_length),
+            log_answer=log_answer,
+            source=self._read_string(source_offset, source_length),
+            index=index,
+            category=self._categories[category_id],
+            difficulty=difficulty,
+        )
+
+    def get_categories(self) -> list[str]:
+        return [category for category in self._categories if len(category) > 0]
+
+    def close(self) -> None:
+        self._category_index.release()
+        self._difficulty_index.release()
+        self._mmap.close()
+
+    def _select(self, problem_filter: ProblemFilter) -> ProblemSelection:
+        min_oom = problem_filter.min_oom
+        max_oom = problem_filter.max_oom
+        min_oom = -MAX_ABS_LOG_ANSWER if min_oom is None else min_oom
+        max_oom = MAX_ABS_LOG_ANSWER if max_oom is None else max_oom
+        min_difficulty = problem_filter.min_difficulty or 0
+        max_difficulty = problem_filter.max_difficulty
+        max_difficulty = MAX_DIFFICULTY if max_difficulty is None else max_difficulty
+
+        if problem_filter.category is None:
+            index = self._difficulty_index
+            prefix: tuple[int, ...] = ()
+            get_key = self._get_difficulty_key
+        elif problem_filter.category.casefold() in self._category_ids:
+            index = self._category_index
+            prefix = (self._category_ids[problem_filter.category.casefold()],)
+            get_key = self._get_category_key
+        else:
+            return ProblemSelection(sorted_index=self._category_index, ranges=())
+
+        ranges = []
+
+        for difficulty in range(min_difficulty, max_difficulty + 1):
+            start = bisect.bisect_left(
+                index, (*prefix, difficulty, min_oom), key=get_key
+            )
+            stop = bisect.bisect_right(
+                index, (*prefix, difficulty, max_oom), lo=start, key=get_key
+            )
+
+            if start < stop:
+                ranges.append((start, stop))
+
+        return ProblemSelection(sorted_index=index, ranges=tuple(ranges))
+
+    def _get_category_key(self, index: int) -> tuple[int, int, int]:
+        log_answer, category_id, difficulty = BANK_RECORD_KEY.unpack_from(
+            self._mmap,
+            self._records_offset + index * BANK_RECORD.size + BANK_RECORD_KEY_OFFSET,
+        )
+
+        return category_id, difficulty, log_answer
+
+    def _get_difficulty_key(self, index: int) -> tuple[int, int]:
+        log_answer, _, difficulty = BANK_RECORD_KEY.unpack_from(
+            self._mmap,
+            self._records_offset + index * BANK_RECORD.size + BANK_RECORD_KEY_OFFSET,
+        )
+
+        return difficulty, log_answer
+
+    def _load_index(self, offset: int) -> memoryview:
+        index = memoryview(self._mmap)[offset : offset + 4 * self._count].cast("I")
+
+        if sys.byteorder == "big":
+            swapped = array("I", index)
+            swapped.byteswap()
+            index.release()
+
+            return memoryview(swapped)
+
+        return index
+
+    def _read_string(self, offset: int, length: int) -> str:
+        start = self._heap_offset + offset
+
+        return self._mmap[start : start + length].decode("utf-8")
+
+
+def write_problem_bank(problems: Iterable[Problem], path: str) -> int:
+    with ProblemBankWriter(path) as writer:
+        for problem in problems:
+            writer.add(problem)
+
+    return writer.count
+
+
+@lru_cache(maxsize=None)
+def load_problem_bank(path: str = PROBLEM_BANK_PATH) -> ProblemBank:
+    # Building the bank is meant to be an offline step (see import_problems.py),
+    # but fall back to building it from the bundled CSV so a fresh checkout runs.
+    if not os.path.exists(path):
+        with ProblemBankWriter(path) as writer:
+            import_problems([PROBLEMS_CSV_PATH], writer)
+
+    return ProblemBank(path)
+
+
+@dataclass(frozen=True)
+class ProblemDeck:
+    """A shuffled deck of problem indices that never repeats until it's exhausted.
+
+    Rather than storing the shuffled order, the deck stores a seed and a cursor
+    and computes the problem at each position with a seeded permutation. This
+    makes drawing O(1) and keeps the deck a few integers regardless of how many
+    problems there are.
+    """
+
+    size: int
+    seed: int
+    cursor: int = 0
+
+    def __post_init__(self):
+        if self.size <= 0:
+            raise ValueError("Deck must contain at least one problem!")
+
+    @staticmethod
+    def shuffled(size: int, rng: random.Random | None = None) -> "ProblemDeck":
+        source = rng if rng is not None else random
+
+        return ProblemDeck(size=size, seed=source.getrandbits(64))
+
+    def draw(self, rng: random.Random | None = None) -> tuple[int, "ProblemDeck"]:
+        if self.cursor >= self.size:
+            return ProblemDeck.shuffled(self.size, rng).draw(rng)
+
+        index = _permute(self.cursor, self.size, self.seed)
+
+        return index, replace(self, cursor=self.cursor + 1)
+
+    def remaining(self) -> int:
+        return self.size - self.cursor
+
+
+def _permute(index: int, size: int, seed: int) -> int:
+    # A Feistel network is a bijection on [0, 4^half_bits), so repeatedly
+    # applying it until the value lands back in [0, size) ("cycle walking")
+    # gives a bijection on [0, size). The domain is at most 4x larger than
+    # `size`, so this takes fewer than four iterations on average.
+    half_bits = max(((size - 1).bit_length() + 1) // 2, 1)
+    mask = (1 << half_bits) - 1
+    value = index
+
+    while True:
+        left, right = value >> half_bits, value & mask
+
+        for round in range(NUM_FEISTEL_ROUNDS):
+            left, right = right, left ^ (_mix(right, seed, round) & mask)
+
+        value = (left << half_bits) | right
+
+        if value < size:
+            return value
+
+
+def _pack_sort_key(
+    category_id: int, difficulty: int, log_answer: int, index: int
+) -> int:
+    return (
+        (category_id << CATEGORY_KEY_SHIFT)
+        | (difficulty << DIFFICULTY_KEY_SHIFT)
+        | ((log_answer + LOG_ANSWER_KEY_BIAS) << LOG_ANSWER_KEY_SHIFT)
+        | index
+    )
+
+
+def _mix(value: int, seed: int, round: int) -> int:
+    value = (value ^ seed ^ (round * 0x9E3779B97F4A7C15)) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+
+    return value ^ (value >> 31)
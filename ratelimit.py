@@ -0,0 +1,115 @@
+import threading
+import time
+
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Allows `burst` requests at once, refilled at `rate` requests per second."""
+
+    rate: float
+    burst: int
+
+
+class RateLimiter:
+    """Token buckets per route and key, in a bounded, expiring LRU.
+
+    Each request takes a token from its bucket; a bucket refills continuously
+    at its route's rate, up to its burst. Buckets are only touched when a
+    request uses them, so a check is a dictionary lookup and some arithmetic.
+    Buckets idle long enough to have refilled are dropped from the front of
+    the LRU; a refilled bucket is the same as a missing one, so dropping it
+    changes nothing. A bucket that's still refilling is never dropped, since
+    that would hand its key a fresh burst. Instead, while `max_buckets` are
+    all refilling, requests from keys without a bucket are turned away.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit],
+        max_buckets: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_buckets <= 0:
+            raise ValueError("Number of buckets must be positive!")
+
+        self.limits = limits
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: OrderedDict[tuple[str, Hashable], list[float]] = OrderedDict()
+        self._rejections: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def allow(self, route: str, key: Hashable) -> bool:
+        """Takes a token from the bucket of `key` on `route`; returns False if it's empty."""
+        limit = self.limits.get(route, None)
+
+        if limit is None:
+            return True
+
+        now = self._clock()
+
+        with self._lock:
+            bucket = self._buckets.pop((route, key), None)
+            self._expire(now)
+
+            if bucket is None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._rejections[route] += 1
+                    return False
+
+                bucket = [float(limit.burst), now]
+            else:
+                elapsed = now - bucket[1]
+                bucket[0] = min(limit.burst, bucket[0] + elapsed * limit.rate)
+                bucket[1] = now
+
+            self._buckets[(route, key)] = bucket
+
+            if bucket[0] < 1:
+                self._rejections[route] += 1
+                return False
+
+            bucket[0] -= 1
+
+            return True
+
+    def get_retry_after(self, route: str, key: Hashable) -> float:
+        """Returns the seconds until the bucket of `key` on `route` has a token again."""
+        limit = self.limits.get(route, None)
+
+        with self._lock:
+            bucket = self._buckets.get((route, key), None)
+
+        if limit is None:
+            return 0.0
+
+        if bucket is None:
+            # Turned away because every bucket is still refilling, so suggest
+            # coming back after the time one token takes.
+            return 1 / limit.rate if len(self) >= self.max_buckets else 0.0
+
+        if bucket[0] >= 1:
+            return 0.0
+
+        return (1 - bucket[0]) / limit.rate - (self._clock() - bucket[1])
+
+    def get_rejections(self) -> dict[str, int]:
+        return dict(self._rejections)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _expire(self, now: float) -> None:
+        """Drops buckets from the front of the LRU until one is still refilling."""
+        while self._buckets:
+            (route, _), (tokens, last) = next(iter(self._buckets.items()))
+            limit = self.limits.get(route, None)
+
+            if limit is not None and tokens + (now - last) * limit.rate < limit.burst:
+                return
+
+            self._buckets.popitem(last=False)
@@ -0,0 +1,77 @@
+import gzip
+import json
+
+from typing import Any
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MIN_COMPRESSED_SIZE = 1024
+COMPRESSION_LEVEL = 6
+
+
+def encode_json(obj: Any, default: Any = None) -> bytes:
+    """Encodes compactly with orjson if it's installed, or the standard library otherwise."""
+    if orjson is None:
+        return json.dumps(obj, separators=(",", ":"), default=default).encode()
+
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Makes `jsonify` and `request.json` use `encode_json` and orjson's parser."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return encode_json(obj, self.default).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None:
+            return json.loads(s)
+
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+
+        return self._app.response_class(
+            encode_json(obj, self.default), mimetype=self.mimetype
+        )
+
+
+class StaticJson:
+    """A reply that never changes, encoded once rather than on every request."""
+
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
+        self.body = encode_json(data)
+
+    def __call__(self, status: int = 200) -> Response:
+        return Response(self.body, status=status, mimetype="application/json")
+
+
+def compress(response: Response, accept_encoding: str) -> Response:
+    """Gzips an HTML page big enough to be worth it, if the client accepts gzip."""
+    if (
+        response.status_code != 200
+        or response.mimetype != "text/html"
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or "gzip" not in accept_encoding
+    ):
+        return response
+
+    data = response.get_data()
+
+    if len(data) < MIN_COMPRESSED_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=COMPRESSION_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+
+    return response
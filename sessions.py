@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    token TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS sessions_by_time ON sessions (created_at);
+"""
+
+
+class SessionStore:
+    """Maps opaque session tokens to usernames, backed by SQLite.
+
+    The client only holds a random token, so authenticating a request is a
+    dictionary lookup rather than verifying and decoding a signed cookie. The
+    most recently used sessions are kept in an LRU in front of the table;
+    older ones are read back from it, so sessions survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        capacity: int = 10_000,
+        max_age_seconds: float = 30 * 24 * 60 * 60,
+    ):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive!")
+
+        self.capacity = capacity
+        self.max_age_seconds = max_age_seconds
+        self._cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(SCHEMA)
+
+    def create(self, username: str) -> str:
+        token = secrets.token_urlsafe(32)
+        created_at = time.time()
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO sessions (token, username, created_at) VALUES (?, ?, ?)",
+                (token, username, created_at),
+            )
+            self._remember(token, username, created_at)
+
+        return token
+
+    def get(self, token: str) -> str | None:
+        """Returns the username the token was created for, or None if it's unknown or expired."""
+        with self._lock:
+            session = self._cache.get(token, None)
+
+            if session is not None:
+                self._cache.move_to_end(token)
+            else:
+                session = self._connection.execute(
+                    "SELECT username, created_at FROM sessions WHERE token = ?",
+                    (token,),
+                ).fetchone()
+
+                if session is None:
+                    return None
+
+                self._remember(token, *session)
+
+        username, created_at = session
+
+        if time.time() - created_at > self.max_age_seconds:
+            self.delete(token)
+            return None
+
+        return username
+
+    def delete(self, token: str) -> None:
+        with self._lock, self._connection:
+            self._cache.pop(token, None)
+            self._connection.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def delete_expired(self) -> int:
+        """Deletes sessions older than `max_age_seconds` and returns how many there were."""
+        cutoff = time.time() - self.max_age_seconds
+
+        with self._lock, self._connection:
+            for token, (_, created_at) in list(self._cache.items()):
+                if created_at < cutoff:
+                    del self._cache[token]
+
+            return self._connection.execute(
+                "DELETE FROM sessions WHERE created_at < ?", (cutoff,)
+            ).rowcount
+
+    def _remember(self, token: str, username: str, created_at: float) -> None:
+        self._cache[token] = (username, created_at)
+
+        if len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+
+class GameTokens:
+    """Signs and checks tokens that let a player read one game's state.
+
+    A token is the username plus an HMAC of the game id and username, so
+    checking one needs no lookup at all. New tokens are signed with the first
+    key; the rest are only used to check tokens, so a key can be rotated out
+    by putting a new one in front and dropping it once its tokens are stale.
+    """
+
+    def __init__(self, keys: list[bytes]):
+        if len(keys) == 0:
+            raise ValueError("At least one key is required!")
+
+        self._keys = keys
+
+    def sign(self, game_id: str, username: str) -> str:
+        return f"{username}.{self._get_signature(self._keys[0], game_id, username)}"
+
+    def verify(self, game_id: str, token: str) -> str | None:
+        """Returns the username the token was signed for, or None if it isn't valid for the game."""
+        username, _, signature = token.rpartition(".")
+
+        if not username:
+            return None
+
+        for key in self._keys:
+            expected = self._get_signature(key, game_id, username)
+
+            # compare_digest only takes ASCII strings, so compare bytes instead.
+            if hmac.compare_digest(signature.encode(), expected.encode()):
+                return username
+
+        return None
+
+    def _get_signature(self, key: bytes, game_id: str, username: str) -> str:
+        digest = hmac.new(
+            key, f"{game_id}:{username}".encode(), hashlib.sha256
+        ).digest()
+
+        return base64.urlsafe_b64encode(digest[:16]).decode().rstrip("=")
+
+
+def load_keys(value: str | None) -> list[bytes]:
+    """Parses comma-separated keys, newest first, or makes a random key if there are none."""
+    if not value:
+        return [secrets.token_bytes(32)]
+
+    return [key.strip().encode() for key in value.split(",") if key.strip()]
@@ -0,0 +1,66 @@
+// Shared by every page. Each page registers a function in `pages` that is
+// given the data attributes of the #page element and returns its actions.
+const pages = {};
+
+// Lets the server recognise a retried request and not play the move twice.
+const newRequestId = () => `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+const getJson = (url) => fetch(url).then(response => response.json());
+
+const postJson = (url, body) =>
+    fetch(url, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(body)
+    }).then(response => response.json());
+
+const showMessage = (message) => {
+    document.getElementById("message").innerHTML = message;
+};
+
+// Shows m:ss in #timer each second and calls `onExpire` once time is up.
+// Set `secondsLeft` on the returned object to restart it from a new value.
+const startCountdown = (secondsLeft, onExpire) => {
+    const countdown = { secondsLeft: Math.floor(secondsLeft) };
+
+    const interval = setInterval(() => {
+        if (countdown.secondsLeft < 0) {
+            clearInterval(interval);
+
+            if (onExpire) {
+                onExpire();
+            }
+
+            return;
+        }
+
+        const minutes = Math.floor(countdown.secondsLeft / 60);
+        const seconds = countdown.secondsLeft % 60;
+
+        document.getElementById("timer").innerText = `${minutes}:${seconds < 10 ? "0" : ""}${seconds}`;
+
+        countdown.secondsLeft--;
+    }, 1000);
+
+    return countdown;
+};
+
+// Polls the game's state each second and reloads once `hasChanged` says the page is stale.
+const pollState = (page, hasChanged) =>
+    setInterval(() => {
+        getJson(`/api/game/${page.gameId}/state?token=${encodeURIComponent(page.gameToken)}`)
+            .then((data) => {
+                if (!data.success) {
+                    console.error(data.message); return;
+                }
+
+                if (hasChanged(data)) {
+                    window.location.reload();
+                }
+            })
+    }, 1000);
+
+// Folds for the player when their turn runs out, then shows the next page.
+const foldOnExpiry = (page) => () =>
+    postJson("/api/fold", { game_id: page.gameId, request_id: newRequestId() })
+        .then(() => window.location.reload());
@@ -0,0 +1,99 @@
+pages.login = () => ({
+    login: () => {
+        const username = document.getElementById("username").value;
+
+        postJson("/api/login", { username })
+            .then((data) => {
+                if (!data.success) {
+                    showMessage(data.message); return;
+                }
+
+                window.location.href = "/";
+            })
+    }
+});
+
+pages.start = () => {
+    let matchmakeInterval = null;
+
+    const matchmake = () => {
+        fetch("/api/matchmake", { method: "POST" })
+            .then(response => response.json())
+            .then((data) => {
+                if (!data.success) {
+                    clearInterval(matchmakeInterval);
+                    showMessage(data.message); return;
+                }
+
+                if (data.game_id) {
+                    clearInterval(matchmakeInterval);
+                    window.location.href = `/game/${data.game_id}`; return;
+                }
+
+                document.getElementById("matchmake").innerText = "looking for an opponent...";
+
+                if (matchmakeInterval === null) {
+                    matchmakeInterval = setInterval(matchmake, 1000);
+                }
+            })
+    };
+
+    return {
+        join: () => {
+            const game_id = document.getElementById("game_id").value;
+
+            postJson("/api/join", { game_id, request_id: newRequestId() })
+                .then((data) => {
+                    if (!data.success) {
+                        showMessage(data.message); return;
+                    }
+
+                    window.location.href = `/game/${game_id}`;
+                })
+        },
+        create: () => {
+            const max_players = document.getElementById("max_players").value;
+
+            getJson(`/api/create?max_players=${max_players}`)
+                .then((data) => {
+                    if (!data.success) {
+                        showMessage(data.message); return;
+                    }
+
+                    window.location.href = `/game/${data.game_id}`;
+                })
+        },
+        matchmake,
+        logout: () => {
+            getJson("/api/logout")
+                .then((data) => {
+                    if (!data.success) {
+                        showMessage(data.message); return;
+                    }
+
+                    window.location.href = "/";
+                })
+        }
+    };
+};
+
+pages["waiting-room"] = (page) => {
+    const numPlayers = Number(page.numPlayers);
+
+    pollState(page, data => data.state !== page.state || data.num_players !== numPlayers);
+
+    return {
+        addBot: () => {
+            const strategy = document.getElementById("strategy").value;
+
+            postJson(`/api/game/${page.gameId}/bot`, { strategy })
+                .then((data) => {
+                    if (!data.success) {
+                        showMessage(data.message); return;
+                    }
+
+                    window.location.reload();
+                })
+        }
+    };
+};
@@ -0,0 +1,18 @@
+// Starts the page named by #page and routes clicks on [data-action] to its actions.
+document.addEventListener("DOMContentLoaded", () => {
+    const root = document.getElementById("page");
+
+    if (root === null || !(root.dataset.page in pages)) {
+        return;
+    }
+
+    const actions = pages[root.dataset.page](root.dataset);
+
+    document.addEventListener("click", (event) => {
+        const target = event.target.closest("[data-action]");
+
+        if (target !== null && target.dataset.action in actions) {
+            actions[target.dataset.action]();
+        }
+    });
+});
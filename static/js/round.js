@@ -0,0 +1,141 @@
+pages.estimator = (page) => {
+    const reloadOnSuccess = (data) => {
+        if (!data.success) {
+            console.error(data.message); return;
+        }
+
+        window.location.reload();
+    };
+
+    startCountdown(Number(page.secondsLeft), foldOnExpiry(page));
+
+    return {
+        submit: () => {
+            const estimate = document.getElementById("estimate").value;
+            const error = document.getElementById("error").value;
+
+            postJson("/api/set-prediction", {
+                game_id: page.gameId,
+                estimate,
+                error,
+                request_id: newRequestId()
+            }).then(reloadOnSuccess)
+        },
+        fold: () => {
+            postJson("/api/fold", { game_id: page.gameId, request_id: newRequestId() })
+                .then(reloadOnSuccess)
+        }
+    };
+};
+
+pages.estimatee = (page) => {
+    startCountdown(Number(page.secondsLeft));
+    pollState(page, data => data.state !== page.state);
+
+    return {};
+};
+
+pages["raise-call-or-fold"] = (page) => {
+    let state = page.state;
+    let currentPlayer = page.currentPlayer;
+    const countdown = startCountdown(Number(page.secondsLeft), foldOnExpiry(page));
+
+    const render = (view) => {
+        state = view.state;
+        currentPlayer = view.current_player;
+        countdown.secondsLeft = Math.floor(view.seconds_left);
+
+        document.getElementById("instruction").innerText = view.is_current_player
+            ? "Raise, call or fold"
+            : "Wait for opponent to raise, call or fold";
+        document.getElementById("ante").innerText = `$${view.ante}`;
+        document.getElementById("opponents_ante").innerText = `$${view.opponents_ante}`;
+        document.getElementById("buttons").hidden = !view.is_current_player;
+    };
+
+    // Plays the move and redraws from the response, so a turn costs one request.
+    const act = (action) => {
+        postJson(`/api/game/${page.gameId}/act`, { action, request_id: newRequestId() })
+            .then((data) => {
+                if (!data.success) {
+                    console.error(data.message); return;
+                }
+
+                if (data.view.state.endsWith("_TO_RAISE_CALL_OR_FOLD")) {
+                    render(data.view); return;
+                }
+
+                window.location.reload();
+            })
+    };
+
+    pollState(page, data => data.state !== state || data.current_player !== currentPlayer);
+
+    return {
+        raise: () => act("raise"),
+        call: () => act("call"),
+        fold: () => act("fold")
+    };
+};
+
+pages.outcome = (page) => {
+    const playAgain = (play_again) =>
+        postJson("/api/play-again", { game_id: page.gameId, play_again, request_id: newRequestId() })
+            .then((data) => {
+                if (!data.success) {
+                    showMessage(data.message); return;
+                }
+
+                if (play_again) {
+                    window.location.reload();
+                } else {
+                    window.location.href = "/";
+                }
+            });
+
+    return {
+        yes: () => playAgain(true),
+        no: () => playAgain(false)
+    };
+};
+
+pages["play-again"] = (page) => {
+    pollState(page, data => data.state !== page.state);
+
+    return {};
+};
+
+pages.spectate = (page) => {
+    const events = new EventSource(`/api/game/${page.gameId}/watch`);
+
+    const render = (view) => {
+        document.getElementById("round").innerText = `(round ${view.round})`;
+        document.getElementById("problem").innerText = view.problem;
+        document.getElementById("estimate").innerText =
+            view.estimate === null ? "-" : `10^(${view.estimate} +/- ${view.error})`;
+        document.getElementById("answer").innerText =
+            view.answer === null ? "-" : `10^${view.answer}`;
+
+        const seats = document.getElementById("seats");
+        seats.innerHTML = "";
+
+        for (const username of view.seats) {
+            const seat = document.createElement("div");
+            const role = username === view.estimator ? " (estimator)" : "";
+            const turn = username === view.current_player && view.payouts === null ? " *" : "";
+            const payout = view.payouts === null ? "" : `, payout $${view.payouts[username]}`;
+            seat.innerText = `${username}${role}${turn}: ante $${view.antes[username]}${payout}`;
+            seats.appendChild(seat);
+        }
+    };
+
+    events.onmessage = (event) => render(JSON.parse(event.data));
+
+    events.onerror = () => {
+        if (events.readyState === EventSource.CLOSED) {
+            showMessage("Lost connection to the game");
+        }
+    };
+
+    return {};
+};
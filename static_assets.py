@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import os
+
+from dataclasses import dataclass
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Concatenated in this order: helpers first, the page dispatcher last.
+BUNDLES = {
+    "app.js": ["js/common.js", "js/lobby.js", "js/round.js", "js/main.js"],
+}
+
+
+@dataclass(frozen=True)
+class Asset:
+    """A bundle's bytes, compressed once up front, under a name that changes with its content."""
+
+    name: str
+    content_type: str
+    content: bytes
+    gzip: bytes
+    brotli: bytes | None
+
+    def get_encoded(self, accept_encoding: str) -> tuple[bytes, str | None]:
+        """Returns the smallest encoding the client accepts, and its name."""
+        if self.brotli is not None and "br" in accept_encoding:
+            return self.brotli, "br"
+
+        if "gzip" in accept_encoding:
+            return self.gzip, "gzip"
+
+        return self.content, None
+
+
+def build_assets(static_dir: str = STATIC_DIR) -> dict[str, Asset]:
+    """Bundles the sources of each asset, keyed by both its plain and fingerprinted name."""
+    assets = {}
+
+    for name, sources in BUNDLES.items():
+        content = b"\n".join(
+            _read(os.path.join(static_dir, source)) for source in sources
+        )
+        stem, extension = os.path.splitext(name)
+        fingerprint = hashlib.sha256(content).hexdigest()[:12]
+        asset = Asset(
+            name=f"{stem}.{fingerprint}{extension}",
+            content_type=_get_content_type(extension),
+            content=content,
+            gzip=gzip.compress(content, compresslevel=9, mtime=0),
+            brotli=None if brotli is None else brotli.compress(content),
+        )
+        assets[name] = asset
+        assets[asset.name] = asset
+
+    return assets
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _get_content_type(extension: str) -> str:
+    if extension == ".js":
+        return "text/javascript; charset=utf-8"
+
+    if extension == ".css":
+        return "text/css; charset=utf-8"
+
+    return "application/octet-stream"
@@ -0,0 +1,398 @@
+import app
+import pytest
+
+from flask.testing import FlaskClient
+from game import Action, Estimate, Move, Player, get_problem_stats
+from ratelimit import RateLimiter
+from werkzeug.test import TestResponse
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limits(monkeypatch) -> None:
+    monkeypatch.setattr(app, "rate_limiter", RateLimiter({}))
+    monkeypatch.setattr(app, "user_rate_limiter", RateLimiter({}))
+
+
+@pytest.fixture
+def rate_limits(monkeypatch) -> None:
+    monkeypatch.setattr(app, "rate_limiter", RateLimiter(app.RATE_LIMITS))
+    monkeypatch.setattr(app, "user_rate_limiter", RateLimiter(app.USER_RATE_LIMITS))
+
+
+def _log_in(username: str) -> FlaskClient:
+    client = app.app.test_client()
+    client.post("/api/login", json={"username": username})
+
+    return client
+
+
+def _start_game(
+    first: str, second: str
+) -> tuple[str, dict[str, FlaskClient], str, str]:
+    """Starts a game between two new players; returns its id, their clients, the estimator and estimatee."""
+    clients = {first: _log_in(first), second: _log_in(second)}
+    game_id = clients[first].get("/api/create").json["game_id"]  # type: ignore
+    clients[second].post("/api/join", json={"game_id": game_id})
+    estimator = app.games[game_id].estimator
+    estimatee = app.games[game_id].get_opponent(estimator)  # type: ignore
+
+    return game_id, clients, estimator, estimatee  # type: ignore
+
+
+def _estimate(client: FlaskClient, game_id: str) -> None:
+    client.post(
+        "/api/set-prediction", json={"game_id": game_id, "estimate": 3, "error": 1}
+    )
+
+
+def test_made_up_game_ids_share_the_players_rate_limit(rate_limits) -> None:
+    # Given
+    client = _log_in("mallory")
+    burst = app.USER_RATE_LIMITS["get_state"].burst
+
+    # When
+    statuses = [
+        client.get(f"/api/game/FAKE{i}/state").status_code for i in range(burst + 5)
+    ]
+
+    # Then
+    assert 429 not in statuses[:burst]
+    assert statuses[burst:] == [429] * 5
+    assert len(app.user_rate_limiter) == 1
+    assert len(app.rate_limiter) == 0
+
+
+def test_polling_one_game_is_limited_per_game(rate_limits) -> None:
+    # Given
+    client = _log_in("polly")
+    game_id = client.get("/api/create").json["game_id"]  # type: ignore
+    burst = app.RATE_LIMITS["get_state"].burst
+
+    # When
+    statuses = [
+        client.get(f"/api/game/{game_id}/state").status_code for _ in range(burst + 1)
+    ]
+    other = client.get("/api/game/FAKE/state")
+
+    # Then
+    assert statuses == [200] * burst + [429]
+    assert other.status_code == 200
+
+
+def test_retried_call_returns_the_first_result_and_settles_once() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("carl", "cora")
+    _estimate(clients[estimator], game_id)
+    clients[estimatee].post("/api/raise", json={"game_id": game_id})
+    body = {"game_id": game_id, "request_id": "call-1"}
+
+    # When
+    first = clients[estimator].post("/api/call", json=body)
+    balances = {username: app.ledger.get_balance(username) for username in clients}
+    num_entries = len(app.ledger.get_history(estimator))
+    retry = clients[estimator].post("/api/call", json=body)
+
+    # Then
+    assert app.games[game_id].is_round_settled()
+    assert num_entries > 0
+    assert first.status_code == retry.status_code == 200
+    assert retry.json == first.json
+    assert {username: app.ledger.get_balance(username) for username in clients} == (
+        balances
+    )
+    assert len(app.ledger.get_history(estimator)) == num_entries
+
+
+def test_retried_fold_returns_the_first_result_and_settles_once() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("fred", "fran")
+    _estimate(clients[estimator], game_id)
+    body = {"game_id": game_id, "request_id": "fold-1"}
+
+    # When
+    first = clients[estimatee].post("/api/fold", json=body)
+    balance = app.ledger.get_balance(estimatee)
+    num_entries = len(app.ledger.get_history(estimatee))
+    retry = clients[estimatee].post("/api/fold", json=body)
+
+    # Then
+    assert app.games[game_id].is_round_settled()
+    assert num_entries > 0
+    assert first.status_code == retry.status_code == 200
+    assert retry.json == first.json
+    assert app.ledger.get_balance(estimatee) == balance
+    assert len(app.ledger.get_history(estimatee)) == num_entries
+
+
+def test_reusing_a_request_id_for_another_move_is_rejected() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("rita", "rick")
+    _estimate(clients[estimator], game_id)
+    clients[estimatee].post(
+        "/api/raise", json={"game_id": game_id, "request_id": "move-1"}
+    )
+
+    # When
+    response = clients[estimator].post(
+        "/api/call", json={"game_id": game_id, "request_id": "move-1"}
+    )
+
+    # Then
+    assert response.status_code == 409
+    assert response.json["error"] == "REQUEST_ID_REUSED"  # type: ignore
+
+
+def test_oldest_request_id_is_forgotten_after_the_limit() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("olga", "otto")
+    _estimate(clients[estimator], game_id)
+
+    # When
+    for i in range(app.MAX_RECENT_MOVES_PER_GAME + 1):
+        current_player = app.games[game_id].get_current_player()
+        clients[current_player].post(  # type: ignore
+            "/api/raise", json={"game_id": game_id, "request_id": f"raise-{i}"}
+        )
+
+    recent_moves = app.game_recent_moves[game_id]
+
+    # Then
+    assert len(recent_moves) == app.MAX_RECENT_MOVES_PER_GAME
+    assert "raise-0" not in recent_moves
+    assert "raise-1" in recent_moves
+    assert f"raise-{app.MAX_RECENT_MOVES_PER_GAME}" in recent_moves
+
+
+def _act(client: FlaskClient, game_id: str, action: str, **fields) -> TestResponse:
+    return client.post(f"/api/game/{game_id}/act", json={"action": action, **fields})
+
+
+def test_every_action_can_be_played_through_act() -> None:
+    # Given
+    clients = {"anna": _log_in("anna"), "axel": _log_in("axel")}
+    game_id = clients["anna"].get("/api/create").json["game_id"]  # type: ignore
+    states = []
+    versions = []
+
+    def play(username: str, action: str, **fields) -> None:
+        response = _act(clients[username], game_id, action, **fields)
+        assert response.status_code == 200
+        assert response.json["success"]  # type: ignore
+        states.append(response.json["view"]["state"])  # type: ignore
+        versions.append(response.json["version"])  # type: ignore
+
+    # When
+    play("axel", "join")
+    estimator = app.games[game_id].estimator
+    estimatee = app.games[game_id].get_opponent(estimator)  # type: ignore
+    play(estimator, "estimate", estimate=3, error=1)  # type: ignore
+    play(estimatee, "raise")
+    play(estimator, "call")  # type: ignore
+    play(estimatee, "play_again")
+    play(estimator, "play_again")  # type: ignore
+    next_estimator = app.games[game_id].estimator
+    play(next_estimator, "fold")  # type: ignore
+    play(next_estimator, "end")  # type: ignore
+
+    # Then
+    assert states == [
+        "GameState.WAITING_FOR_ESTIMATE",
+        "GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD",
+        "GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD",
+        "GameState.BOTH_PLAYERS_CALLED",
+        "GameState.A_PLAYER_WANTS_TO_PLAY_AGAIN",
+        "GameState.WAITING_FOR_ESTIMATE",
+        "GameState.ESTIMATOR_FOLDED",
+        "GameState.GAME_OVER",
+    ]
+    assert versions == sorted(set(versions))
+    assert not app.broadcaster.is_watched(game_id)
+
+
+def test_act_returns_the_players_view_and_the_latest_version() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("vera", "vick")
+
+    # When
+    response = _act(clients[estimator], game_id, "estimate", estimate=3, error=1)
+    version = app.game_versions[game_id]
+
+    view = response.json["view"]  # type: ignore
+
+    # Then
+    assert response.json["version"] == version  # type: ignore
+    assert view["is_estimator"]
+    assert not view["is_current_player"]
+    assert view["current_player"] == estimatee
+    assert view["seats"] == list(app.games[game_id].get_seats())
+    assert view["problem"] == app.games[game_id].get_problem().question
+    assert (view["estimate"], view["error"]) == (3, 1)
+    assert "answer" not in view
+
+
+def test_act_versions_increase_with_and_without_spectators() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("sam", "sue")
+
+    # When
+    estimated = _act(clients[estimator], game_id, "estimate", estimate=3, error=1)
+
+    with app.broadcaster.watching(game_id):
+        raised = _act(clients[estimatee], game_id, "raise")
+
+    called = _act(clients[estimator], game_id, "call")
+
+    # Then
+    assert 0 < estimated.json["version"] < raised.json["version"]  # type: ignore
+    assert raised.json["version"] < called.json["version"]  # type: ignore
+
+
+def test_act_reports_a_loss_as_a_negative_payout() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("lou", "lia")
+    _estimate(clients[estimator], game_id)
+
+    # When
+    response = _act(clients[estimatee], game_id, "fold")
+    game = app.games[game_id]
+
+    # Then
+    assert response.json["view"]["payout"] == game.get_payout(estimatee) < 0  # type: ignore
+    assert "you_won" not in response.json["view"]  # type: ignore
+
+
+def test_act_rejects_a_move_in_the_wrong_state_with_a_conflict() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("wade", "wren")
+    game = app.games[game_id]
+
+    # When
+    response = _act(clients[estimatee], game_id, "call")
+
+    # Then
+    assert response.status_code == 409
+    assert response.json["error"] == "WRONG_STATE"  # type: ignore
+    assert app.games[game_id] is game
+
+
+def test_act_rejects_an_unknown_action() -> None:
+    # Given
+    game_id, clients, estimator, _ = _start_game("uma", "ugo")
+
+    # When
+    response = _act(clients[estimator], game_id, "dance")
+
+    # Then
+    assert not response.json["success"]  # type: ignore
+    assert response.json["message"] == "Unknown action!"  # type: ignore
+
+
+def test_act_requires_an_estimate_and_error_to_estimate() -> None:
+    # Given
+    game_id, clients, estimator, _ = _start_game("ezra", "edna")
+    game = app.games[game_id]
+
+    # When
+    without_both = _act(clients[estimator], game_id, "estimate")
+    without_error = _act(clients[estimator], game_id, "estimate", estimate=3)
+
+    # Then
+    assert not without_both.json["success"]  # type: ignore
+    assert not without_error.json["success"]  # type: ignore
+    assert app.games[game_id] is game
+
+
+def test_settled_rounds_record_hit_rates_for_the_problems_games_draw_from() -> None:
+    # Given
+    game_id, clients, estimator, estimatee = _start_game("hank", "hana")
+    _estimate(clients[estimator], game_id)
+    get_problem_stats().flush()
+
+    # When
+    clients[estimatee].post("/api/raise", json={"game_id": game_id})
+    clients[estimator].post("/api/call", json={"game_id": game_id})
+
+    # Then
+    assert get_problem_stats().flush() == 1
+
+
+def test_watching_a_finished_game_sends_its_last_view_and_leaves_no_channel() -> None:
+    # Given
+    game_id, clients, estimator, _ = _start_game("walt", "wilma")
+    _act(clients[estimator], game_id, "fold")
+    _act(clients[estimator], game_id, "end")
+
+    # When
+    response = clients[estimator].get(f"/api/game/{game_id}/watch")
+
+    # Then
+    assert b'"state":"GameState.GAME_OVER"' in response.get_data()
+    assert not app.broadcaster.is_watched(game_id)
+    assert len(app.broadcaster) == 0
+
+
+def test_outcome_lists_each_side_and_says_when_the_estimator_breaks_even() -> None:
+    # Given
+    clients = {username: _log_in(username) for username in ["bea", "ben", "bo"]}
+    game_id = clients["bea"].get("/api/create?max_players=3").json["game_id"]  # type: ignore
+    clients["ben"].post("/api/join", json={"game_id": game_id})
+    clients["bo"].post("/api/join", json={"game_id": game_id})
+    game = app.games[game_id]
+    estimator = game.estimator
+    caller, folder = game.get_estimatees()
+    log_answer = game.get_problem().log_answer
+
+    # When
+    _act(clients[estimator], game_id, "estimate", estimate=log_answer + 5, error=1)  # type: ignore
+    _act(clients[caller], game_id, "call")
+
+    for username in [folder, estimator, folder, estimator]:
+        _act(clients[username], game_id, "raise")  # type: ignore
+
+    _act(clients[folder], game_id, "fold")
+    estimators_page = clients[estimator].get(f"/game/{game_id}").get_data(as_text=True)  # type: ignore
+    folders_page = clients[folder].get(f"/game/{game_id}").get_data(as_text=True)
+
+    # Then
+    assert app.games[game_id].get_payout(estimator) == 0  # type: ignore
+    assert "You break even" in estimators_page
+    assert "You lose" not in estimators_page
+    assert f"vs {caller}: you both called" in estimators_page
+    assert f"vs {folder}: they folded" in estimators_page
+    assert f"vs {estimator}: you folded" in folders_page
+    assert "You lose :'( You pay out $5!" in folders_page
+
+
+def test_state_rejects_a_game_token_with_non_ascii_characters() -> None:
+    # Given
+    game_id, clients, estimator, _ = _start_game("nina", "noel")
+
+    # When
+    response = app.app.test_client().get(f"/api/game/{game_id}/state?token=a.%C3%A9")
+
+    # Then
+    assert response.status_code == 200
+    assert response.json == {"success": False, "message": "User not logged in!"}
+
+
+def test_bots_get_no_ledger_account_or_leaderboard_entry() -> None:
+    # Given
+    client = _log_in("hugo")
+    game_id = client.get("/api/create").json["game_id"]  # type: ignore
+    bot = client.post(f"/api/game/{game_id}/bot", json={}).json["username"]  # type: ignore
+    estimator = app.games[game_id].estimator
+
+    # When
+    app._apply_move(game_id, Move(estimator, Action.ESTIMATE, Estimate(3, 1)))  # type: ignore
+    estimatee = app.games[game_id].get_current_player()
+    app._apply_move(game_id, Move(estimatee, Action.FOLD))  # type: ignore
+
+    # Then
+    assert app.games[game_id].is_round_settled()
+    assert app.ledger.get_balance(bot) is None
+    assert bot not in app.ledger.get_balances()
+    assert app.leaderboard.get_rank(bot) is None
+    assert app.ledger.get_balance("hugo") == app.players["hugo"].balance
+    assert app.players[bot].balance == (
+        Player.create(bot).balance + app.games[game_id].get_payout(bot)
+    )
@@ -0,0 +1,103 @@
+import random
+
+import pytest
+
+from bots import STRATEGIES, BotRunner, Strategy, choose_move
+from game import Action, Estimate, Game, Move
+
+
+@pytest.fixture
+def example_game() -> Game:
+    return Game.create().join("alice").join("bob")
+
+
+@pytest.fixture
+def example_strategy() -> Strategy:
+    return STRATEGIES["expert"]
+
+
+def test_bot_estimates_when_it_is_the_estimator(
+    example_game: Game,
+    example_strategy: Strategy,
+) -> None:
+    # When
+    move = choose_move(example_game, "alice", example_strategy, random.Random(0))
+
+    # Then
+    assert move is not None
+    assert move.action == Action.ESTIMATE
+    assert move.estimate is not None
+    assert move.estimate.log_error == example_strategy.log_error
+
+
+def test_bot_waits_when_it_is_not_its_turn(
+    example_game: Game,
+    example_strategy: Strategy,
+) -> None:
+    # When
+    move = choose_move(example_game, "bob", example_strategy, random.Random(0))
+
+    # Then
+    assert move is None
+
+
+def test_bot_folds_against_an_estimate_it_believes_is_correct(
+    example_game: Game,
+) -> None:
+    # Given
+    strategy = Strategy(name="perfect", skill=0.01)
+    estimate = Estimate(log_answer=example_game.get_problem().log_answer, log_error=3)
+    game = example_game.set_estimate(estimate)
+
+    # When
+    move = choose_move(game, "bob", strategy, random.Random(0))
+
+    # Then
+    assert move == Move("bob", Action.FOLD)
+
+
+def test_bot_raises_against_an_estimate_it_believes_is_wrong(
+    example_game: Game,
+) -> None:
+    # Given
+    strategy = Strategy(name="perfect", skill=0.01)
+    estimate = Estimate(
+        log_answer=example_game.get_problem().log_answer + 3, log_error=0
+    )
+    game = example_game.set_estimate(estimate)
+
+    # When
+    move = choose_move(game, "bob", strategy, random.Random(0))
+
+    # Then
+    assert move == Move("bob", Action.RAISE)
+
+
+def test_bot_runner_plays_bot_turns_until_waiting_on_a_human(
+    example_strategy: Strategy,
+) -> None:
+    # Given
+    games: dict[str, Game] = {}
+
+    def apply_move(game_id: str, move: Move) -> Game:
+        games[game_id] = games[game_id].apply(move)
+        runner.notify(games[game_id])
+
+        return games[game_id]
+
+    runner = BotRunner(get_game=games.get, apply_move=apply_move, seed=0)
+    game = Game.create().join("alice")
+    bot = runner.create_bot(game.id, example_strategy)
+    games[game.id] = game
+    apply_move(game.id, Move(bot.username, Action.JOIN))
+    estimate = Estimate(log_answer=game.get_problem().log_answer + 3, log_error=0)
+    apply_move(game.id, Move("alice", Action.ESTIMATE, estimate))
+
+    # When
+    num_moves = runner.run_pending()
+
+    # Then
+    assert num_moves == 1
+    assert games[game.id].get_ante(bot.username) == 2
+    assert games[game.id].is_current_player("alice")
+    assert runner.run_pending() == 0
@@ -0,0 +1,123 @@
+import threading
+
+from broadcast import Broadcaster
+
+
+def test_watcher_receives_messages_published_after_its_version() -> None:
+    # Given
+    broadcaster = Broadcaster()
+
+    with broadcaster.watching("ABCDE"):
+        broadcaster.publish("ABCDE", b"first")
+
+        # When
+        message = broadcaster.wait("ABCDE", after_version=0, timeout=0)
+
+    # Then
+    assert message is not None
+    assert message.version == 1
+    assert message.data == b"first"
+    assert message.event == b"id: 1\ndata: first\n\n"
+
+
+def test_watcher_times_out_without_new_messages() -> None:
+    # Given
+    broadcaster = Broadcaster()
+
+    with broadcaster.watching("ABCDE"):
+        message = broadcaster.publish("ABCDE", b"first")
+
+        # When
+        new_message = broadcaster.wait(
+            "ABCDE", after_version=message.version, timeout=0  # type: ignore
+        )
+
+    # Then
+    assert new_message is None
+
+
+def test_every_watcher_shares_the_same_published_message() -> None:
+    # Given
+    broadcaster = Broadcaster()
+    received = []
+
+    def watch() -> None:
+        with broadcaster.watching("ABCDE"):
+            ready.release()
+            received.append(broadcaster.wait("ABCDE", 1, timeout=5))
+
+    ready = threading.Semaphore(0)
+    watchers = [threading.Thread(target=watch) for _ in range(10)]
+
+    with broadcaster.watching("ABCDE"):
+        broadcaster.publish("ABCDE", b"first")
+
+        for watcher in watchers:
+            watcher.start()
+
+        for _ in watchers:
+            ready.acquire()
+
+        # When
+        message = broadcaster.publish("ABCDE", b"second")
+
+        for watcher in watchers:
+            watcher.join()
+
+    # Then
+    assert len(received) == 10
+    assert all(received_message is message for received_message in received)
+
+
+def test_closing_a_game_still_delivers_its_last_message() -> None:
+    # Given
+    broadcaster = Broadcaster()
+
+    with broadcaster.watching("ABCDE"):
+        broadcaster.publish("ABCDE", b"first")
+        broadcaster.publish("ABCDE", b"game over")
+
+        # When
+        broadcaster.close("ABCDE")
+        message = broadcaster.wait("ABCDE", after_version=1, timeout=5)
+
+        # Then
+        assert broadcaster.is_closed("ABCDE")
+        assert message is not None
+        assert message.data == b"game over"
+        assert broadcaster.wait("ABCDE", after_version=2, timeout=5) is None
+
+
+def test_channels_are_removed_once_their_last_watcher_leaves() -> None:
+    # Given
+    broadcaster = Broadcaster()
+
+    # When
+    unwatched = broadcaster.publish("ABCDE", b"nobody's looking")
+
+    with broadcaster.watching("ABCDE"), broadcaster.watching("FGHIJ"):
+        with broadcaster.watching("ABCDE"):
+            broadcaster.publish("ABCDE", b"first")
+
+        num_channels = len(broadcaster)
+        broadcaster.close("FGHIJ")
+
+    # Then
+    assert unwatched is None
+    assert num_channels == 2
+    assert len(broadcaster) == 0
+
+
+def test_versions_keep_increasing_when_a_channel_is_reopened() -> None:
+    # Given
+    broadcaster = Broadcaster()
+
+    with broadcaster.watching("ABCDE"):
+        first = broadcaster.publish("ABCDE", b"first")
+
+    # When
+    with broadcaster.watching("ABCDE"):
+        second = broadcaster.publish("ABCDE", b"second")
+
+    # Then
+    assert second.version > first.version  # type: ignore
@@ -0,0 +1,31 @@
+import pytest
+
+from dataclasses import replace
+from fuzz import InvariantViolation, _check, explore
+from game import Action, Estimate, Game, Move
+
+
+def test_random_play_keeps_every_invariant() -> None:
+    # When
+    exploration = explore(seed=0, num_steps=20_000)
+
+    # Then
+    assert exploration.num_steps == 20_000
+    assert exploration.num_applied > 0
+    assert exploration.num_rejected > 0
+    assert exploration.num_rounds > 0
+
+
+def test_broken_invariant_names_the_seed_and_moves() -> None:
+    # Given
+    game = Game.create().join("alice").join("bob")
+    estimate = Estimate(log_answer=game.get_problem().log_answer, log_error=1)
+    game = game.set_estimate(estimate)
+    estimator = game.get_estimator()
+    estimatee = game.get_opponent(estimator)
+    new_game = replace(game.raise_ante(estimatee), antes={estimator: 0, estimatee: 2})
+    trail = [Move(estimator, Action.ESTIMATE, estimate), Move(estimatee, Action.RAISE)]
+
+    # When / Then
+    with pytest.raises(InvariantViolation, match="Seed 7, step 1: .*ante decreased"):
+        _check(game, new_game, seed=7, step=1, trail=trail)
@@ -1,6 +1,22 @@
 import pytest
 
-from game import Player, Game, GameState, Problem, Estimate
+from dataclasses import replace
+from game import (
+    Player,
+    Game,
+    GameState,
+    Problem,
+    Estimate,
+    Move,
+    MoveError,
+    Action,
+    RoundHistory,
+    RoundRecord,
+    is_valid_username,
+    seed,
+    use_problems,
+)
+from problems import ProblemBank, write_problem_bank
 
 
 @pytest.fixture
@@ -65,7 +81,7 @@ def example_incorrect_prediction(example_problem: Problem) -> Estimate:
 def empty_game(example_problem: Problem) -> Game:
     return Game(
         id="test-game-id",
-        current_state=GameState.WAITING_FOR_PLAYERS,
+        current_state=GameState.GAME_IS_EMPTY,
         usernames=set(),
         problem=example_problem,
         estimator=None,
@@ -132,35 +148,31 @@ def test_no_more_than_two_players_can_join_game(
     )
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game_with_one_player.join(example_player_three.username)
 
 
-def test_player_must_have_valid_username(empty_game: Game) -> None:
-    # Given / When
-    with pytest.raises(ValueError):
-        empty_game.join("")
-
-    with pytest.raises(ValueError):
-        empty_game.join(" ")
-
-    with pytest.raises(ValueError):
-        empty_game.join(1)  # type: ignore
+def test_player_must_have_valid_username() -> None:
+    # When / Then
+    assert is_valid_username("testplayeroneid")
+    assert not is_valid_username("")
+    assert not is_valid_username(" ")
+    assert not is_valid_username(1)  # type: ignore
 
 
 def test_player_cant_place_ante_if_theres_no_prediction_made(
     empty_game: Game, example_player_one: Player, example_player_two: Player
 ) -> None:
     # Given
-    game_with_one_player = (
+    game_with_two_players = (
         empty_game.join(example_player_one.username)
         .join(example_player_two.username)
-        .set_estimator(example_player_one.username)
+        .set_current_player(example_player_two.username)
     )
 
     # When
-    with pytest.raises(ValueError):
-        game_with_one_player.set_ante(example_player_one.username, 1)
+    with pytest.raises(AssertionError):
+        game_with_two_players.raise_ante(example_player_two.username)
 
 
 def test_can_get_the_number_of_players_in_the_game(
@@ -199,9 +211,9 @@ def test_can_get_if_player_is_waiting_for_another_player_to_join(
     game_with_two_players = game_with_one_player.join(example_player_two.username)
 
     # When / Then
-    assert not empty_game.is_player_waiting()
-    assert game_with_one_player.is_player_waiting()
-    assert not game_with_two_players.is_player_waiting()
+    assert empty_game.get_state() != GameState.WAITING_FOR_ANOTHER_PLAYER
+    assert game_with_one_player.get_state() == GameState.WAITING_FOR_ANOTHER_PLAYER
+    assert game_with_two_players.get_state() != GameState.WAITING_FOR_ANOTHER_PLAYER
 
 
 def test_can_set_the_estimator(empty_game: Game, example_player_one: Player) -> None:
@@ -219,7 +231,7 @@ def test_error_is_thrown_when_setting_estimator_to_player_not_in_game(
     empty_game: Game, example_player_one: Player
 ) -> None:
     # Given / When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         empty_game.set_estimator(example_player_one.username)
 
 
@@ -272,7 +284,7 @@ def test_cant_set_current_player_to_non_existing_player(
     empty_game: Game, example_player_one: Player
 ) -> None:
     # Given / When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         empty_game.set_current_player(example_player_one.username)
 
 
@@ -301,7 +313,7 @@ def test_error_is_thrown_when_getting_opponent_of_player_not_in_game(
     empty_game: Game, example_player_one: Player
 ) -> None:
     # Given / When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         empty_game.get_opponent(example_player_one.username)
 
 
@@ -312,7 +324,7 @@ def test_error_is_thrown_when_getting_opponent_of_player_with_one_player(
     game_with_one_player = empty_game.join(example_player_one.username)
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game_with_one_player.get_opponent(example_player_one.username)
 
 
@@ -337,7 +349,7 @@ def test_error_is_thrown_when_getting_ante_of_player_not_in_game(
     empty_game: Game, example_player_one: Player
 ) -> None:
     # Given / When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         empty_game.get_ante(example_player_one.username)
 
 
@@ -345,7 +357,7 @@ def test_error_is_thrown_when_setting_ante_of_player_not_in_game(
     empty_game: Game, example_player_one: Player
 ) -> None:
     # Given / When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         empty_game.set_ante(example_player_one.username, 100)
 
 
@@ -358,7 +370,7 @@ def test_error_is_thrown_when_setting_ante_to_non_positive_number(
     )
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game_with_two_players.set_ante(example_player_one.username, -10)
 
 
@@ -390,19 +402,12 @@ def test_that_player_can_raise_the_ante(
 
 
 def test_error_is_thrown_when_raising_ante_of_player_not_in_game(
-    empty_game: Game,
-    example_player_one: Player,
-    example_player_two: Player,
+    game_waiting_for_raise_call_or_fold: Game,
     example_player_three: Player,
 ) -> None:
-    # Given
-    game = empty_game.join(example_player_one.username).join(
-        example_player_two.username
-    )
-
-    # When
-    with pytest.raises(ValueError):
-        game.raise_ante(example_player_three.username)
+    # When / Then
+    with pytest.raises(AssertionError):
+        game_waiting_for_raise_call_or_fold.raise_ante(example_player_three.username)
 
 
 def test_error_is_thrown_when_raising_ante_of_player_with_one_player(
@@ -413,7 +418,7 @@ def test_error_is_thrown_when_raising_ante_of_player_with_one_player(
     game = empty_game.join(example_player_one.username)
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game.raise_ante(example_player_one.username)
 
 
@@ -437,13 +442,16 @@ def test_player_can_call_ante(
     assert new_game.get_ante(example_player_two.username) == player_one_ante
 
 
-def test_error_is_thrown_when_setting_ante_lower_than_opponents_amount(
+def test_error_is_thrown_when_calling_with_ante_not_lower_than_opponents_amount(
     game_waiting_for_raise_call_or_fold: Game,
     example_player_two: Player,
 ) -> None:
+    # Given
+    game = game_waiting_for_raise_call_or_fold.set_ante(example_player_two.username, 1)
+
     # When / Then
-    with pytest.raises(ValueError):
-        game_waiting_for_raise_call_or_fold.set_ante(example_player_two.username, 0)
+    with pytest.raises(AssertionError):
+        game.call_ante(example_player_two.username)
 
 
 def test_error_is_thrown_when_raising_ante_but_opponents_ante_is_lower_or_equal(
@@ -454,7 +462,7 @@ def test_error_is_thrown_when_raising_ante_but_opponents_ante_is_lower_or_equal(
     new_game = game_waiting_for_raise_call_or_fold.switch_turns()
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         new_game.raise_ante(example_player_one.username)
 
 
@@ -469,30 +477,20 @@ def test_can_get_whether_player_has_called_ante(
     )
 
     # When / Then
-    assert not game_waiting_for_raise_call_or_fold.has_called_ante(
-        example_player_one.username
-    )
-    assert not game_waiting_for_raise_call_or_fold.has_called_ante(
+    assert not game_waiting_for_raise_call_or_fold.has_called_ante()
+    assert new_game.has_called_ante()
+    assert new_game.get_ante(example_player_one.username) == new_game.get_ante(
         example_player_two.username
     )
-    assert new_game.has_called_ante(example_player_one.username)
-    assert new_game.has_called_ante(example_player_two.username)
 
 
-def test_error_is_thrown_when_checking_if_player_has_called_ante_but_player_not_in_game(
-    empty_game: Game,
-    example_player_one: Player,
-    example_player_two: Player,
+def test_error_is_thrown_when_player_not_in_game_calls_ante(
+    game_waiting_for_raise_call_or_fold: Game,
     example_player_three: Player,
 ) -> None:
-    # Given
-    game = empty_game.join(example_player_one.username).join(
-        example_player_two.username
-    )
-
-    # When
-    with pytest.raises(ValueError):
-        game.has_called_ante(example_player_three.username)
+    # When / Then
+    with pytest.raises(AssertionError):
+        game_waiting_for_raise_call_or_fold.call_ante(example_player_three.username)
 
 
 def test_player_folding_marks_them_as_folded(
@@ -504,24 +502,20 @@ def test_player_folding_marks_them_as_folded(
     new_game = game_waiting_for_raise_call_or_fold.fold(example_player_two.username)
 
     # Then
-    assert not new_game.has_folded(example_player_one.username)
-    assert new_game.has_folded(example_player_two.username)
+    assert new_game.get_state() == GameState.ESTIMATEE_FOLDED
+    assert new_game.get_sides()[example_player_two.username].outcome == (
+        GameState.ESTIMATEE_FOLDED
+    )
+    assert example_player_one.username not in new_game.get_sides()
 
 
-def test_error_is_thrown_when_checking_if_player_has_folded_but_player_not_in_game(
-    empty_game: Game,
+def test_error_is_thrown_when_player_folds_out_of_turn(
+    game_waiting_for_raise_call_or_fold: Game,
     example_player_one: Player,
-    example_player_two: Player,
-    example_player_three: Player,
 ) -> None:
-    # Given
-    game = empty_game.join(example_player_one.username).join(
-        example_player_two.username
-    )
-
-    # When
-    with pytest.raises(ValueError):
-        game.has_folded(example_player_three.username)
+    # When / Then
+    with pytest.raises(AssertionError):
+        game_waiting_for_raise_call_or_fold.fold(example_player_one.username)
 
 
 def test_error_is_thrown_when_player_not_in_game_folds(
@@ -536,7 +530,7 @@ def test_error_is_thrown_when_player_not_in_game_folds(
     )
 
     # When
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game.fold(example_player_three.username)
 
 
@@ -554,11 +548,11 @@ def test_error_is_thrown_when_player_folds_for_second_time(
     game = game.fold(example_player_one.username)
 
     # Then
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game.fold(example_player_one.username)
 
 
-def test_error_is_thrown_when_setting_ante_of_folded_player(
+def test_error_is_thrown_when_folded_player_raises_ante(
     empty_game: Game,
     example_player_one: Player,
     example_player_two: Player,
@@ -572,8 +566,8 @@ def test_error_is_thrown_when_setting_ante_of_folded_player(
     game = game.fold(example_player_one.username)
 
     # Then
-    with pytest.raises(ValueError):
-        game.set_ante(example_player_one.username, 5)
+    with pytest.raises(AssertionError):
+        game.raise_ante(example_player_one.username)
 
 
 def test_error_is_thrown_when_folded_player_calls_ante(
@@ -585,11 +579,11 @@ def test_error_is_thrown_when_folded_player_calls_ante(
     new_game = game_waiting_for_raise_call_or_fold.fold(example_player_two.username)
 
     # Then
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         new_game.call_ante(example_player_one.username)
 
 
-def test_antes_of_both_players_is_zero_before_prediction(
+def test_only_the_estimator_has_an_ante_before_prediction(
     game_waiting_for_estimate: Game,
     example_player_one: Player,
     example_player_two: Player,
@@ -599,11 +593,11 @@ def test_antes_of_both_players_is_zero_before_prediction(
     player_two_ante = game_waiting_for_estimate.get_ante(example_player_two.username)
 
     # Then
-    assert player_one_ante == 0
+    assert player_one_ante == 1
     assert player_two_ante == 0
 
 
-def test_has_winner_is_true_when_estimator_has_submitted_answer(
+def test_round_is_settled_when_estimatee_calls_the_estimate(
     game_waiting_for_estimate: Game,
     example_correct_prediction: Estimate,
     example_player_two: Player,
@@ -614,11 +608,11 @@ def test_has_winner_is_true_when_estimator_has_submitted_answer(
     ).call_ante(example_player_two.username)
 
     # Then
-    assert not game_waiting_for_estimate.has_winner()
-    assert new_game.has_winner()
+    assert not game_waiting_for_estimate.is_round_settled()
+    assert new_game.is_round_settled()
 
 
-def test_has_winner_is_false_when_estimator_has_not_submitted_answer(
+def test_round_is_not_settled_before_estimator_submits_answer(
     empty_game: Game,
     example_correct_prediction: Estimate,
     example_player_one: Player,
@@ -632,8 +626,8 @@ def test_has_winner_is_false_when_estimator_has_not_submitted_answer(
     )
 
     # When / Then
-    assert not empty_game.has_winner()
-    assert not game.has_winner()
+    assert not empty_game.is_round_settled()
+    assert not game.is_round_settled()
 
 
 def test_is_winner_is_estimator_when_prediction_is_correct(
@@ -648,8 +642,8 @@ def test_is_winner_is_estimator_when_prediction_is_correct(
     ).call_ante(example_player_two.username)
 
     # Then
-    assert not game_waiting_for_estimate.has_winner()
-    assert new_game.has_winner()
+    assert not game_waiting_for_estimate.is_round_settled()
+    assert new_game.is_round_settled()
     assert new_game.is_winner(example_player_one.username)
     assert not new_game.is_winner(example_player_two.username)
 
@@ -666,13 +660,13 @@ def test_is_winner_is_estimatee_when_prediction_is_incorrect(
     ).call_ante(example_player_two.username)
 
     # Then
-    assert not game_waiting_for_estimate.has_winner()
-    assert new_game.has_winner()
+    assert not game_waiting_for_estimate.is_round_settled()
+    assert new_game.is_round_settled()
     assert not new_game.is_winner(example_player_one.username)
     assert new_game.is_winner(example_player_two.username)
 
 
-def test_get_payout_throws_an_error_when_the_game_has_no_winner(
+def test_get_payout_throws_an_error_when_the_round_is_not_settled(
     empty_game: Game,
     example_player_one: Player,
     example_player_two: Player,
@@ -685,9 +679,9 @@ def test_get_payout_throws_an_error_when_the_game_has_no_winner(
     )
 
     # When / Then
-    assert not game.has_winner()
+    assert not game.is_round_settled()
 
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game.get_payout(example_player_one.username)
 
 
@@ -696,7 +690,7 @@ def test_error_is_thrown_when_getting_payout_of_non_existent_user(
     example_player_three: Player,
 ) -> None:
     # When / Then
-    with pytest.raises(ValueError):
+    with pytest.raises(AssertionError):
         game_with_round_ended.get_payout(example_player_three.username)
 
 
@@ -732,8 +726,8 @@ def test_game_with_one_player_still_has_state_waiting_for_player(
     game_with_one_player = empty_game.join(example_player_one.username)
 
     # When / Then
-    assert empty_game.get_state() == GameState.WAITING_FOR_PLAYERS
-    assert game_with_one_player.get_state() == GameState.WAITING_FOR_PLAYERS
+    assert empty_game.get_state() == GameState.GAME_IS_EMPTY
+    assert game_with_one_player.get_state() == GameState.WAITING_FOR_ANOTHER_PLAYER
 
 
 def test_two_players_joining_empty_game_changes_state_to_waiting_for_estimate(
@@ -747,7 +741,7 @@ def test_two_players_joining_empty_game_changes_state_to_waiting_for_estimate(
     )
 
     # When / Then
-    assert empty_game.get_state() == GameState.WAITING_FOR_PLAYERS
+    assert empty_game.get_state() == GameState.GAME_IS_EMPTY
     assert game_with_two_players.get_state() == GameState.WAITING_FOR_ESTIMATE
 
 
@@ -760,7 +754,7 @@ def test_game_waiting_for_estimate_transitions_to_waiting_for_raise_etc_when_est
 
     # When / Then
     assert game_waiting_for_estimate.get_state() == GameState.WAITING_FOR_ESTIMATE
-    assert new_game.get_state() == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+    assert new_game.get_state() == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD
 
 
 def test_game_waiting_for_raise_call_or_fold_transitions_to_waiting_for_raise_when_player_raises(
@@ -775,12 +769,12 @@ def test_game_waiting_for_raise_call_or_fold_transitions_to_waiting_for_raise_wh
     # When / Then
     assert (
         game_waiting_for_raise_call_or_fold.get_state()
-        == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+        == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD
     )
-    assert new_game.get_state() == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+    assert new_game.get_state() == GameState.WAITING_FOR_ESTIMATOR_TO_RAISE_CALL_OR_FOLD
 
 
-def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_player_folds(
+def test_game_waiting_for_raise_call_or_fold_transitions_to_estimatee_folded_when_player_folds(
     game_waiting_for_raise_call_or_fold: Game,
     example_player_two: Player,
 ) -> None:
@@ -790,12 +784,12 @@ def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_pla
     # When / Then
     assert (
         game_waiting_for_raise_call_or_fold.get_state()
-        == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+        == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD
     )
-    assert new_game.get_state() == GameState.ROUND_ENDED
+    assert new_game.get_state() == GameState.ESTIMATEE_FOLDED
 
 
-def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_player_calls(
+def test_game_waiting_for_raise_call_or_fold_transitions_to_both_players_called_when_player_calls(
     game_waiting_for_raise_call_or_fold: Game,
     example_player_two: Player,
 ) -> None:
@@ -807,12 +801,12 @@ def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_pla
     # When / Then
     assert (
         game_waiting_for_raise_call_or_fold.get_state()
-        == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+        == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD
     )
-    assert new_game.get_state() == GameState.ROUND_ENDED
+    assert new_game.get_state() == GameState.BOTH_PLAYERS_CALLED
 
 
-def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_multiple_players_call_and_raise(
+def test_game_waiting_for_raise_call_or_fold_transitions_to_both_players_called_when_multiple_players_call_and_raise(
     game_waiting_for_raise_call_or_fold: Game,
     example_player_one: Player,
     example_player_two: Player,
@@ -827,9 +821,9 @@ def test_game_waiting_for_raise_call_or_fold_transitions_to_round_ended_when_mul
     # When / Then
     assert (
         game_waiting_for_raise_call_or_fold.get_state()
-        == GameState.WAITING_FOR_RAISE_CALL_OR_FOLD
+        == GameState.WAITING_FOR_ESTIMATEE_TO_RAISE_CALL_OR_FOLD
     )
-    assert new_game.get_state() == GameState.ROUND_ENDED
+    assert new_game.get_state() == GameState.BOTH_PLAYERS_CALLED
 
 
 def test_game_with_round_ended_transitions_to_ended_when_end_is_called(
@@ -839,16 +833,349 @@ def test_game_with_round_ended_transitions_to_ended_when_end_is_called(
     new_game = game_with_round_ended.end()
 
     # When / Then
-    assert game_with_round_ended.get_state() == GameState.ROUND_ENDED
-    assert new_game.get_state() == GameState.GAME_ENDED
+    assert game_with_round_ended.get_state() == GameState.ESTIMATEE_FOLDED
+    assert new_game.get_state() == GameState.GAME_OVER
 
 
-def test_game_with_round_ended_transitions_to_waiting_for_estimate_when_reset_antes_is_called(
+def test_game_with_round_ended_transitions_to_waiting_for_estimate_when_both_play_again(
     game_with_round_ended: Game,
+    example_player_one: Player,
+    example_player_two: Player,
 ) -> None:
     # Given
-    new_game = game_with_round_ended._start_new_round()
+    new_game = game_with_round_ended.play_again(example_player_one.username).play_again(
+        example_player_two.username
+    )
 
     # When / Then
-    assert game_with_round_ended.get_state() == GameState.ROUND_ENDED
+    assert game_with_round_ended.get_state() == GameState.ESTIMATEE_FOLDED
     assert new_game.get_state() == GameState.WAITING_FOR_ESTIMATE
+    assert new_game.get_ante(example_player_one.username) == 0
+
+
+@pytest.fixture
+def example_round_record(
+    example_player_one: Player,
+    example_player_two: Player,
+    example_correct_prediction: Estimate,
+) -> RoundRecord:
+    return RoundRecord(
+        round_number=1,
+        problem_index=3,
+        estimator=example_player_one.username,
+        estimate=example_correct_prediction,
+        outcome=GameState.BOTH_PLAYERS_CALLED,
+        antes={example_player_one.username: 2, example_player_two.username: 2},
+        payouts={example_player_one.username: 4, example_player_two.username: -4},
+    )
+
+
+def test_round_history_returns_appended_rounds(
+    example_round_record: RoundRecord,
+    example_player_one: Player,
+) -> None:
+    # Given
+    history = RoundHistory()
+
+    # When
+    new_history = history.append(example_round_record)
+
+    # Then
+    assert len(history) == 0
+    assert len(new_history) == 1
+    assert new_history[0] == example_round_record
+    assert new_history[0].get_winners() == [example_player_one.username]
+
+
+def test_round_history_drops_oldest_rounds_beyond_cap(
+    example_round_record: RoundRecord,
+) -> None:
+    # Given
+    history = RoundHistory(cap=2)
+
+    # When
+    for round_number in range(1, 5):
+        history = history.append(
+            RoundRecord(**{**vars(example_round_record), "round_number": round_number})
+        )
+
+    # Then
+    assert len(history) == 2
+    assert [record.round_number for record in history] == [3, 4]
+
+
+def test_round_history_stores_rounds_without_an_estimate(
+    example_round_record: RoundRecord,
+) -> None:
+    # Given
+    record = RoundRecord(
+        **{
+            **vars(example_round_record),
+            "estimate": None,
+            "outcome": GameState.ESTIMATOR_FOLDED,
+        }
+    )
+
+    # When
+    history = RoundHistory().append(record)
+
+    # Then
+    assert history[0].estimate is None
+    assert history[0].outcome == GameState.ESTIMATOR_FOLDED
+
+
+def test_settled_round_is_recorded_in_game_history(
+    example_problem: Problem,
+    example_player_one: Player,
+    example_player_two: Player,
+    example_correct_prediction: Estimate,
+) -> None:
+    # Given
+    game = (
+        Game(
+            id="ABCDE",
+            current_state=GameState.GAME_IS_EMPTY,
+            usernames=set(),
+            problem=example_problem,
+            estimator=None,
+            estimate=None,
+            current_player=None,
+            antes=dict(),
+        )
+        .join(example_player_one.username)
+        .join(example_player_two.username)
+        .set_estimate(example_correct_prediction)
+    )
+
+    # When
+    new_game = game.call_ante(example_player_two.username)
+
+    # Then
+    assert len(game.get_history()) == 0
+    assert len(new_game.get_history()) == 1
+    assert new_game.get_history()[0].payouts == {
+        example_player_one.username: 2,
+        example_player_two.username: -2,
+    }
+
+
+@pytest.fixture
+def example_three_player_game(
+    example_problem: Problem,
+    example_player_one: Player,
+    example_player_two: Player,
+    example_player_three: Player,
+) -> Game:
+    return (
+        Game(
+            id="ABCDE",
+            current_state=GameState.GAME_IS_EMPTY,
+            usernames=set(),
+            problem=example_problem,
+            estimator=None,
+            estimate=None,
+            current_player=None,
+            antes=dict(),
+            max_players=3,
+        )
+        .join(example_player_one.username)
+        .join(example_player_two.username)
+        .join(example_player_three.username)
+    )
+
+
+def test_game_waits_for_every_seat_to_fill_before_estimating(
+    example_three_player_game: Game,
+    example_player_three: Player,
+) -> None:
+    # Given
+    game = replace(
+        example_three_player_game,
+        current_state=GameState.WAITING_FOR_ANOTHER_PLAYER,
+        usernames=example_three_player_game.usernames - {example_player_three.username},
+        seats=example_three_player_game.seats[:2],
+    )
+
+    # When
+    new_game = game.join(example_player_three.username)
+
+    # Then
+    assert game.get_state() == GameState.WAITING_FOR_ANOTHER_PLAYER
+    assert not game.is_full()
+    assert new_game.get_state() == GameState.WAITING_FOR_ESTIMATE
+    assert new_game.is_full()
+
+
+def test_estimator_settles_a_side_with_each_estimatee_in_seat_order(
+    example_three_player_game: Game,
+    example_player_one: Player,
+    example_player_two: Player,
+    example_player_three: Player,
+    example_correct_prediction: Estimate,
+) -> None:
+    # Given
+    game = example_three_player_game.set_estimate(example_correct_prediction)
+
+    # When
+    game_after_first_side = game.call_ante(example_player_two.username)
+    new_game = game_after_first_side.fold(example_player_three.username)
+
+    # Then
+    assert game.get_current_side() == example_player_two.username
+    assert game_after_first_side.get_current_side() == example_player_three.username
+    assert game_after_first_side.is_current_player(example_player_three.username)
+    assert not game_after_first_side.is_round_settled()
+    assert new_game.is_round_settled()
+    assert new_game.get_payout(example_player_two.username) == -2
+    assert new_game.get_payout(example_player_three.username) == -1
+    assert new_game.get_payout(example_player_one.username) == 3
+    assert new_game.get_history()[0].antes == {
+        example_player_one.username: 2,
+        example_player_two.username: 1,
+        example_player_three.username: 0,
+    }
+
+
+def test_side_payouts_are_listed_per_opponent_and_sum_to_the_payout(
+    example_three_player_game: Game,
+    example_player_one: Player,
+    example_player_two: Player,
+    example_player_three: Player,
+    example_correct_prediction: Estimate,
+) -> None:
+    # Given
+    game = example_three_player_game.set_estimate(example_correct_prediction)
+
+    # When
+    new_game = game.call_ante(example_player_two.username).fold(
+        example_player_three.username
+    )
+
+    # Then
+    assert new_game.get_side_payouts(example_player_one.username) == {
+        example_player_two.username: 2,
+        example_player_three.username: 1,
+    }
+    assert new_game.get_side_payouts(example_player_two.username) == {
+        example_player_one.username: -2
+    }
+    assert all(
+        sum(new_game.get_side_payouts(username).values())
+        == new_game.get_payout(username)
+        for username in new_game.get_seats()
+    )
+
+
+def test_estimator_rotates_through_seats(
+    example_three_player_game: Game,
+    example_player_two: Player,
+    example_player_three: Player,
+) -> None:
+    # Given
+    game = replace(example_three_player_game, estimator=example_player_three.username)
+
+    # When
+    next_estimator = game.get_next_estimator()
+
+    # Then
+    assert example_three_player_game.get_next_estimator() == example_player_two.username
+    assert next_estimator == example_three_player_game.get_seats()[0]
+
+
+def test_validate_accepts_moves_that_apply_accepts(
+    example_three_player_game: Game,
+    example_player_one: Player,
+    example_player_two: Player,
+    example_correct_prediction: Estimate,
+) -> None:
+    # Given
+    estimate = Move(
+        example_player_one.username, Action.ESTIMATE, example_correct_prediction
+    )
+    game = example_three_player_game.apply(estimate)
+    raise_ante = Move(example_player_two.username, Action.RAISE)
+
+    # When
+    error = game.validate(raise_ante)
+
+    # Then
+    assert example_three_player_game.validate(estimate) is None
+    assert error is None
+    assert game.apply(raise_ante).get_ante(example_player_two.username) == 2
+
+
+def test_validate_returns_why_a_move_is_illegal(
+    example_three_player_game: Game,
+    example_player_two: Player,
+    example_player_three: Player,
+    example_correct_prediction: Estimate,
+) -> None:
+    # Given
+    game = example_three_player_game.set_estimate(example_correct_prediction)
+
+    # When / Then
+    assert game.validate(Move("newplayer", Action.JOIN)) == MoveError.WRONG_STATE
+    assert game.validate(Move("newplayer", Action.FOLD)) == MoveError.NOT_IN_GAME
+    assert (
+        game.validate(Move(example_player_three.username, Action.RAISE))
+        == MoveError.NOT_YOUR_TURN
+    )
+    assert (
+        game.validate(Move(example_player_two.username, Action.ESTIMATE))
+        == MoveError.WRONG_STATE
+    )
+    assert (
+        example_three_player_game.validate(
+            Move(example_player_two.username, Action.ESTIMATE)
+        )
+        == MoveError.NOT_ESTIMATOR
+    )
+
+
+def test_validate_rejects_joining_twice_or_joining_a_full_game(
+    example_three_player_game: Game,
+    example_player_one: Player,
+    example_player_three: Player,
+) -> None:
+    # Given
+    game = replace(
+        example_three_player_game,
+        current_state=GameState.WAITING_FOR_ANOTHER_PLAYER,
+        max_players=4,
+    )
+    full_game = replace(game, max_players=3)
+
+    # When / Then
+    assert (
+        game.validate(Move(example_player_one.username, Action.JOIN))
+        == MoveError.ALREADY_JOINED
+    )
+    assert game.validate(Move("newplayer", Action.JOIN)) is None
+    assert full_game.validate(Move("newplayer", Action.JOIN)) == MoveError.GAME_IS_FULL
+
+
+def test_seeding_replays_game_ids_and_problems() -> None:
+    # Given
+    seed(42)
+    first = Game.create().join("alice").join("bob")
+
+    # When
+    seed(42)
+    second = Game.create().join("alice").join("bob")
+
+    # Then
+    assert first.id == second.id
+    assert first.get_problem() == second.get_problem()
+
+
+def test_games_draw_problems_from_the_injected_bank(tmp_path) -> None:
+    # Given
+    path = str(tmp_path / "problems.bank")
+    write_problem_bank([Problem("How many grains of sand?", 18, "")], path)
+    use_problems(ProblemBank(path))
+
+    # When
+    new_game = Game.create().join("alice").join("bob")
+
+    # Then
+    assert new_game.get_problem().question == "How many grains of sand?"
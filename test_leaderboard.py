@@ -0,0 +1,48 @@
+import pytest
+
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def leaderboard() -> Leaderboard:
+    return Leaderboard({"alice": 10, "bob": 30, "carol": 20})
+
+
+def test_players_are_ranked_by_balance(leaderboard: Leaderboard) -> None:
+    # Given / When / Then
+    assert leaderboard.get_rank("bob") == 1
+    assert leaderboard.get_rank("carol") == 2
+    assert leaderboard.get_rank("alice") == 3
+
+
+def test_unknown_player_has_no_rank(leaderboard: Leaderboard) -> None:
+    # Given / When / Then
+    assert leaderboard.get_rank("dave") is None
+
+
+def test_updating_balance_moves_player(leaderboard: Leaderboard) -> None:
+    # Given / When
+    leaderboard.update("alice", 40)
+
+    # Then
+    assert leaderboard.get_rank("alice") == 1
+    assert leaderboard.get_rank("bob") == 2
+    assert len(leaderboard) == 3
+
+
+def test_ties_are_broken_by_username(leaderboard: Leaderboard) -> None:
+    # Given / When
+    leaderboard.update("dave", 30)
+
+    # Then
+    assert leaderboard.get_page(0, 2) == [("bob", 30), ("dave", 30)]
+
+
+def test_can_page_through_leaderboard(leaderboard: Leaderboard) -> None:
+    # Given / When
+    first_page = leaderboard.get_page(0, 2)
+    second_page = leaderboard.get_page(2, 2)
+
+    # Then
+    assert first_page == [("bob", 30), ("carol", 20)]
+    assert second_page == [("alice", 10)]
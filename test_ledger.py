@@ -0,0 +1,63 @@
+import pytest
+
+from ledger import Ledger
+
+
+@pytest.fixture
+def ledger() -> Ledger:
+    ledger = Ledger(":memory:")
+    ledger.open_account("alice", 10)
+    ledger.open_account("bob", 15)
+
+    return ledger
+
+
+def test_opening_an_existing_account_keeps_its_balance(ledger: Ledger) -> None:
+    # Given / When
+    balance = ledger.open_account("alice", 999)
+
+    # Then
+    assert balance == 10
+
+
+def test_balance_of_unknown_account_is_none(ledger: Ledger) -> None:
+    # Given / When / Then
+    assert ledger.get_balance("carol") is None
+
+
+def test_recording_a_round_updates_materialized_balances(ledger: Ledger) -> None:
+    # Given / When
+    new_balances = ledger.record_round("ABCDE", 1, {"alice": 5, "bob": -5})
+
+    # Then
+    assert new_balances == {"alice": 15, "bob": 10}
+    assert ledger.get_balance("alice") == 15
+    assert ledger.get_balances() == {"alice": 15, "bob": 10}
+
+
+def test_recording_a_round_for_unknown_account_changes_nothing(
+    ledger: Ledger,
+) -> None:
+    # Given / When
+    with pytest.raises(ValueError):
+        ledger.record_round("ABCDE", 1, {"alice": 5, "carol": -5})
+
+    # Then
+    assert ledger.get_balance("alice") == 10
+    assert ledger.get_history("alice") == []
+
+
+def test_history_is_paginated_newest_first(ledger: Ledger) -> None:
+    # Given
+    for round_number in range(1, 6):
+        ledger.record_round("ABCDE", round_number, {"alice": 1, "bob": -1})
+
+    # When
+    first_page = ledger.get_history("alice", limit=3)
+    second_page = ledger.get_history("alice", before_id=first_page[-1].id, limit=3)
+
+    # Then
+    assert [entry.round for entry in first_page] == [5, 4, 3]
+    assert [entry.round for entry in second_page] == [2, 1]
+    assert first_page[0].balance == 15
+    assert all(entry.username == "alice" for entry in first_page + second_page)
@@ -0,0 +1,101 @@
+import pytest
+
+from matchmaking import Matchmaker
+
+
+@pytest.fixture
+def matchmaker() -> Matchmaker:
+    return Matchmaker(bucket_width=10)
+
+
+def test_first_player_waits_for_an_opponent(matchmaker: Matchmaker) -> None:
+    # Given / When
+    opponent = matchmaker.enqueue("alice", 10)
+
+    # Then
+    assert opponent is None
+    assert matchmaker.is_waiting("alice")
+    assert len(matchmaker) == 1
+
+
+def test_second_player_is_paired_with_waiting_player(matchmaker: Matchmaker) -> None:
+    # Given
+    matchmaker.enqueue("alice", 10)
+
+    # When
+    opponent = matchmaker.enqueue("bob", 12)
+
+    # Then
+    assert opponent == "alice"
+    assert not matchmaker.is_waiting("alice")
+    assert len(matchmaker) == 0
+
+
+def test_player_is_paired_with_closest_balance() -> None:
+    # Given
+    matchmaker = Matchmaker(bucket_width=10, max_bucket_distance=5)
+    matchmaker.enqueue("alice", 0)
+    matchmaker.enqueue("bob", 200)
+
+    # When
+    opponent = matchmaker.enqueue("carol", 180)
+
+    # Then
+    assert opponent == "bob"
+    assert matchmaker.is_waiting("alice")
+
+
+def test_players_in_the_same_bucket_are_paired_in_arrival_order(
+    matchmaker: Matchmaker,
+) -> None:
+    # Given
+    matchmaker.enqueue("alice", 10)
+    matchmaker.cancel("alice")
+    matchmaker.enqueue("bob", 11)
+
+    # When
+    opponent = matchmaker.enqueue("carol", 12)
+
+    # Then
+    assert opponent == "bob"
+
+
+def test_enqueueing_twice_does_not_pair_player_with_themselves(
+    matchmaker: Matchmaker,
+) -> None:
+    # Given
+    matchmaker.enqueue("alice", 10)
+
+    # When
+    opponent = matchmaker.enqueue("alice", 10)
+
+    # Then
+    assert opponent is None
+    assert len(matchmaker) == 1
+
+
+def test_cancelled_player_is_not_paired(matchmaker: Matchmaker) -> None:
+    # Given
+    matchmaker.enqueue("alice", 10)
+
+    # When
+    was_cancelled = matchmaker.cancel("alice")
+    opponent = matchmaker.enqueue("bob", 10)
+
+    # Then
+    assert was_cancelled
+    assert opponent is None
+    assert not matchmaker.cancel("alice")
+
+
+def test_players_too_far_apart_are_not_paired() -> None:
+    # Given
+    matchmaker = Matchmaker(bucket_width=10, max_bucket_distance=1)
+    matchmaker.enqueue("alice", 0)
+
+    # When
+    opponent = matchmaker.enqueue("bob", 100)
+
+    # Then
+    assert opponent is None
+    assert len(matchmaker) == 2
@@ -0,0 +1,89 @@
+import random
+import pytest
+
+from collections import Counter
+from problem_stats import AliasTable, ProblemStats
+from problems import ProblemBank, ProblemFilter
+
+
+@pytest.fixture
+def problem_stats() -> ProblemStats:
+    return ProblemStats(num_problems=3)
+
+
+def test_alias_table_samples_in_proportion_to_weights() -> None:
+    # Given
+    alias_table = AliasTable([1.0, 0.0, 3.0])
+    rng = random.Random(0)
+
+    # When
+    counts = Counter(alias_table.sample(rng) for _ in range(20_000))
+
+    # Then
+    assert counts[1] == 0
+    assert counts[2] / counts[0] == pytest.approx(3.0, rel=0.1)
+
+
+def test_alias_table_with_zero_weights_samples_uniformly() -> None:
+    # Given
+    alias_table = AliasTable([0.0, 0.0])
+    rng = random.Random(0)
+
+    # When
+    counts = Counter(alias_table.sample(rng) for _ in range(1_000))
+
+    # Then
+    assert set(counts) == {0, 1}
+
+
+def test_alias_table_needs_weights() -> None:
+    # Given / When / Then
+    with pytest.raises(ValueError):
+        AliasTable([])
+
+
+def test_recorded_outcomes_are_counted_after_flush(problem_stats: ProblemStats) -> None:
+    # Given
+    problem_stats.record(1, 2, True)
+    problem_stats.record(1, 0, False)
+    problem_stats.record(1, 1, True)
+
+    # When
+    num_estimates_before_flush = problem_stats.get_num_estimates(1)
+    num_flushed = problem_stats.flush()
+
+    # Then
+    assert num_estimates_before_flush == 0
+    assert num_flushed == 3
+    assert problem_stats.get_num_estimates(1) == 3
+    assert problem_stats.get_hit_rate(1) == pytest.approx(3 / 5)
+
+
+def test_problem_without_estimates_has_even_hit_rate(
+    problem_stats: ProblemStats,
+) -> None:
+    # Given / When / Then
+    assert problem_stats.get_hit_rate(0) == 0.5
+
+
+def test_draws_are_uniform_until_the_alias_table_is_built_off_the_draw(
+    test_problem_bank: ProblemBank,
+) -> None:
+    # Given
+    problem_stats = ProblemStats(len(test_problem_bank), test_problem_bank)
+    rng = random.Random(0)
+
+    for _ in range(50):
+        problem_stats.record(0, 0, True)
+        problem_stats.record(1, 0, False)
+
+    # When
+    before = Counter(
+        problem_stats.sample(ProblemFilter(), 1.0, rng) for _ in range(600)
+    )
+    problem_stats.refresh()
+    after = Counter(problem_stats.sample(ProblemFilter(), 1.0, rng) for _ in range(600))
+
+    # Then
+    assert set(before) == set(range(len(test_problem_bank)))
+    assert after[0] > after[1] * 10
@@ -0,0 +1,336 @@
+import os
+import pytest
+
+from problems import (
+    InvalidProblemError,
+    Problem,
+    ProblemBank,
+    ProblemBankWriter,
+    ProblemDeck,
+    ProblemFilter,
+    import_problems,
+    parse_log_answer,
+    write_problem_bank,
+)
+
+
+@pytest.fixture
+def example_problems_csv(tmp_path) -> str:
+    path = tmp_path / "problems.csv"
+    path.write_text(
+        "question,answer,source\n"
+        "How many neurons are in the human brain?, 10^11, https://example.com/brain\n"
+        "How many cells are in the human body?, 10^13, https://example.com/body\n"
+    )
+
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "answer, log_answer",
+    [
+        (" 10^6", 6),
+        ("10**-3", -3),
+        ("1e6", 6),
+        ("1,000,000", 6),
+        ("3000", 3),
+        ("0.001", -3),
+    ],
+)
+def test_answers_are_normalized_to_log_answer(answer: str, log_answer: int) -> None:
+    # Given / When / Then
+    assert parse_log_answer(answer) == log_answer
+
+
+@pytest.mark.parametrize("answer", ["", "ten", "10^six", "0", "-5", "10^1000", "inf"])
+def test_invalid_answers_are_rejected(answer: str) -> None:
+    # Given / When / Then
+    with pytest.raises(InvalidProblemError):
+        parse_log_answer(answer)
+
+
+def test_imported_problems_are_written_to_problem_bank(
+    tmp_path, example_problems_csv: str
+) -> None:
+    # Given
+    path = str(tmp_path / "problems.bank")
+
+    # When
+    with ProblemBankWriter(path) as writer:
+        report = import_problems([example_problems_csv], writer)
+
+    bank = ProblemBank(path)
+
+    # Then
+    assert report.num_imported == 2
+    assert bank[1] == Problem(
+        question="How many cells are in the human body?",
+        log_answer=13,
+        source="https://example.com/body",
+        index=1,
+    )
+
+
+def test_import_skips_invalid_rows_and_duplicate_questions(tmp_path) -> None:
+    # Given
+    csv_path = tmp_path / "problems.csv"
+    csv_path.write_text(
+        "question,answer,source\n"
+        "How many cells are in the human body?,10^13,\n"
+        "How many  CELLS are in the human body?,10^13,\n"
+        ",10^3,\n"
+        "How many stars are there?,lots,\n"
+        "How many grains of sand are there?,10^18,\n"
+    )
+    rejected_rows = []
+
+    # When
+    with ProblemBankWriter(str(tmp_path / "problems.bank")) as writer:
+        report = import_problems(
+            [str(csv_path)],
+            writer,
+            on_reject=lambda path, row, reason: rejected_rows.append(row),
+        )
+
+    # Then
+    assert report.num_rows == 5
+    assert report.num_imported == 2
+    assert report.num_duplicates == 1
+    assert report.get_num_rejected() == 2
+    assert report.rejections == {"Question is missing": 1, "Can't parse answer": 1}
+    assert rejected_rows == [4, 5]
+
+
+def test_import_reports_progress_even_when_the_nth_row_is_skipped(tmp_path) -> None:
+    # Given
+    csv_path = tmp_path / "problems.csv"
+    csv_path.write_text(
+        "question,answer,source\n"
+        "How many cells are in the human body?,10^13,\n"
+        "How many  CELLS are in the human body?,10^13,\n"
+        "How many stars are there?,10^22,\n"
+        "How many grains of sand are there?,lots,\n"
+    )
+    reported_rows = []
+
+    # When
+    with ProblemBankWriter(str(tmp_path / "problems.bank")) as writer:
+        import_problems(
+            [str(csv_path)],
+            writer,
+            on_progress=lambda report: reported_rows.append(report.num_rows),
+            progress_every=2,
+        )
+
+    # Then
+    assert reported_rows == [2, 4]
+
+
+def test_problem_bank_returns_written_problems(tmp_path) -> None:
+    # Given
+    path = str(tmp_path / "problems.bank")
+    problems = [
+        Problem(question="How many ångströms in a metre?", log_answer=10, source="a"),
+        Problem(question="How many stars in the Milky Way?", log_answer=11, source=""),
+        Problem(question="How many seconds in a year?", log_answer=-7, source="c"),
+    ]
+
+    # When
+    num_problems = write_problem_bank(problems, path)
+    bank = ProblemBank(path)
+
+    # Then
+    assert num_problems == 3
+    assert len(bank) == 3
+    assert bank[0] == Problem(
+        question="How many ångströms in a metre?", log_answer=10, source="a", index=0
+    )
+    assert bank[-1].log_answer == -7
+    assert [problem.index for problem in bank] == [0, 1, 2]
+
+
+def test_problem_bank_rejects_files_in_another_format(tmp_path) -> None:
+    # Given
+    path = tmp_path / "problems.bank"
+    path.write_bytes(b"question,answer,source\n" * 10)
+
+    # When / Then
+    with pytest.raises(ValueError):
+        ProblemBank(str(path))
+
+
+def test_failed_write_leaves_no_problem_bank(tmp_path) -> None:
+    # Given
+    path = tmp_path / "problems.bank"
+
+    def problems():
+        yield Problem(question="How many?", log_answer=1, source="")
+        raise RuntimeError("Broken input")
+
+    # When
+    with pytest.raises(RuntimeError):
+        write_problem_bank(problems(), str(path))
+
+    # Then
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 13, 64, 1000])
+def test_deck_draws_every_problem_exactly_once(size: int) -> None:
+    # Given
+    deck = ProblemDeck.shuffled(size)
+    drawn = []
+
+    # When
+    for _ in range(size):
+        index, deck = deck.draw()
+        drawn.append(index)
+
+    # Then
+    assert sorted(drawn) == list(range(size))
+    assert deck.remaining() == 0
+
+
+def test_decks_with_different_seeds_are_shuffled_differently() -> None:
+    # Given
+    first_deck = ProblemDeck(size=1000, seed=1)
+    second_deck = ProblemDeck(size=1000, seed=2)
+
+    # When
+    first_order = _draw_all(first_deck)
+    second_order = _draw_all(second_deck)
+
+    # Then
+    assert first_order != second_order
+    assert first_order != sorted(first_order)
+
+
+def test_exhausted_deck_is_reshuffled() -> None:
+    # Given
+    deck = ProblemDeck(size=2, seed=1, cursor=2)
+
+    # When
+    index, new_deck = deck.draw()
+
+    # Then
+    assert index in [0, 1]
+    assert new_deck.cursor == 1
+
+
+def test_deck_must_not_be_empty() -> None:
+    # Given / When
+    with pytest.raises(ValueError):
+        ProblemDeck(size=0, seed=1)
+
+
+def _draw_all(deck: ProblemDeck) -> list[int]:
+    indices = []
+
+    for _ in range(deck.size):
+        index, deck = deck.draw()
+        indices.append(index)
+
+    return indices
+
+
+@pytest.fixture
+def example_problem_bank(tmp_path) -> ProblemBank:
+    path = str(tmp_path / "problems.bank")
+    problems = [
+        Problem("How many neurons?", 11, "", category="biology", difficulty=2),
+        Problem("How many cells?", 13, "", category="biology", difficulty=2),
+        Problem("How many blinks?", 4, "", category="biology", difficulty=1),
+        Problem("How many atoms?", 18, "", category="physics", difficulty=3),
+        Problem("How many words?", 6, "", category="", difficulty=0),
+    ]
+    write_problem_bank(problems, path)
+
+    return ProblemBank(path)
+
+
+def _select(bank: ProblemBank, **kwargs) -> list[str]:
+    selection = bank.select(ProblemFilter(**kwargs))
+
+    return sorted(bank[index].question for index in selection)
+
+
+def test_problem_bank_keeps_category_and_difficulty(
+    example_problem_bank: ProblemBank,
+) -> None:
+    # Given / When
+    problem = example_problem_bank[3]
+
+    # Then
+    assert problem.category == "physics"
+    assert problem.difficulty == 3
+    assert example_problem_bank.get_categories() == ["biology", "physics"]
+
+
+def test_unfiltered_selection_contains_every_problem(
+    example_problem_bank: ProblemBank,
+) -> None:
+    # Given / When
+    selection = example_problem_bank.select(ProblemFilter())
+
+    # Then
+    assert sorted(selection) == [0, 1, 2, 3, 4]
+
+
+def test_can_select_problems_by_category(example_problem_bank: ProblemBank) -> None:
+    # Given / When / Then
+    assert _select(example_problem_bank, category="Biology") == [
+        "How many blinks?",
+        "How many cells?",
+        "How many neurons?",
+    ]
+    assert _select(example_problem_bank, category="chemistry") == []
+
+
+def test_can_select_problems_by_order_of_magnitude(
+    example_problem_bank: ProblemBank,
+) -> None:
+    # Given / When / Then
+    assert _select(example_problem_bank, min_oom=6, max_oom=12) == [
+        "How many neurons?",
+        "How many words?",
+    ]
+    assert _select(example_problem_bank, category="biology", min_oom=12) == [
+        "How many cells?",
+    ]
+
+
+def test_can_select_problems_by_difficulty(example_problem_bank: ProblemBank) -> None:
+    # Given / When / Then
+    assert _select(example_problem_bank, min_difficulty=2, max_difficulty=2) == [
+        "How many cells?",
+        "How many neurons?",
+    ]
+    assert _select(
+        example_problem_bank, category="biology", max_difficulty=1, max_oom=10
+    ) == ["How many blinks?"]
+
+
+def test_filter_rejects_empty_ranges() -> None:
+    # Given / When / Then
+    with pytest.raises(ValueError):
+        ProblemFilter(min_oom=12, max_oom=6)
+
+    with pytest.raises(ValueError):
+        ProblemFilter(min_difficulty=9)
+
+
+def test_writers_building_the_same_bank_at_once_dont_collide(tmp_path) -> None:
+    # Given
+    path = str(tmp_path / "problems.bank")
+    first = ProblemBankWriter(path)
+    second = ProblemBankWriter(path)
+
+    # When
+    first.add(Problem("How many neurons?", 11, ""))
+    second.add(Problem("How many cells?", 13, ""))
+    first.close()
+    second.close()
+
+    # Then
+    assert ProblemBank(path)[0].question == "How many cells?"
+    assert sorted(os.listdir(tmp_path)) == ["problems.bank"]
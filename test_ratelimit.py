@@ -0,0 +1,76 @@
+from ratelimit import RateLimit, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_a_burst_then_rejects_until_it_refills() -> None:
+    # Given
+    clock = FakeClock()
+    limiter = RateLimiter({"state": RateLimit(rate=2, burst=3)}, clock=clock)
+
+    # When
+    burst = [limiter.allow("state", "alice") for _ in range(4)]
+    retry_after = limiter.get_retry_after("state", "alice")
+    clock.now = 0.5
+    after_refill = limiter.allow("state", "alice")
+
+    # Then
+    assert burst == [True, True, True, False]
+    assert retry_after == 0.5
+    assert after_refill
+    assert limiter.get_rejections() == {"state": 1}
+
+
+def test_buckets_are_separate_per_key_and_routes_without_limits_are_allowed() -> None:
+    # Given
+    limiter = RateLimiter({"state": RateLimit(rate=1, burst=1)}, clock=FakeClock())
+    limiter.allow("state", ("alice", "ABCDE"))
+
+    # When / Then
+    assert not limiter.allow("state", ("alice", "ABCDE"))
+    assert limiter.allow("state", ("alice", "FGHIJ"))
+    assert limiter.allow("state", ("bob", "ABCDE"))
+    assert all(limiter.allow("home", "alice") for _ in range(10))
+
+
+def test_idle_buckets_expire_and_bucket_count_stays_bounded() -> None:
+    # Given
+    clock = FakeClock()
+    limiter = RateLimiter(
+        {"state": RateLimit(rate=1, burst=2)}, max_buckets=3, clock=clock
+    )
+
+    # When
+    allowed = [limiter.allow("state", i) for i in range(10)]
+    num_buckets = len(limiter)
+    clock.now = 10
+    limiter.allow("state", "alice")
+
+    # Then
+    assert allowed == [True] * 3 + [False] * 7
+    assert num_buckets == 3
+    assert len(limiter) == 1
+
+
+def test_buckets_still_refilling_are_never_dropped() -> None:
+    # Given
+    clock = FakeClock()
+    limiter = RateLimiter(
+        {"state": RateLimit(rate=1, burst=2)}, max_buckets=2, clock=clock
+    )
+    limiter.allow("state", "alice")
+    limiter.allow("state", "alice")
+
+    # When
+    for i in range(10):
+        limiter.allow("state", i)
+
+    # Then
+    assert not limiter.allow("state", "alice")
+    assert limiter.get_retry_after("state", "newcomer") == 1.0
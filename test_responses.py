@@ -0,0 +1,48 @@
+import gzip
+import json
+
+from flask import Response
+from responses import MIN_COMPRESSED_SIZE, StaticJson, compress
+
+
+def test_static_json_reply_is_encoded_once_and_reused() -> None:
+    # Given
+    reply = StaticJson({"success": False, "message": "User not logged in!"})
+
+    # When
+    first = reply()
+    second = reply(409)
+
+    # Then
+    assert json.loads(first.get_data()) == reply.data
+    assert first.get_data() == second.get_data() == reply.body
+    assert first is not second
+    assert second.status_code == 409
+    assert second.mimetype == "application/json"
+
+
+def test_large_pages_are_gzipped_when_the_client_accepts_it() -> None:
+    # Given
+    page = "<div>fermi poker</div>" * MIN_COMPRESSED_SIZE
+
+    # When
+    compressed = compress(Response(page, mimetype="text/html"), "gzip, br")
+    uncompressed = compress(Response(page, mimetype="text/html"), "identity")
+
+    # Then
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.vary
+    assert gzip.decompress(compressed.get_data()).decode() == page
+    assert "Content-Encoding" not in uncompressed.headers
+
+
+def test_small_pages_and_json_are_sent_as_is() -> None:
+    # Given
+    small_page = Response("<div>fermi poker</div>", mimetype="text/html")
+    large_json = Response(
+        "[" + "1," * MIN_COMPRESSED_SIZE + "1]", mimetype="application/json"
+    )
+
+    # When / Then
+    assert "Content-Encoding" not in compress(small_page, "gzip").headers
+    assert "Content-Encoding" not in compress(large_json, "gzip").headers
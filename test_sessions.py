@@ -0,0 +1,84 @@
+import pytest
+
+from sessions import GameTokens, SessionStore, load_keys
+
+
+@pytest.fixture
+def store() -> SessionStore:
+    return SessionStore(capacity=2)
+
+
+def test_session_token_maps_back_to_its_username(store: SessionStore) -> None:
+    # Given
+    token = store.create("alice")
+
+    # When
+    username = store.get(token)
+
+    # Then
+    assert username == "alice"
+    assert store.get("unknown") is None
+
+
+def test_sessions_evicted_from_the_cache_are_read_back_from_the_table(
+    store: SessionStore,
+) -> None:
+    # Given
+    tokens = [store.create(username) for username in ["alice", "bob", "carol"]]
+
+    # When
+    usernames = [store.get(token) for token in tokens]
+
+    # Then
+    assert usernames == ["alice", "bob", "carol"]
+
+
+def test_deleted_and_expired_sessions_are_rejected() -> None:
+    # Given
+    store = SessionStore()
+    deleted = store.create("alice")
+    expired_store = SessionStore(max_age_seconds=-1)
+    expired = expired_store.create("bob")
+
+    # When
+    store.delete(deleted)
+
+    # Then
+    assert store.get(deleted) is None
+    assert expired_store.get(expired) is None
+
+
+def test_game_token_is_only_valid_for_its_game() -> None:
+    # Given
+    tokens = GameTokens([b"key"])
+
+    # When
+    token = tokens.sign("ABCDE", "alice")
+
+    # Then
+    assert tokens.verify("ABCDE", token) == "alice"
+    assert tokens.verify("FGHIJ", token) is None
+    assert tokens.verify("ABCDE", token.replace("alice", "bob")) is None
+
+
+def test_game_tokens_signed_with_a_rotated_out_key_still_verify() -> None:
+    # Given
+    old_tokens = GameTokens([b"old"])
+    token = old_tokens.sign("ABCDE", "alice")
+
+    # When
+    new_tokens = GameTokens(load_keys("new,old"))
+
+    # Then
+    assert new_tokens.verify("ABCDE", token) == "alice"
+    assert new_tokens.sign("ABCDE", "alice") != token
+    assert GameTokens(load_keys("new")).verify("ABCDE", token) is None
+
+
+def test_game_tokens_with_non_ascii_characters_are_rejected() -> None:
+    # Given
+    tokens = GameTokens([b"key"])
+
+    # When / Then
+    assert tokens.verify("ABCDE", "alice.é") is None
+    assert tokens.verify("ABCDE", "élise." + tokens.sign("ABCDE", "alice")) is None
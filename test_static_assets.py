@@ -0,0 +1,47 @@
+import gzip
+import pytest
+
+from pathlib import Path
+
+from static_assets import build_assets
+
+
+@pytest.fixture
+def static_dir(tmp_path: Path) -> str:
+    (tmp_path / "js").mkdir()
+
+    for name in ["common.js", "lobby.js", "round.js", "main.js"]:
+        (tmp_path / "js" / name).write_text(f"// {name}\n")
+
+    return str(tmp_path)
+
+
+def test_bundle_is_fingerprinted_by_its_content(
+    static_dir: str, tmp_path: Path
+) -> None:
+    # Given
+    name = build_assets(static_dir)["app.js"].name
+
+    # When
+    (tmp_path / "js" / "main.js").write_text("// changed\n")
+    new_name = build_assets(static_dir)["app.js"].name
+
+    # Then
+    assert name.startswith("app.") and name.endswith(".js")
+    assert new_name != name
+
+
+def test_bundle_is_served_in_an_encoding_the_client_accepts(static_dir: str) -> None:
+    # Given
+    asset = build_assets(static_dir)["app.js"]
+
+    # When
+    gzipped, encoding = asset.get_encoded("gzip, deflate")
+    plain, no_encoding = asset.get_encoded("")
+
+    # Then
+    assert encoding == "gzip"
+    assert gzip.decompress(gzipped) == asset.content
+    assert no_encoding is None
+    assert plain == asset.content
+    assert asset.content.index(b"common.js") < asset.content.index(b"main.js")
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from timers import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def example_clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def example_wheel(example_clock: FakeClock) -> TimerWheel:
+    return TimerWheel(tick_seconds=1.0, num_slots=4, num_levels=3, clock=example_clock)
+
+
+def test_timer_fires_once_its_deadline_has_passed(
+    example_wheel: TimerWheel,
+) -> None:
+    # Given
+    fired = []
+    example_wheel.schedule(2.5, lambda: fired.append("timer"))
+
+    # When
+    num_fired_early = example_wheel.advance(now=2.0)
+    num_fired_on_time = example_wheel.advance(now=3.0)
+
+    # Then
+    assert num_fired_early == 0
+    assert num_fired_on_time == 1
+    assert fired == ["timer"]
+    assert len(example_wheel) == 0
+
+
+def test_cancelled_timer_never_fires(
+    example_wheel: TimerWheel,
+) -> None:
+    # Given
+    fired = []
+    timer = example_wheel.schedule(30, lambda: fired.append("timer"))
+
+    # When
+    timer.cancel()
+    example_wheel.advance(now=100)
+
+    # Then
+    assert fired == []
+    assert len(example_wheel) == 0
+
+
+def test_timers_on_every_level_fire_at_their_deadlines(
+    example_clock: FakeClock,
+    example_wheel: TimerWheel,
+) -> None:
+    # Given
+    rng = random.Random(0)
+    fired_at: dict[int, float] = {}
+    delays = [rng.uniform(0, 60) for _ in range(500)]
+
+    for i, delay in enumerate(delays):
+        example_wheel.schedule(
+            delay, lambda i=i: fired_at.update({i: example_clock.now})
+        )
+
+    # When
+    for now in range(1, 64):
+        example_clock.now = now
+        example_wheel.advance()
+
+    # Then
+    assert len(fired_at) == len(delays)
+    assert all(delay <= fired_at[i] < delay + 1 for i, delay in enumerate(delays))
+
+
+def test_scheduling_beyond_the_wheels_range_fails(
+    example_wheel: TimerWheel,
+) -> None:
+    # When / Then
+    with pytest.raises(ValueError):
+        example_wheel.schedule(4**3, lambda: None)
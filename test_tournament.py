@@ -0,0 +1,136 @@
+import pytest
+
+from dataclasses import replace
+from game import Estimate, Game, RoundHistory
+from tournament import Tournament, TournamentFormat
+
+
+def _finish(game: Game, winner: str) -> Game:
+    """Plays a single round that `winner` wins, then ends the game."""
+    if game.is_estimator(winner):
+        estimate = Estimate(log_answer=game.get_problem().log_answer, log_error=0)
+        game = game.set_estimate(estimate).fold(game.get_opponent(winner))
+    else:
+        game = game.fold(game.get_opponent(winner))
+
+    return game.end()
+
+
+@pytest.fixture
+def example_entrants() -> list[str]:
+    return ["alice", "bob", "carol", "dave", "erin"]
+
+
+def test_tournament_needs_two_unique_entrants() -> None:
+    # When / Then
+    with pytest.raises(ValueError):
+        Tournament(["alice"])
+
+    with pytest.raises(ValueError):
+        Tournament(["alice", "alice"])
+
+
+def test_bracket_advances_winners_until_a_champion_is_left(
+    example_entrants: list[str],
+) -> None:
+    # Given
+    tournament = Tournament(example_entrants, seed=0)
+    games = tournament.start()
+    num_games = 0
+
+    # When
+    while games:
+        game = games.pop()
+        num_games += 1
+        games += tournament.on_game_over(_finish(game, min(game.usernames)))
+
+    # Then
+    assert num_games == len(example_entrants) - 1
+    assert tournament.is_finished()
+    assert tournament.get_champion() == "alice"
+    assert tournament.get_active_games() == {}
+    assert sum(tournament.get_net_payouts().values()) == 0
+
+
+def test_bracket_starts_a_match_as_soon_as_both_feeder_matches_are_over() -> None:
+    # Given
+    tournament = Tournament(["alice", "bob", "carol", "dave"], seed=0)
+    first_game, second_game = tournament.start()
+
+    # When
+    after_first = tournament.on_game_over(
+        _finish(first_game, min(first_game.usernames))
+    )
+    after_second = tournament.on_game_over(
+        _finish(second_game, min(second_game.usernames))
+    )
+
+    # Then
+    assert after_first == []
+    assert len(after_second) == 1
+    assert after_second[0].usernames == {
+        min(first_game.usernames),
+        min(second_game.usernames),
+    }
+    assert tournament.round == 2
+
+
+def test_swiss_rounds_avoid_rematches_and_give_out_byes(
+    example_entrants: list[str],
+) -> None:
+    # Given
+    tournament = Tournament(
+        example_entrants, format=TournamentFormat.SWISS, num_rounds=3, seed=0
+    )
+    games = tournament.start()
+    pairings = []
+
+    # When
+    while games:
+        game = games.pop()
+        pairings.append(frozenset(game.usernames))
+        games += tournament.on_game_over(_finish(game, min(game.usernames)))
+
+    # Then
+    assert tournament.is_finished()
+    assert len(pairings) == 3 * (len(example_entrants) // 2)
+    assert len(set(pairings)) == len(pairings)
+    assert sum(standing.points for standing in tournament.get_standings()) == 3 * 3
+    assert tournament.get_champion() == "alice"
+
+
+def test_games_outside_the_tournament_are_ignored(
+    example_entrants: list[str],
+) -> None:
+    # Given
+    tournament = Tournament(example_entrants, seed=0)
+    tournament.start()
+    game = Game.create().join("frank").join("grace")
+
+    # When
+    new_games = tournament.on_game_over(_finish(game, "frank"))
+
+    # Then
+    assert new_games == []
+
+
+def test_winner_counts_rounds_the_games_history_has_forgotten() -> None:
+    # Given
+    tournament = Tournament(["alice", "bob"], seed=0)
+    (game,) = tournament.start()
+    game = replace(game, history=RoundHistory(cap=1))
+    first_estimator = game.get_estimator()
+    first_estimatee = game.get_opponent(first_estimator)  # type: ignore
+    estimate = Estimate(log_answer=game.get_problem().log_answer, log_error=0)
+
+    # When
+    game = game.set_estimate(estimate).raise_ante(first_estimatee)
+    game = game.fold(first_estimator)  # type: ignore
+    game = game.play_again(first_estimator).play_again(first_estimatee)  # type: ignore
+    game = game.fold(game.get_estimator()).end()  # type: ignore
+    tournament.on_game_over(game)
+
+    # Then
+    assert len(game.get_history()) == 1
+    assert tournament.get_net_payouts() == {first_estimatee: 1, first_estimator: -1}
+    assert tournament.get_champion() == first_estimatee
@@ -0,0 +1,156 @@
+import logging
+import math
+import threading
+import time
+
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Timer:
+    __slots__ = ("deadline", "tick", "callback", "is_cancelled")
+
+    def __init__(self, deadline: float, tick: int, callback: Callable[[], None]):
+        self.deadline = deadline
+        self.tick = tick
+        self.callback = callback
+        self.is_cancelled = False
+
+    def cancel(self) -> None:
+        # Cancelled timers are dropped lazily when their slot is next visited.
+        self.is_cancelled = True
+
+    def get_seconds_left(self, now: float | None = None) -> float:
+        return max(0.0, self.deadline - (time.monotonic() if now is None else now))
+
+
+class TimerWheel:
+    """Fires callbacks after a delay, for any number of pending timers.
+
+    Timers are kept in a hierarchy of wheels, each with `num_slots` slots.
+    A slot of the lowest wheel holds the timers due in one tick; a slot of
+    each higher wheel spans a whole turn of the wheel below it. Scheduling
+    and cancelling are O(1): a timer is appended to the slot its deadline
+    falls in, and cancelling only marks it. Each time a lower wheel comes
+    round, the timers in the next slot of the wheel above are moved down a
+    level, so a timer is moved at most once per level.
+    """
+
+    def __init__(
+        self,
+        tick_seconds: float = 0.1,
+        num_slots: int = 256,
+        num_levels: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if tick_seconds <= 0:
+            raise ValueError("Tick must be positive!")
+
+        if num_slots < 2 or num_slots & (num_slots - 1) != 0:
+            raise ValueError("Number of slots must be a power of two!")
+
+        self.tick_seconds = tick_seconds
+        self.num_slots = num_slots
+        self.num_levels = num_levels
+        self._bits = int(math.log2(num_slots))
+        self._mask = num_slots - 1
+        self._clock = clock
+        self._start = clock()
+        self._tick = 0
+        self._wheels: list[list[list[Timer]]] = [
+            [[] for _ in range(num_slots)] for _ in range(num_levels)
+        ]
+        self._num_pending = 0
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> Timer:
+        """Calls `callback` on the timer thread once `delay` seconds have passed."""
+        now = self._clock()
+        tick = math.ceil((now + delay - self._start) / self.tick_seconds)
+
+        with self._lock:
+            timer = Timer(now + delay, max(tick, self._tick + 1), callback)
+
+            if timer.tick - self._tick >= self.num_slots**self.num_levels:
+                raise ValueError("Delay is beyond the timer wheel's range!")
+
+            self._insert(timer)
+            self._num_pending += 1
+
+        return timer
+
+    def advance(self, now: float | None = None) -> int:
+        """Runs the callbacks of every timer due by `now` and returns how many ran."""
+        target = int(
+            ((self._clock() if now is None else now) - self._start) // self.tick_seconds
+        )
+        due: list[Timer] = []
+
+        with self._lock:
+            while self._tick < target:
+                self._tick += 1
+                self._cascade()
+                slot = self._wheels[0][self._tick & self._mask]
+                due += slot
+                slot.clear()
+
+            self._num_pending -= len(due)
+
+        num_fired = 0
+
+        for timer in due:
+            if timer.is_cancelled:
+                continue
+
+            try:
+                timer.callback()
+            except Exception:
+                logger.exception("Timer callback failed")
+
+            num_fired += 1
+
+        return num_fired
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+
+        def advance_forever() -> None:
+            while True:
+                time.sleep(self.tick_seconds)
+                self.advance()
+
+        self._thread = threading.Thread(target=advance_forever, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """Returns the number of timers not yet fired, counting cancelled ones not yet dropped."""
+        return self._num_pending
+
+    def _insert(self, timer: Timer) -> None:
+        delta = timer.tick - self._tick
+
+        for level in range(self.num_levels):
+            if delta < self.num_slots ** (level + 1):
+                index = (timer.tick >> (self._bits * level)) & self._mask
+                self._wheels[level][index].append(timer)
+                return
+
+    def _cascade(self) -> None:
+        for level in range(1, self.num_levels):
+            if (self._tick >> (self._bits * (level - 1))) & self._mask != 0:
+                return
+
+            slot = self._wheels[level][
+                (self._tick >> (self._bits * level)) & self._mask
+            ]
+            timers = list(slot)
+            slot.clear()
+
+            for timer in timers:
+                if timer.is_cancelled:
+                    self._num_pending -= 1
+                else:
+                    self._insert(timer)
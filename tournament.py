@@ -0,0 +1,320 @@
+import math
+import random
+import secrets
+import threading
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from enum import Enum
+from game import Game
+
+
+class TournamentFormat(Enum):
+    BRACKET = "bracket"
+    SWISS = "swiss"
+
+
+@dataclass(frozen=True)
+class Match:
+    round: int
+    slot: int
+    usernames: tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Standing:
+    username: str
+    points: float
+    net: int
+    is_eliminated: bool
+
+
+class Tournament:
+    """Pairs entrants into two-player games and advances them as games end.
+
+    Nothing is ever scanned: `on_game_over` looks the finished game's match up
+    by id, records the result and returns whichever games that result unblocks.
+    In a bracket the winner moves into its slot of the next round, so a match
+    starts as soon as both of its feeder matches are over. In a Swiss
+    tournament a countdown of unfinished games triggers the next round's
+    pairings once it reaches zero.
+    """
+
+    def __init__(
+        self,
+        usernames: Iterable[str],
+        format: TournamentFormat = TournamentFormat.BRACKET,
+        num_rounds: int | None = None,
+        seed: int | None = None,
+        create_game: Callable[[], Game] = Game.create,
+    ):
+        entrants = list(usernames)
+
+        if len(entrants) < 2:
+            raise ValueError("A tournament needs at least 2 entrants!")
+
+        if len(set(entrants)) != len(entrants):
+            raise ValueError("Entrants must be unique!")
+
+        if num_rounds is not None and num_rounds <= 0:
+            raise ValueError("Number of rounds must be positive!")
+
+        self.id = secrets.token_hex(4)
+        self.format = format
+        self.round = 0
+        self._rng = random.Random(seed)
+        self._create_game = create_game
+        self._entrants = self._rng.sample(entrants, len(entrants))
+        self._seeds = {username: seed for seed, username in enumerate(self._entrants)}
+        self._points: dict[str, float] = {username: 0 for username in entrants}
+        self._net: dict[str, int] = {username: 0 for username in entrants}
+        self._eliminated: set[str] = set()
+        self._matches: dict[str, Match] = {}
+        self._active_games: dict[str, str] = {}
+        self._champion: str | None = None
+        self._lock = threading.Lock()
+
+        # Bracket: players waiting in a match for the winner of its sibling.
+        self._bracket_size = 2 ** math.ceil(math.log2(len(entrants)))
+        self._slots: dict[tuple[int, int], str] = {}
+
+        # Swiss: who has already met whom, and the games left in this round.
+        self._opponents: dict[str, set[str]] = {
+            username: set() for username in entrants
+        }
+        self._had_bye: set[str] = set()
+        self._games_left_in_round = 0
+
+        if format == TournamentFormat.BRACKET:
+            self.num_rounds = int(math.log2(self._bracket_size))
+        else:
+            self.num_rounds = num_rounds or math.ceil(math.log2(len(entrants)))
+
+    def start(self) -> list[Game]:
+        """Creates the first round's games."""
+        with self._lock:
+            if self.round != 0:
+                raise ValueError("Tournament has already started!")
+
+            self.round = 1
+
+            if self.format == TournamentFormat.BRACKET:
+                return self._start_bracket()
+
+            return self._pair_swiss_round()
+
+    def on_game_over(self, game: Game) -> list[Game]:
+        """Records the result of a finished game and returns the games it unblocks."""
+        # pre-conditions
+        assert game.is_game_over()
+
+        # body
+        with self._lock:
+            match = self._matches.pop(game.id, None)
+
+            if match is None:
+                return []
+
+            for username in match.usernames:
+                self._active_games.pop(username, None)
+
+            net = get_net_payouts(game, match.usernames)
+
+            for username, payout in net.items():
+                self._net[username] += payout
+
+            winner = _get_winner(net)
+
+            if self.format == TournamentFormat.BRACKET:
+                return self._advance_bracket(match, winner)
+
+            return self._advance_swiss(match, winner)
+
+    def is_finished(self) -> bool:
+        if self.format == TournamentFormat.BRACKET:
+            return self._champion is not None
+
+        return self.round == self.num_rounds and self._games_left_in_round == 0
+
+    def get_champion(self) -> str | None:
+        if self.format == TournamentFormat.BRACKET:
+            return self._champion
+
+        if not self.is_finished():
+            return None
+
+        return self.get_standings()[0].username
+
+    def get_game_id(self, username: str) -> str | None:
+        return self._active_games.get(username, None)
+
+    def get_active_games(self) -> dict[str, str]:
+        return dict(self._active_games)
+
+    def get_net_payouts(self) -> dict[str, int]:
+        return dict(self._net)
+
+    def get_standings(self) -> list[Standing]:
+        with self._lock:
+            return [
+                Standing(
+                    username=username,
+                    points=self._points[username],
+                    net=self._net[username],
+                    is_eliminated=username in self._eliminated,
+                )
+                for username in sorted(self._entrants, key=self._get_rank_key)
+            ]
+
+    def _get_rank_key(self, username: str) -> tuple[float, int, int]:
+        return (-self._points[username], -self._net[username], self._seeds[username])
+
+    def _spawn(self, match: Match) -> Game:
+        game = self._create_game()
+
+        while game.id in self._matches:
+            game = self._create_game()
+
+        for username in match.usernames:
+            game = game.join(username)
+            self._active_games[username] = game.id
+
+        self._matches[game.id] = match
+
+        return game
+
+    def _start_bracket(self) -> list[Game]:
+        num_byes = self._bracket_size - len(self._entrants)
+        new_games = []
+
+        # Each bye is paired with a player so no first-round match is empty.
+        for slot in range(num_byes):
+            new_games += self._advance_to(1, slot, self._entrants[slot])
+
+        players = self._entrants[num_byes:]
+
+        for i in range(0, len(players), 2):
+            match = Match(
+                round=1, slot=num_byes + i // 2, usernames=(players[i], players[i + 1])
+            )
+            new_games.append(self._spawn(match))
+
+        return new_games
+
+    def _advance_bracket(self, match: Match, winner: str | None) -> list[Game]:
+        if winner is None:
+            winner = min(match.usernames, key=self._seeds.__getitem__)
+
+        for username in match.usernames:
+            if username != winner:
+                self._eliminated.add(username)
+
+        self._points[winner] += 1
+
+        return self._advance_to(match.round, match.slot, winner)
+
+    def _advance_to(self, round: int, slot: int, username: str) -> list[Game]:
+        if round == self.num_rounds:
+            self._champion = username
+            return []
+
+        next_slot = (round + 1, slot // 2)
+        opponent = self._slots.pop(next_slot, None)
+
+        if opponent is None:
+            self._slots[next_slot] = username
+            return []
+
+        self.round = max(self.round, round + 1)
+        usernames = (opponent, username) if slot % 2 else (username, opponent)
+
+        return [
+            self._spawn(Match(round=round + 1, slot=slot // 2, usernames=usernames))
+        ]
+
+    def _advance_swiss(self, match: Match, winner: str | None) -> list[Game]:
+        for username in match.usernames:
+            if winner is None:
+                self._points[username] += 0.5
+            elif username == winner:
+                self._points[username] += 1
+
+        self._games_left_in_round -= 1
+
+        if self._games_left_in_round > 0 or self.round == self.num_rounds:
+            return []
+
+        self.round += 1
+
+        return self._pair_swiss_round()
+
+    def _pair_swiss_round(self) -> list[Game]:
+        ranked = sorted(self._entrants, key=self._get_rank_key)
+        paired: set[str] = set()
+
+        if len(ranked) % 2 == 1:
+            bye = next(
+                (
+                    username
+                    for username in reversed(ranked)
+                    if username not in self._had_bye
+                ),
+                ranked[-1],
+            )
+            paired.add(bye)
+            self._had_bye.add(bye)
+            self._points[bye] += 1
+
+        new_games = []
+
+        for i, username in enumerate(ranked):
+            if username in paired:
+                continue
+
+            opponent = self._find_swiss_opponent(ranked, i + 1, paired)
+            paired.update((username, opponent))
+            self._opponents[username].add(opponent)
+            self._opponents[opponent].add(username)
+            match = Match(
+                round=self.round, slot=len(new_games), usernames=(username, opponent)
+            )
+            new_games.append(self._spawn(match))
+
+        self._games_left_in_round = len(new_games)
+
+        return new_games
+
+    def _find_swiss_opponent(
+        self, ranked: list[str], start: int, paired: set[str]
+    ) -> str:
+        """Returns the best-ranked unpaired player not met yet, or the best-ranked unpaired player."""
+        username = ranked[start - 1]
+        fallback = None
+
+        for i in range(start, len(ranked)):
+            candidate = ranked[i]
+
+            if candidate in paired:
+                continue
+
+            if candidate not in self._opponents[username]:
+                return candidate
+
+            if fallback is None:
+                fallback = candidate
+
+        assert fallback is not None
+
+        return fallback
+
+
+def get_net_payouts(game: Game, usernames: Iterable[str]) -> dict[str, int]:
+    """Sums each player's payouts over every round of the game."""
+    return {username: game.get_net_payout(username) for username in usernames}
+
+
+def _get_winner(net: dict[str, int]) -> str | None:
+    best = max(net.values())
+    winners = [username for username, payout in net.items() if payout == best]
+
+    return winners[0] if len(winners) == 1 else None